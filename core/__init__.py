@@ -1,2 +1,17 @@
-import pymysql
-pymysql.install_as_MySQLdb()
+from decouple import config
+
+# MySQL driver: "auto" prefers mysqlclient (C) and falls back to PyMySQL
+# (pure Python), which stands in for it as MySQLdb.
+DB_DRIVER = config('DB_DRIVER', default='auto')
+
+if DB_DRIVER == 'pymysql':
+    import pymysql
+    pymysql.install_as_MySQLdb()
+else:
+    try:
+        import MySQLdb  # noqa: F401
+    except ImportError:
+        if DB_DRIVER == 'mysqlclient':
+            raise
+        import pymysql
+        pymysql.install_as_MySQLdb()
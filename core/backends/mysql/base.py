@@ -0,0 +1,53 @@
+from functools import partial
+
+from django.db.backends.mysql import base
+
+from core.pool import get_pool
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    MySQL backend that checks connections out of a per-process
+    ``ConnectionPool`` and hands them back when Django closes them, e.g. at
+    the end of a request with ``CONN_MAX_AGE = 0``. Configured through
+    ``OPTIONS['pool']``, which takes the pool's ``size``, ``timeout`` and
+    ``recycle`` arguments.
+    """
+
+    pool = None
+    pool_reused = False
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        params.pop('pool', None)
+        return params
+
+    def get_new_connection(self, conn_params):
+        self.pool = get_pool(self.alias, partial(super().get_new_connection, conn_params),
+                             **self.settings_dict['OPTIONS']['pool'])
+        connection, self.pool_reused = self.pool.acquire()
+        return connection
+
+    def init_connection_state(self):
+        # Session variables survive on a pooled connection, so only new
+        # connections pay for the extra round trip.
+        if not self.pool_reused:
+            super().init_connection_state()
+
+    def _set_autocommit(self, autocommit):
+        # A connection returned mid-transaction is discarded, so a reused
+        # one is already in autocommit mode.
+        if self.pool_reused and autocommit and self.connection.get_autocommit():
+            return
+        super()._set_autocommit(autocommit)
+
+    def _close(self):
+        if self.connection is None or self.pool is None:
+            return super()._close()
+
+        # A connection closed inside a transaction or after an error is in
+        # an unknown state, so it isn't handed to the next request.
+        if self.in_atomic_block or self.errors_occurred or not self.get_autocommit():
+            self.pool.discard(self.connection)
+        else:
+            self.pool.release(self.connection)
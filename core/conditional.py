@@ -0,0 +1,55 @@
+import hashlib
+
+from django.db.models import Subquery
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date
+
+
+def latest_update(queryset):
+    """
+    The latest ``updated_at`` of ``queryset`` as a scalar subquery, to read
+    related rows' changes in the same query as ``list_state``.
+    """
+    return Subquery(queryset.order_by('-updated_at').values('updated_at')[:1])
+
+
+async def list_state(queryset, **scalars):
+    """
+    The latest ``updated_at`` of ``queryset`` and the ``scalars``, e.g. a
+    counter or ``latest_update`` of related rows, read as the newest row of
+    ``queryset``: with an index on ``updated_at`` that is one index lookup,
+    and the scalars are evaluated once. All values are ``None`` when
+    ``queryset`` is empty.
+    """
+    state = await queryset.order_by('-updated_at').values('updated_at', **scalars).afirst()
+    return state or dict.fromkeys(['updated_at', *scalars])
+
+
+def make_etag(request, state):
+    """
+    Weak ETag over the query string and ``state``, e.g. the row count and
+    latest ``updated_at`` of the rows a response is built from.
+    """
+    raw = repr((sorted(request.GET.lists()), sorted(state.items())))
+    return 'W/' + quote_etag(hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest())
+
+
+def not_modified(request, etag, last_modified=None):
+    """
+    Returns the 304 (or 412) response when the request's preconditions
+    match, otherwise ``None``.
+    """
+    response = get_conditional_response(
+        request, etag=etag, last_modified=last_modified and int(last_modified.timestamp()))
+    if response is not None:
+        set_validators(response, etag, last_modified)
+    return response
+
+
+def set_validators(response, etag, last_modified=None):
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    # Authenticated data: browsers may keep it but must revalidate.
+    response['Cache-Control'] = 'private, no-cache'
+    return response
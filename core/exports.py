@@ -0,0 +1,67 @@
+import csv
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+from core.pagination import KeysetPaginator
+
+
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+EXPORT_CHUNK_SIZE = 2000
+
+
+class Echo:
+    """
+    File-like object whose write() hands the line back, so csv.writer can
+    feed a generator.
+    """
+
+    def write(self, value):
+        return value
+
+
+def export_lines(compiled, queryset, export_format, chunk_size=None):
+    """
+    Yields ``queryset`` serialized through ``compiled`` as NDJSON or CSV
+    lines. Rows are read in id-ordered keyset chunks rather than one big
+    result set, since MySQL drivers buffer whole results client-side.
+    """
+    rows = KeysetPaginator(queryset.values_list(*compiled.columns), 'id',
+                           chunk_size or EXPORT_CHUNK_SIZE, compiled.columns).iterate()
+
+    if export_format == 'csv':
+        writer = csv.writer(Echo())
+        yield writer.writerow(compiled.headers)
+        for values in compiled.serialize_flat(rows):
+            yield writer.writerow(values)
+        return
+
+    encoder = DjangoJSONEncoder()
+    for data in compiled.serialize_iter(rows):
+        yield encoder.encode(data) + '\n'
+
+
+async def aexport_lines(compiled, queryset, export_format, chunk_size=None):
+    """
+    ``export_lines`` for ASGI servers, which would otherwise buffer a sync
+    iterator whole: each chunk of lines is read in a worker thread.
+    """
+    lines = export_lines(compiled, queryset, export_format, chunk_size)
+    next_chunk = sync_to_async(lambda: ''.join(islice(lines, chunk_size or EXPORT_CHUNK_SIZE)))
+    while chunk := await next_chunk():
+        yield chunk
+
+
+def export_response(request, compiled, queryset, export_format, filename):
+    stream = aexport_lines if isinstance(request, ASGIRequest) else export_lines
+    response = StreamingHttpResponse(
+        stream(compiled, queryset, export_format), content_type=EXPORT_FORMATS[export_format])
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{export_format}"'
+    return response
@@ -0,0 +1,132 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from core import settings
+from core.profiling import report_profile, start_profiling, stop_profiling
+from core.routers import apin_user_to_primary, pin_to_primary, pin_user_to_primary
+from core.timing import finish_request_timings, install_query_timers, start_request_timings
+
+
+WRITE_METHODS = ('POST', 'PUT', 'PATCH', 'DELETE')
+
+
+class PrimaryPinMiddleware:
+    """
+    Marks a client that just wrote, with a short-lived cookie and, once
+    replicas are configured, a pin on its user in the shared cache, so its
+    next reads skip the replicas (see ``core.routers.read_replica``) until
+    replication has caught up.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.get_response(request)
+        user_id = self.pinned_user_id(request)
+        if user_id is not None:
+            pin_user_to_primary(user_id)
+        return self.process_response(request, response)
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        user_id = self.pinned_user_id(request)
+        if user_id is not None:
+            await apin_user_to_primary(user_id)
+        return self.process_response(request, response)
+
+    def pinned_user_id(self, request):
+        # The authentication decorators set request.user.
+        user = getattr(request, 'user', None)
+        if request.method in WRITE_METHODS and settings.DATABASE_REPLICAS and user is not None:
+            return user.id
+        return None
+
+    def process_response(self, request, response):
+        if request.method in WRITE_METHODS:
+            pin_to_primary(response)
+        return response
+
+
+class ServerTimingMiddleware:
+    """
+    For a ``SERVER_TIMING_SAMPLE_RATE`` share of requests, reports the time
+    spent in authentication, SQL (with the query count), serialization and
+    JSON rendering as a ``Server-Timing`` header and a JSON log line on the
+    ``core.timing`` logger. The metrics overlap where e.g. serializing
+    runs queries; ``total`` covers the rest of the stack below this one.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        install_query_timers()
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = start_request_timings()
+        if token is None:
+            return self.get_response(request)
+        return finish_request_timings(token, request, self.get_response(request))
+
+    async def __acall__(self, request):
+        token = start_request_timings()
+        if token is None:
+            return await self.get_response(request)
+        return finish_request_timings(token, request, await self.get_response(request))
+
+
+class ProfilingMiddleware:
+    """
+    Runs requests carrying a valid ``X-Profile-Token`` header (see
+    ``manage.py profile_token``), plus a ``PROFILING_SAMPLE_RATE`` share of
+    the others, under cProfile and spools their stats to
+    ``PROFILING_SPOOL_DIR`` for ``manage.py merge_profiles``. Only one
+    request per process is profiled at a time, and only in the thread this
+    middleware runs in. Under ASGI that is the event loop, so the stats
+    miss the threads ORM calls are handed to and include every other
+    request's coroutines the loop ran meanwhile; profile a worker with
+    little other traffic for a clean picture. Spooling failures are logged
+    and never fail the request.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        profiler = start_profiling(request)
+        if profiler is None:
+            return self.get_response(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            stop_profiling(profiler)
+        return report_profile(profiler, request, response)
+
+    async def __acall__(self, request):
+        profiler = start_profiling(request)
+        if profiler is None:
+            return await self.get_response(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            stop_profiling(profiler)
+        return report_profile(profiler, request, response)
@@ -0,0 +1,208 @@
+import threading
+import time
+from collections import deque
+
+from django.db.utils import OperationalError
+
+
+class PoolTimeout(OperationalError):
+    pass
+
+
+class ConnectionPool:
+    """
+    Bounded, thread-safe pool of DB-API connections for one database in one
+    worker process. At most ``size`` connections are open at once; a
+    checkout waits up to ``timeout`` seconds for one to come back before
+    raising ``PoolTimeout``. Connections older than ``recycle`` seconds are
+    closed instead of reused, and idle ones are pinged before reuse.
+    """
+
+    # Connections that sat idle for longer than this are pinged on checkout.
+    PING_AFTER = 10.0
+
+    def __init__(self, connect, size, timeout, recycle):
+        self.connect = connect
+        self.size = size
+        self.timeout = timeout
+        self.recycle = recycle
+        self.checkouts = 0
+        self.waits = 0
+        self.timeouts = 0
+        self.opened = 0
+        self.recycled = 0
+        self.discarded = 0
+        self._idle = deque()
+        self._opened_at = {}
+        self._open = 0
+        self._in_use = 0
+        self._closed = False
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        """
+        Returns ``(connection, reused)``; ``reused`` is ``False`` for a
+        connection opened by this call.
+        """
+        with self._condition:
+            self.checkouts += 1
+
+        deadline = None
+        while True:
+            with self._condition:
+                connection, idle_since, stale, deadline = self._take(deadline)
+            for old in stale:
+                self._close_quietly(old)
+
+            if connection is None:
+                return self._open_connection(), False
+            if time.monotonic() - idle_since < self.PING_AFTER or self._ping(connection):
+                return connection, True
+            self.discard(connection)
+
+    def release(self, connection):
+        with self._condition:
+            self._in_use -= 1
+            if self._closed or self._age(connection) >= self.recycle:
+                self.recycled += 1
+                self._forget(connection)
+            else:
+                self._idle.append((connection, time.monotonic()))
+                connection = None
+            self._condition.notify()
+        if connection is not None:
+            self._close_quietly(connection)
+
+    def discard(self, connection):
+        """
+        Closes a checked-out connection that is broken or in an unknown
+        state instead of returning it.
+        """
+        with self._condition:
+            self._in_use -= 1
+            self.discarded += 1
+            self._forget(connection)
+            self._condition.notify()
+        self._close_quietly(connection)
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            idle = [connection for connection, _ in self._idle]
+            self._idle.clear()
+            for connection in idle:
+                self._forget(connection)
+            self._condition.notify_all()
+        for connection in idle:
+            self._close_quietly(connection)
+
+    def stats(self):
+        with self._condition:
+            return {
+                "size": self.size,
+                "open": self._open,
+                "idle": len(self._idle),
+                "in_use": self._in_use,
+                "checkouts": self.checkouts,
+                "waits": self.waits,
+                "timeouts": self.timeouts,
+                "opened": self.opened,
+                "recycled": self.recycled,
+                "discarded": self.discarded,
+            }
+
+    def _take(self, deadline):
+        # Called with the lock held. Returns an idle connection, or
+        # ``None`` once a slot for a new one has been reserved.
+        stale = []
+        while True:
+            while self._idle:
+                # Most recently returned first, so a quiet pool keeps its
+                # warm connections and lets the others age out.
+                connection, idle_since = self._idle.pop()
+                if self._age(connection) < self.recycle:
+                    self._in_use += 1
+                    return connection, idle_since, stale, deadline
+                self.recycled += 1
+                self._forget(connection)
+                stale.append(connection)
+
+            if self._closed:
+                raise OperationalError("The connection pool is closed.")
+            if self._open < self.size:
+                self._open += 1
+                self._in_use += 1
+                return None, None, stale, deadline
+
+            now = time.monotonic()
+            if deadline is None:
+                deadline = now + self.timeout
+                self.waits += 1
+            if now >= deadline:
+                self.timeouts += 1
+                raise PoolTimeout(
+                    f"No database connection became available within {self.timeout}s.")
+            self._condition.wait(deadline - now)
+
+    def _open_connection(self):
+        try:
+            connection = self.connect()
+        except BaseException:
+            with self._condition:
+                self._open -= 1
+                self._in_use -= 1
+                self._condition.notify()
+            raise
+
+        with self._condition:
+            self.opened += 1
+            self._opened_at[id(connection)] = time.monotonic()
+        return connection
+
+    def _forget(self, connection):
+        self._open -= 1
+        self._opened_at.pop(id(connection), None)
+
+    def _age(self, connection):
+        return time.monotonic() - self._opened_at.get(id(connection), 0)
+
+    def _ping(self, connection):
+        try:
+            connection.ping()
+        except Exception:
+            return False
+        return True
+
+    def _close_quietly(self, connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+
+pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(alias, connect, size, timeout, recycle):
+    with _pools_lock:
+        if alias not in pools:
+            pools[alias] = ConnectionPool(connect, size, timeout, recycle)
+        return pools[alias]
+
+
+def close_pools():
+    """
+    Closes the idle connections of every pool and forgets the pools, e.g.
+    before forking so child processes don't share the parent's sockets.
+    Later checkouts open new pools.
+    """
+    with _pools_lock:
+        closing = list(pools.values())
+        pools.clear()
+    for pool in closing:
+        pool.close()
+
+
+def pool_stats():
+    return {alias: pool.stats() for alias, pool in list(pools.items())}
@@ -0,0 +1,142 @@
+import cProfile
+import logging
+import os
+import random
+import re
+import threading
+import time
+import uuid
+from pathlib import Path
+
+from django.core import signing
+
+from core import settings
+
+
+PROFILE_HEADER = 'X-Profile-Token'
+PROFILE_SUFFIX = '.prof'
+
+TOKEN_SALT = 'core.profiling'
+
+logger = logging.getLogger('core.profiling')
+
+# cProfile can only follow one request of the process at a time.
+profiler_lock = threading.Lock()
+
+
+def make_profile_token():
+    """
+    Value for the ``X-Profile-Token`` header, valid for
+    ``PROFILING_TOKEN_MAX_AGE`` seconds.
+    """
+    return signing.TimestampSigner(salt=TOKEN_SALT).sign(uuid.uuid4().hex)
+
+
+def has_profile_token(request):
+    token = request.headers.get(PROFILE_HEADER)
+    if not token:
+        return False
+    try:
+        signing.TimestampSigner(salt=TOKEN_SALT).unsign(token, max_age=settings.PROFILING_TOKEN_MAX_AGE)
+    except signing.BadSignature:
+        return False
+    return True
+
+
+def should_profile(request):
+    return has_profile_token(request) or random.random() < settings.PROFILING_SAMPLE_RATE
+
+
+def endpoint_name(request):
+    """
+    ``ProjectView.get`` for a method of a class-based view, ``signin`` for a
+    function view, or ``unresolved`` when no view matched.
+    """
+    match = request.resolver_match
+    if match is None:
+        return 'unresolved'
+    view_class = getattr(match.func, 'view_class', None)
+    if view_class is not None:
+        return f'{view_class.__name__}.{request.method.lower()}'
+    return match.func.__name__
+
+
+def spool_profile(profiler, request):
+    """
+    Writes ``profiler``'s stats to the spool directory as
+    ``<endpoint>.<time>.<id>.prof``, first deleting the oldest profiles
+    beyond ``PROFILING_SPOOL_MAX_FILES``, and returns the file name.
+    """
+    spool = Path(settings.PROFILING_SPOOL_DIR)
+    spool.mkdir(parents=True, exist_ok=True)
+    prune_spool(spool, settings.PROFILING_SPOOL_MAX_FILES - 1)
+    endpoint = re.sub(r'[^\w.]', '_', endpoint_name(request))
+    name = f'{endpoint}.{int(time.time())}.{uuid.uuid4().hex[:8]}{PROFILE_SUFFIX}'
+    # Written aside and moved into place, so merging never reads half a file.
+    partial = spool / f'.{name}.partial'
+    try:
+        profiler.dump_stats(partial)
+        os.replace(partial, spool / name)
+    except OSError:
+        partial.unlink(missing_ok=True)
+        raise
+    return name
+
+
+def prune_spool(spool, keep):
+    """
+    Deletes the oldest spooled profiles of ``spool`` until at most
+    ``keep`` are left.
+    """
+    paths = list(Path(spool).glob(f'*{PROFILE_SUFFIX}'))
+    if len(paths) <= keep:
+        return
+    mtimes = {}
+    for path in paths:
+        try:
+            mtimes[path] = path.stat().st_mtime
+        except FileNotFoundError:
+            # Pruned by another process meanwhile.
+            continue
+    for path in sorted(mtimes, key=mtimes.get)[:max(len(mtimes) - keep, 0)]:
+        path.unlink(missing_ok=True)
+
+
+def spooled_profiles(spool):
+    """
+    The spooled profile paths of ``spool`` grouped by endpoint.
+    """
+    profiles = {}
+    for path in sorted(Path(spool).glob(f'*{PROFILE_SUFFIX}')):
+        endpoint = path.name.rsplit('.', 3)[0]
+        profiles.setdefault(endpoint, []).append(path)
+    return profiles
+
+
+def start_profiling(request):
+    """
+    Returns a running profiler when ``request`` is to be profiled and no
+    other request is, otherwise ``None``.
+    """
+    if not should_profile(request) or not profiler_lock.acquire(blocking=False):
+        return None
+    profiler = cProfile.Profile()
+    profiler.enable()
+    return profiler
+
+
+def stop_profiling(profiler):
+    profiler.disable()
+    profiler_lock.release()
+
+
+def report_profile(profiler, request, response):
+    try:
+        name = spool_profile(profiler, request)
+    except OSError:
+        # A full disk or a bad spool directory must not fail the request.
+        logger.exception("Could not spool the profile of %s %s", request.method, request.path)
+        return response
+    if request.headers.get(PROFILE_HEADER):
+        response['X-Profile-Id'] = name
+    return response
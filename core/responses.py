@@ -0,0 +1,77 @@
+from abc import ABC, abstractmethod
+
+from django import http
+
+from core import settings
+from core.timing import timed
+
+
+LIST_RESPONSE = 'list'
+RESOURCE_RESPONSE = 'resource'
+MINIMAL_RESPONSE = 'minimal'
+
+# RFC 7240 "Prefer: return=..." values and the response mode they select.
+PREFERENCES = {
+    'return=representation': RESOURCE_RESPONSE,
+    'return=minimal': MINIMAL_RESPONSE,
+}
+
+
+class JsonResponse(http.JsonResponse):
+    """
+    ``django.http.JsonResponse`` that counts encoding the body as the
+    ``render`` Server-Timing metric.
+    """
+
+    def __init__(self, *args, **kwargs):
+        with timed('render'):
+            super().__init__(*args, **kwargs)
+
+
+def get_preference(request):
+    for preference in request.headers.get('Prefer', '').split(','):
+        preference = preference.strip()
+        if preference in PREFERENCES:
+            return preference
+    return None
+
+
+class MutationResponseMixin(ABC):
+    """
+    Chooses what a write answers with. ``list`` (the historical behaviour)
+    re-runs the view's ``get``; ``resource`` returns only the written
+    object through ``serialize_resource``; ``minimal`` returns its id, or
+    nothing for deletes. Clients pick a mode with a ``Prefer: return=...``
+    header, otherwise the view's ``mutation_response_mode`` or, when that
+    is ``None``, ``MUTATION_RESPONSE_MODE`` applies. Views using it
+    are async, so ``get`` and ``serialize_resource`` are coroutines; a
+    view without ``serialize_resource`` cannot be instantiated.
+    """
+
+    mutation_response_mode = None
+
+    async def mutation_response(self, request, message, instance=None):
+        preference = get_preference(request)
+        mode = PREFERENCES[preference] if preference else (
+            self.mutation_response_mode or settings.MUTATION_RESPONSE_MODE)
+
+        if mode == LIST_RESPONSE:
+            return await self.get(request, message=message)
+
+        if instance is None:
+            data = []
+        elif mode == MINIMAL_RESPONSE:
+            data = {"id": instance.id}
+        else:
+            data = await self.serialize_resource(instance)
+
+        response = JsonResponse({"code": 200, "data": data, "messages": message}, status=200)
+        if preference:
+            response['Preference-Applied'] = preference
+        return response
+
+    @abstractmethod
+    async def serialize_resource(self, instance):
+        """
+        The representation of the written ``instance`` in ``resource`` mode.
+        """
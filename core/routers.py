@@ -0,0 +1,152 @@
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+import jwt
+from asgiref.sync import iscoroutinefunction
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+from django.http import HttpRequest
+
+from core import settings
+
+
+PRIMARY_PIN_COOKIE = 'primary_pin'
+
+# The replica alias reads go to in the current context, if any.
+read_alias = ContextVar('read_alias', default=None)
+
+
+def choose_replica():
+    replicas = settings.DATABASE_REPLICAS
+    if not replicas:
+        return None
+    return random.choices(list(replicas), weights=list(replicas.values()))[0]
+
+
+@contextmanager
+def replica_reads():
+    """
+    Sends the reads made inside the block to one replica, picked by
+    weight, so they see a consistent snapshot.
+    """
+    token = read_alias.set(choose_replica())
+    try:
+        yield
+    finally:
+        read_alias.reset(token)
+
+
+def pin_key(user_id):
+    return f'primary_pin:{user_id}'
+
+
+def request_user_id(request):
+    """
+    The user id of the valid Bearer token ``request`` carries, if any. Only
+    used to find the user's pin; authentication happens in the view.
+    """
+    auth_header = request.headers.get('Authorization', '')
+    if not auth_header.startswith('Bearer '):
+        return None
+    try:
+        return jwt.decode(auth_header[7:], settings.SECRET_KEY, algorithms=["HS256"]).get('user_id')
+    except jwt.InvalidTokenError:
+        return None
+
+
+def has_pin_cookie(request):
+    try:
+        return float(request.COOKIES.get(PRIMARY_PIN_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def is_pinned(request):
+    """
+    Whether ``request`` comes from a client that wrote recently and must
+    read its own writes from the primary: a browser with the pin cookie or
+    a token whose user wrote through any worker.
+    """
+    if has_pin_cookie(request):
+        return True
+    user_id = request_user_id(request)
+    return user_id is not None and caches['shared'].get(pin_key(user_id)) is not None
+
+
+async def ais_pinned(request):
+    if has_pin_cookie(request):
+        return True
+    user_id = request_user_id(request)
+    return user_id is not None and await caches['shared'].aget(pin_key(user_id)) is not None
+
+
+def pin_to_primary(response):
+    response.set_cookie(PRIMARY_PIN_COOKIE, str(time.time() + settings.DB_REPLICA_PIN_SECONDS),
+                        max_age=settings.DB_REPLICA_PIN_SECONDS, httponly=True, samesite='Lax')
+
+
+def pin_user_to_primary(user_id):
+    # Bearer clients don't send cookies back, so the pin is also kept
+    # where every worker can see it.
+    caches['shared'].set(pin_key(user_id), True, settings.DB_REPLICA_PIN_SECONDS)
+
+
+async def apin_user_to_primary(user_id):
+    await caches['shared'].aset(pin_key(user_id), True, settings.DB_REPLICA_PIN_SECONDS)
+
+
+def read_replica(view_func):
+    """
+    Runs a read-only view, its authentication included when applied above
+    the authentication decorator, against a replica unless the client is
+    pinned to the primary; principals are still loaded from the primary
+    (see ``users.cache``). Works on function views and view methods.
+    """
+    def get_request(args):
+        return next(arg for arg in args if isinstance(arg, HttpRequest))
+
+    def uses_replicas(request):
+        # Without replicas there is nothing to route, nor a pin to look up.
+        return bool(settings.DATABASE_REPLICAS) and request.method in ('GET', 'HEAD')
+
+    if iscoroutinefunction(view_func):
+        @wraps(view_func)
+        async def async_wrapper(*args, **kwargs):
+            request = get_request(args)
+            if not uses_replicas(request) or await ais_pinned(request):
+                return await view_func(*args, **kwargs)
+            with replica_reads():
+                return await view_func(*args, **kwargs)
+        return async_wrapper
+
+    @wraps(view_func)
+    def wrapper(*args, **kwargs):
+        request = get_request(args)
+        if not uses_replicas(request) or is_pinned(request):
+            return view_func(*args, **kwargs)
+        with replica_reads():
+            return view_func(*args, **kwargs)
+    return wrapper
+
+
+class ReplicaRouter:
+    """
+    Reads go to the replica chosen by ``replica_reads`` and everything else
+    to the primary. Both are named explicitly, so rows loaded from a
+    replica are still written to the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        return read_alias.get() or DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return False if db in settings.DATABASE_REPLICAS else None
@@ -0,0 +1,123 @@
+import re
+
+from django.db import connections
+from django.db.models.expressions import RawSQL
+
+from core.pagination import get_per_page
+from core.responses import JsonResponse
+
+
+MAX_TERMS = 10
+
+
+class SearchNotSupported(Exception):
+    pass
+
+
+def search_terms(query):
+    return re.findall(r'\w+', query or '')[:MAX_TERMS]
+
+
+def search_index_sql(vendor, table, columns):
+    """
+    Statements that create the full-text index over ``columns``: a
+    FULLTEXT index on MySQL, or on SQLite an FTS5 table shadowing ``table``
+    (rowid = id) and the triggers keeping it in step with every write.
+    They can be re-run, e.g. after SQLite rebuilt ``table`` for an
+    ALTER and dropped the triggers with it.
+    """
+    column_list = ', '.join(columns)
+    if vendor == 'mysql':
+        return [f'CREATE FULLTEXT INDEX {table}_search_idx ON {table} ({column_list})']
+    if vendor != 'sqlite':
+        return []
+
+    fts = f'{table}_fts'
+    new_values = ', '.join(f'new.{column}' for column in columns)
+    old_values = ', '.join(f'old.{column}' for column in columns)
+    insert = f'INSERT INTO {fts}(rowid, {column_list}) VALUES (new.id, {new_values});'
+    delete = f"INSERT INTO {fts}({fts}, rowid, {column_list}) VALUES ('delete', old.id, {old_values});"
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({column_list}, content='{table}', content_rowid='id')",
+        f'DROP TRIGGER IF EXISTS {fts}_insert',
+        f'DROP TRIGGER IF EXISTS {fts}_delete',
+        f'DROP TRIGGER IF EXISTS {fts}_update',
+        f'CREATE TRIGGER {fts}_insert AFTER INSERT ON {table} BEGIN {insert} END',
+        f'CREATE TRIGGER {fts}_delete AFTER DELETE ON {table} BEGIN {delete} END',
+        f'CREATE TRIGGER {fts}_update AFTER UPDATE OF {column_list} ON {table} BEGIN {delete} {insert} END',
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    ]
+
+
+def drop_search_index_sql(vendor, table):
+    if vendor == 'mysql':
+        return [f'DROP INDEX {table}_search_idx ON {table}']
+    if vendor != 'sqlite':
+        return []
+    return [f'DROP TABLE IF EXISTS {table}_fts'] + [
+        f'DROP TRIGGER IF EXISTS {table}_fts_{event}' for event in ('insert', 'delete', 'update')]
+
+
+def search(queryset, columns, query):
+    """
+    Narrows ``queryset`` to the rows whose ``columns`` match any of the
+    words in ``query``, annotated with a relevance ``score`` and ordered
+    best first. Returns ``queryset.none()`` when ``query`` has no words.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return queryset.none()
+
+    table = queryset.model._meta.db_table
+    vendor = connections[queryset.db].vendor
+
+    if vendor == 'mysql':
+        match = "MATCH({}) AGAINST (%s IN NATURAL LANGUAGE MODE)".format(
+            ', '.join(f'{table}.{column}' for column in columns))
+        return queryset.annotate(score=RawSQL(match, [' '.join(terms)])).filter(
+            score__gt=0).order_by('-score', '-id')
+
+    if vendor == 'sqlite':
+        fts = f'{table}_fts'
+        expression = ' OR '.join(f'"{term}"' for term in terms)
+        # Joined rather than filtered through a subquery, so bm25() is
+        # computed once per match; it is lower for better matches.
+        return queryset.extra(
+            tables=[fts], where=[f'{fts}.rowid = {table}.id', f'{fts} MATCH %s'], params=[expression],
+            select={'score': f'-bm25({fts})'}).order_by('-score', '-id')
+
+    raise SearchNotSupported(vendor)
+
+
+async def search_response(request, queryset, columns, compiled):
+    """
+    One page of ``search()`` results for the ``q`` query parameter,
+    serialized with ``compiled`` plus each row's ``score``. Matches
+    aren't counted; fetching one extra row tells whether there is a next
+    page.
+    """
+    query = request.GET.get('q', '')
+    if not search_terms(query):
+        return JsonResponse({"code": 401, "data": [], "messages": {"q": ["This field is required."]}}, status=200)
+
+    per_page = get_per_page(request)
+    try:
+        page_number = max(int(request.GET.get('page', 1)), 1)
+    except ValueError:
+        page_number = 1
+    offset = (page_number - 1) * per_page
+
+    results = search(queryset, columns, query).values_list(
+        *compiled.columns, 'score')[offset:offset + per_page + 1]
+    rows = [row async for row in results]
+
+    data = compiled.serialize(rows[:per_page])
+    for item, row in zip(data, rows):
+        item['score'] = round(row[-1], 4)
+
+    return JsonResponse({"code": 200, "data": {
+        "current_page": page_number,
+        "data": data,
+        "per_page": per_page,
+        "has_next": len(rows) > per_page
+    }, "messages": ""}, status=200)
@@ -0,0 +1,121 @@
+from operator import itemgetter
+
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.functional import cached_property
+from rest_framework import serializers
+
+from core.timing import timed
+
+
+# Fields whose to_representation() returns non-null database values as-is.
+PASSTHROUGH_FIELDS = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.ChoiceField,
+    serializers.IntegerField,
+)
+
+
+PLAIN, FORMATTED, NESTED = 'plain', 'formatted', 'nested'
+
+
+class CompiledSerializer:
+    """
+    Fast path for list endpoints: compiles the declared fields of a
+    ``ModelSerializer`` (nested read-only serializers included) into the
+    columns of a ``values_list()`` query and turns the resulting row tuples
+    straight into output dicts, producing the same data as the serializer
+    without building a serializer or model instance per row.
+
+        TASK_ROWS = CompiledSerializer(TaskSerializer)
+        rows = Task.objects.values_list(*TASK_ROWS.columns)
+        data = TASK_ROWS.serialize(rows)
+    """
+
+    def __init__(self, serializer_class):
+        self.serializer_class = serializer_class
+
+    @cached_property
+    def columns(self):
+        return self._compiled[0]
+
+    @cached_property
+    def headers(self):
+        """
+        Dotted output names of the leaf fields, in the order
+        ``serialize_flat`` emits them.
+        """
+        return [header for header, _, _ in self._compiled[2]]
+
+    def serialize(self, rows):
+        convert = self._compiled[1]
+        with timed('serialize'):
+            return [convert(row) for row in rows]
+
+    def serialize_iter(self, rows):
+        convert = self._compiled[1]
+        for row in rows:
+            yield convert(row)
+
+    def serialize_flat(self, rows):
+        """
+        Yields one list of leaf values per row, e.g. for CSV; a null nested
+        object shows as nulls in each of its columns.
+        """
+        entries = self._compiled[2]
+        for row in rows:
+            values = []
+            for _, get, transform in entries:
+                value = get(row)
+                values.append(value if transform is None or value is None else transform(value))
+            yield values
+
+    @cached_property
+    def _compiled(self):
+        columns = []
+        leaves = []
+        convert = self._compile(self.serializer_class(), '', columns, '', leaves)
+        return columns, convert, leaves
+
+    def _compile(self, serializer, prefix, columns, label, leaves):
+        def column(path):
+            if path not in columns:
+                columns.append(path)
+            return itemgetter(columns.index(path))
+
+        entries = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            if field.source == '*' or not field.source:
+                raise ImproperlyConfigured(
+                    f'Field "{name}" of {type(serializer).__name__} can\'t be compiled.')
+            if isinstance(field, (serializers.ListSerializer, serializers.ManyRelatedField, serializers.SerializerMethodField)):
+                raise ImproperlyConfigured(
+                    f'Field "{name}" of {type(serializer).__name__} isn\'t a single column.')
+
+            path = prefix + field.source.replace('.', '__')
+            if isinstance(field, serializers.BaseSerializer):
+                pk_name = field.Meta.model._meta.pk.name
+                entries.append((name, column(f'{path}__{pk_name}'), NESTED,
+                                self._compile(field, f'{path}__', columns, f'{label}{name}.', leaves)))
+            elif isinstance(field, PASSTHROUGH_FIELDS):
+                entries.append((name, column(path), PLAIN, None))
+                leaves.append((label + name, column(path), None))
+            else:
+                entries.append((name, column(path), FORMATTED, field.to_representation))
+                leaves.append((label + name, column(path), field.to_representation))
+
+        def convert(row):
+            data = {}
+            for name, get, kind, transform in entries:
+                value = get(row)
+                if kind is PLAIN or value is None:
+                    data[name] = value
+                elif kind is FORMATTED:
+                    data[name] = transform(value)
+                else:
+                    data[name] = transform(row)
+            return data
+
+        return convert
@@ -11,8 +11,9 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
 from pathlib import Path
+import os
 import sys
-from decouple import config
+from decouple import Choices, Csv, config
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -42,9 +43,12 @@ INSTALLED_APPS = [
     'users',
     'projects',
     'tasks',
+    'overview',
 ]
 
 MIDDLEWARE = [
+    'core.middleware.ProfilingMiddleware',
+    'core.middleware.ServerTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     # 'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -52,6 +56,7 @@ MIDDLEWARE = [
     # 'django.contrib.auth.middleware.AuthenticationMiddleware',
     # 'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.middleware.PrimaryPinMiddleware',
 ]
 
 ROOT_URLCONF = 'core.urls'
@@ -77,7 +82,34 @@ WSGI_APPLICATION = 'core.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-if 'test' in sys.argv:
+# Size of the per-process connection pool; 0 disables pooling and keeps one
+# persistent connection per thread for DB_CONN_MAX_AGE seconds instead.
+DB_POOL_SIZE = config('DB_POOL_SIZE', default=10, cast=int)
+
+# Seconds a request waits for a pooled connection before failing.
+DB_POOL_TIMEOUT = config('DB_POOL_TIMEOUT', default=5.0, cast=float)
+
+# Seconds after which a pooled connection is closed instead of reused.
+DB_POOL_RECYCLE = config('DB_POOL_RECYCLE', default=1800, cast=int)
+
+DB_CONN_MAX_AGE = config('DB_CONN_MAX_AGE', default=60, cast=int)
+
+# Read replicas sharing the primary's credentials, as comma-separated
+# HOST[:PORT][=WEIGHT] entries, e.g. "10.0.0.2=3,10.0.0.3:3307".
+DB_REPLICAS = config('DB_REPLICAS', default='', cast=Csv())
+
+# Seconds a client keeps reading from the primary after a write. Bearer
+# clients are pinned by user id in the "shared" cache.
+DB_REPLICA_PIN_SECONDS = config('DB_REPLICA_PIN_SECONDS', default=5, cast=int)
+
+DATABASE_ROUTERS = ['core.routers.ReplicaRouter']
+
+# Replica aliases mapped to their weights.
+DATABASE_REPLICAS = {}
+
+# The test runner and the bench command use in-memory SQLite. Only the
+# subcommand counts, so e.g. "import_tasks bench" keeps the real database.
+if 'test' in sys.argv or sys.argv[1:2] == ['bench']:
     DATABASES = {
         'default': {
             'ENGINE': 'django.db.backends.sqlite3',
@@ -87,15 +119,37 @@ if 'test' in sys.argv:
 else:
     DATABASES = {
         'default': {
-            'ENGINE': 'django.db.backends.mysql',
+            'ENGINE': 'core.backends.mysql' if DB_POOL_SIZE else 'django.db.backends.mysql',
             'NAME': config('DB_DATABASE'),
             'USER': config('DB_USERNAME'),
             'PASSWORD': config('DB_PASSWORD'),
             'HOST': config('DB_HOST'),
             'PORT': config('DB_PORT'),
+            # Pooled connections go back to the pool at the end of each
+            # request instead of being kept by the thread.
+            'CONN_MAX_AGE': 0 if DB_POOL_SIZE else DB_CONN_MAX_AGE,
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {
+                'pool': {
+                    'size': DB_POOL_SIZE,
+                    'timeout': DB_POOL_TIMEOUT,
+                    'recycle': DB_POOL_RECYCLE,
+                },
+            } if DB_POOL_SIZE else {},
         }
     }
 
+    for index, replica in enumerate(DB_REPLICAS, start=1):
+        address, _, weight = replica.partition('=')
+        host, _, port = address.partition(':')
+        DATABASES[f'replica_{index}'] = {
+            **DATABASES['default'],
+            'HOST': host,
+            'PORT': port or DATABASES['default']['PORT'],
+            'TEST': {'MIRROR': 'default'},
+        }
+        DATABASE_REPLICAS[f'replica_{index}'] = int(weight or 1)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -137,3 +191,121 @@ STATIC_URL = 'static/'
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+
+# Authentication
+
+PRINCIPAL_CACHE_TTL = config('PRINCIPAL_CACHE_TTL', default=60, cast=int)
+
+PRINCIPAL_CACHE_MAX_SIZE = config(
+    'PRINCIPAL_CACHE_MAX_SIZE', default=10000, cast=int)
+
+ACCESS_TOKEN_EMBED_PERMISSIONS = config(
+    'ACCESS_TOKEN_EMBED_PERMISSIONS', default=False, cast=bool)
+
+# Minutes.
+ACCESS_TOKEN_LIFETIME = config('ACCESS_TOKEN_LIFETIME', default=15, cast=int)
+
+# Days a refresh token stays valid unused; each refresh issues a new one.
+REFRESH_TOKEN_LIFETIME = config('REFRESH_TOKEN_LIFETIME', default=14, cast=int)
+
+# New passwords are hashed with PASSWORD_HASHER; hashes made by the others
+# still verify and are replaced on the user's next sign-in. argon2 and
+# bcrypt_sha256 need the argon2-cffi and bcrypt packages.
+PASSWORD_HASHER_CHOICES = {
+    'pbkdf2_sha256': 'users.hashing.PBKDF2PasswordHasher',
+    'argon2': 'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'bcrypt_sha256': 'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'scrypt': 'django.contrib.auth.hashers.ScryptPasswordHasher',
+    'pbkdf2_sha1': 'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+}
+
+PASSWORD_HASHER = config('PASSWORD_HASHER', default='pbkdf2_sha256',
+                         cast=Choices(list(PASSWORD_HASHER_CHOICES)))
+
+PASSWORD_HASHERS = [PASSWORD_HASHER_CHOICES[PASSWORD_HASHER]] + [
+    path for name, path in PASSWORD_HASHER_CHOICES.items() if name != PASSWORD_HASHER]
+
+# 0 keeps the default of the installed Django version.
+PASSWORD_PBKDF2_ITERATIONS = config('PASSWORD_PBKDF2_ITERATIONS', default=0, cast=int)
+
+# Hashing runs on this many threads (or processes), by default half the
+# cores so sign-in bursts leave the rest to other requests. Up to
+# PASSWORD_HASH_MAX_QUEUE more requests wait; the ones after are refused.
+PASSWORD_HASH_EXECUTOR = config('PASSWORD_HASH_EXECUTOR', default='thread', cast=Choices(['thread', 'process']))
+
+PASSWORD_HASH_WORKERS = config('PASSWORD_HASH_WORKERS', default=max(1, (os.cpu_count() or 2) // 2), cast=int)
+
+PASSWORD_HASH_MAX_QUEUE = config('PASSWORD_HASH_MAX_QUEUE', default=64, cast=int)
+
+
+# API
+
+# What project and task writes answer with: "list" (the first page of the
+# list), "resource" (the written object) or "minimal" (its id).
+MUTATION_RESPONSE_MODE = config('MUTATION_RESPONSE_MODE', default='list',
+                                cast=Choices(['list', 'resource', 'minimal']))
+
+
+# Instrumentation
+
+# Share of requests, from 0 to 1, answered with a Server-Timing header and
+# logged to the "core.timing" logger.
+SERVER_TIMING_SAMPLE_RATE = config('SERVER_TIMING_SAMPLE_RATE', default=0.01, cast=float)
+
+# Kept out of test and bench runs, which turn it on where they need it.
+if 'test' in sys.argv or sys.argv[1:2] == ['bench']:
+    SERVER_TIMING_SAMPLE_RATE = 0.0
+
+# Share of requests, from 0 to 1, run under cProfile; requests with a
+# signed X-Profile-Token header always are.
+PROFILING_SAMPLE_RATE = config('PROFILING_SAMPLE_RATE', default=0.0, cast=float)
+
+PROFILING_SPOOL_DIR = config('PROFILING_SPOOL_DIR', default=str(BASE_DIR / 'profiles'))
+
+# Spooled profiles kept; the oldest are deleted to make room for new ones.
+PROFILING_SPOOL_MAX_FILES = config('PROFILING_SPOOL_MAX_FILES', default=1000, cast=int)
+
+PROFILING_TOKEN_MAX_AGE = config('PROFILING_TOKEN_MAX_AGE', default=3600, cast=int)
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'core.timing': {
+            'handlers': ['console'],
+            'level': config('SERVER_TIMING_LOG_LEVEL', default='INFO'),
+            'propagate': False,
+        },
+    },
+}
+
+
+# Caches
+
+# "shared" is seen by every worker process and by management commands, so
+# an invalidation reaches all of them: Redis when CACHE_REDIS_URL is set
+# (needs the redis package), otherwise a database table created with
+# "manage.py createcachetable".
+CACHE_REDIS_URL = config('CACHE_REDIS_URL', default='')
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'shared': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': CACHE_REDIS_URL,
+    } if CACHE_REDIS_URL else {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'cache_entries',
+    },
+}
+
+
+# Overview
+
+OVERVIEW_CACHE_TTL = config('OVERVIEW_CACHE_TTL', default=300, cast=int)
@@ -0,0 +1,187 @@
+import threading
+import time
+from datetime import datetime, timedelta
+from unittest import mock
+
+import jwt
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase
+from django.views import View
+
+from core import settings
+from core.middleware import PrimaryPinMiddleware
+from core.pool import ConnectionPool, PoolTimeout, close_pools, get_pool, pools
+from core.responses import MutationResponseMixin
+from core.routers import PRIMARY_PIN_COOKIE, ReplicaRouter, read_alias, read_replica, replica_reads
+from tasks.models import Task
+from users.models import User
+
+
+class FakeConnection:
+
+    def __init__(self):
+        self.closed = False
+        self.healthy = True
+
+    def ping(self):
+        if not self.healthy:
+            raise OSError("gone away")
+
+    def close(self):
+        self.closed = True
+
+
+class ConnectionPoolTests(SimpleTestCase):
+
+    def make_pool(self, size=2, timeout=0.05, recycle=60):
+        return ConnectionPool(FakeConnection, size=size, timeout=timeout, recycle=recycle)
+
+    def test_connections_are_reused(self):
+        pool = self.make_pool()
+
+        connection, reused = pool.acquire()
+        self.assertFalse(reused)
+        pool.release(connection)
+
+        self.assertEqual(pool.acquire(), (connection, True))
+        self.assertEqual(pool.stats()['opened'], 1)
+        self.assertEqual(pool.stats()['checkouts'], 2)
+
+    def test_checkout_waits_for_a_free_connection(self):
+        pool = self.make_pool(size=1, timeout=1)
+        connection, _ = pool.acquire()
+
+        threading.Timer(0.05, pool.release, [connection]).start()
+
+        self.assertEqual(pool.acquire(), (connection, True))
+        self.assertEqual(pool.stats()['waits'], 1)
+
+    def test_checkout_times_out_when_exhausted(self):
+        pool = self.make_pool(size=1)
+        pool.acquire()
+
+        with self.assertRaises(PoolTimeout):
+            pool.acquire()
+        self.assertEqual(pool.stats()['timeouts'], 1)
+
+    def test_old_and_broken_connections_are_replaced(self):
+        pool = self.make_pool(recycle=0)
+        connection, _ = pool.acquire()
+        pool.release(connection)
+
+        self.assertTrue(connection.closed)
+        self.assertEqual(pool.stats()['open'], 0)
+
+        pool = self.make_pool()
+        connection, _ = pool.acquire()
+        pool.release(connection)
+        connection.healthy = False
+
+        with mock.patch.object(ConnectionPool, 'PING_AFTER', 0):
+            replacement, reused = pool.acquire()
+
+        self.assertIsNot(replacement, connection)
+        self.assertFalse(reused)
+        self.assertTrue(connection.closed)
+        self.assertEqual(pool.stats()['discarded'], 1)
+
+    def test_close_pools_closes_and_forgets_them(self):
+        pool = get_pool('forking', FakeConnection, size=2, timeout=0.05, recycle=60)
+        connection, _ = pool.acquire()
+        pool.release(connection)
+
+        close_pools()
+
+        self.assertTrue(connection.closed)
+        self.assertNotIn('forking', pools)
+        self.assertIsNot(get_pool('forking', FakeConnection, size=2, timeout=0.05, recycle=60), pool)
+        close_pools()
+
+    def test_failed_connect_frees_its_slot(self):
+        pool = ConnectionPool(mock.Mock(side_effect=OSError), size=1, timeout=0.05, recycle=60)
+
+        with self.assertRaises(OSError):
+            pool.acquire()
+        self.assertEqual(pool.stats()['open'], 0)
+
+
+@mock.patch.object(settings, 'DATABASE_REPLICAS', {'replica_1': 1})
+class ReplicaRoutingTests(SimpleTestCase):
+
+    def test_router_sends_replica_reads_to_the_replica(self):
+        router = ReplicaRouter()
+        self.assertEqual(router.db_for_read(Task), 'default')
+
+        with replica_reads():
+            self.assertEqual(router.db_for_read(Task), 'replica_1')
+            self.assertEqual(router.db_for_write(Task), 'default')
+
+        self.assertFalse(router.allow_migrate('replica_1', 'tasks'))
+
+    def test_read_replica_respects_method_and_pin(self):
+        view = read_replica(lambda request: read_alias.get())
+        factory = RequestFactory()
+
+        self.assertEqual(view(factory.get('/')), 'replica_1')
+        self.assertIsNone(view(factory.post('/')))
+
+        request = factory.get('/')
+        request.COOKIES[PRIMARY_PIN_COOKIE] = str(time.time() + 60)
+        self.assertIsNone(view(request))
+
+    def test_writes_pin_the_client_to_the_primary(self):
+        response = self.client.post('/api/signin/', {}, content_type='application/json')
+
+        self.assertIn(PRIMARY_PIN_COOKIE, response.cookies)
+        self.assertEqual(response.cookies[PRIMARY_PIN_COOKIE]['max-age'],
+                         settings.DB_REPLICA_PIN_SECONDS)
+
+
+@mock.patch.object(settings, 'DATABASE_REPLICAS', {'replica_1': 1})
+class UserPinTests(TestCase):
+
+    def setUp(self):
+        caches['shared'].clear()
+
+    def bearer(self, user_id):
+        token = jwt.encode({"user_id": user_id, "exp": datetime.now() + timedelta(minutes=15)},
+                           settings.SECRET_KEY, algorithm="HS256")
+        return {'Authorization': f'Bearer {token}'}
+
+    def test_writes_pin_the_user_for_bearer_clients(self):
+        factory = RequestFactory()
+        request = factory.post('/')
+        request.user = User(id=7)
+        PrimaryPinMiddleware(lambda request: HttpResponse())(request)
+
+        view = read_replica(lambda request: read_alias.get())
+        self.assertIsNone(view(factory.get('/', headers=self.bearer(7))))
+        self.assertEqual(view(factory.get('/', headers=self.bearer(8))), 'replica_1')
+
+    async def test_async_views_see_the_user_pin(self):
+        factory = RequestFactory()
+        request = factory.post('/')
+        request.user = User(id=7)
+
+        async def write(request):
+            return HttpResponse()
+
+        await PrimaryPinMiddleware(write)(request)
+
+        async def read(request):
+            return read_alias.get()
+
+        view = read_replica(read)
+        self.assertIsNone(await view(factory.get('/', headers=self.bearer(7))))
+        self.assertEqual(await view(factory.get('/', headers=self.bearer(8))), 'replica_1')
+
+
+class MutationResponseTests(SimpleTestCase):
+
+    def test_views_must_serialize_the_resource(self):
+        class IncompleteView(MutationResponseMixin, View):
+            pass
+
+        with self.assertRaises(TypeError):
+            IncompleteView()
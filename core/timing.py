@@ -0,0 +1,114 @@
+import json
+import logging
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+from core import settings
+
+
+logger = logging.getLogger('core.timing')
+
+# The timings of the sampled request being handled in the current context,
+# if any. Copied into the threads sync_to_async runs ORM calls in.
+request_timings = ContextVar('request_timings', default=None)
+
+# Server-Timing metrics, in the order they are reported.
+METRICS = ('auth', 'db', 'serialize', 'render')
+
+
+class RequestTimings:
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.durations = dict.fromkeys(METRICS, 0.0)
+        self.queries = 0
+
+    def add(self, name, duration):
+        self.durations[name] += duration
+
+    def total(self):
+        return time.perf_counter() - self.started
+
+    def server_timing(self, total):
+        entries = [f'{name};dur={self.durations[name] * 1000:.2f}' for name in METRICS]
+        entries[METRICS.index('db')] += f';desc="{self.queries} queries"'
+        entries.append(f'total;dur={total * 1000:.2f}')
+        return ', '.join(entries)
+
+    def record(self, request, response, total):
+        return {
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "total_ms": round(total * 1000, 2),
+            "queries": self.queries,
+            **{f'{name}_ms': round(duration * 1000, 2) for name, duration in self.durations.items()},
+        }
+
+
+@contextmanager
+def timed(name):
+    """
+    Adds the time spent in the block to metric ``name`` of the current
+    request; does nothing unless the request was sampled.
+    """
+    timings = request_timings.get()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, time.perf_counter() - started)
+
+
+def time_query(execute, sql, params, many, context):
+    timings = request_timings.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.add('db', time.perf_counter() - started)
+        timings.queries += 1
+
+
+def install_query_timer(connection, **kwargs):
+    # Put first: execute_wrapper() blocks that are open now remove their
+    # wrapper by popping the last one.
+    if time_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, time_query)
+
+
+def install_query_timers():
+    """
+    Times the queries of every connection opened from now on, and of
+    those the current thread already has open. Connections are
+    per-thread, so the wrapper stays installed and checks for a sampled
+    request itself.
+    """
+    connection_created.connect(install_query_timer)
+    for connection in connections.all(initialized_only=True):
+        install_query_timer(connection)
+
+
+def start_request_timings():
+    if random.random() >= settings.SERVER_TIMING_SAMPLE_RATE:
+        return None
+    return request_timings.set(RequestTimings())
+
+
+def finish_request_timings(token, request, response):
+    timings = request_timings.get()
+    request_timings.reset(token)
+    total = timings.total()
+    response['Server-Timing'] = timings.server_timing(total)
+    logger.info(json.dumps(timings.record(request, response, total)))
+    return response
@@ -16,8 +16,12 @@ Including another URLconf
 """
 from django.urls import path, include
 
+from core import views
+
 urlpatterns = [
     path('api/', include('users.urls')),
     path('api/', include('projects.urls')),
     path('api/', include('tasks.urls')),
+    path('api/', include('overview.urls')),
+    path('api/db/pools/', views.database_pools),
 ]
@@ -0,0 +1,13 @@
+from core.responses import JsonResponse
+from django.views.decorators.http import require_http_methods
+
+from core.pool import pool_stats
+from users.decorators import require_authentication
+from users.models import Permission
+
+
+@require_authentication(Permission.VIEW_SETTINGS)
+@require_http_methods(['GET'])
+def database_pools(request):
+    # Statistics of the worker process that served this request.
+    return JsonResponse({"code": 200, "data": pool_stats(), "messages": ""}, status=200)
@@ -0,0 +1,170 @@
+from collections import Counter as Tally
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import transaction
+from django.db.models import Count, F, Subquery
+
+from overview.models import Counter
+from projects.models import Project
+from tasks.models import Task
+
+
+PROJECTS_KEY = 'projects'
+TASKS_KEY = 'tasks'
+
+pending_deltas = ContextVar('pending_counter_deltas', default=None)
+
+
+def task_counter_key(project_id=None, status=None, assignee_id=None, unassigned=False):
+    """
+    Returns the counter holding the number of tasks matching the given
+    filters, or ``None`` when that combination isn't maintained.
+    """
+    if assignee_id is not None or unassigned:
+        if project_id is not None or status is not None:
+            return None
+        return f'tasks:assignee:{assignee_id if assignee_id is not None else "none"}'
+
+    if project_id is not None and status is not None:
+        return f'tasks:project:{project_id}:status:{status}'
+    if project_id is not None:
+        return f'tasks:project:{project_id}'
+    if status is not None:
+        return f'tasks:status:{status}'
+    return TASKS_KEY
+
+
+def task_counter_keys(project_id, status, assignee_id):
+    return [
+        TASKS_KEY,
+        task_counter_key(project_id=project_id),
+        task_counter_key(status=status),
+        task_counter_key(project_id=project_id, status=status),
+        task_counter_key(assignee_id=assignee_id, unassigned=assignee_id is None),
+    ]
+
+
+def apply_counter_deltas(deltas):
+    pending = pending_deltas.get()
+    if pending is not None:
+        pending.update(deltas)
+        return
+
+    deltas = {key: delta for key, delta in deltas.items() if delta}
+    if not deltas:
+        return
+
+    with transaction.atomic(savepoint=False):
+        # Sorted so concurrent writers lock counter rows in the same order.
+        missing = []
+        for key in sorted(deltas):
+            updated = Counter.objects.filter(name=key).update(
+                value=F('value') + deltas[key])
+            if not updated:
+                missing.append(key)
+
+        if missing:
+            Counter.objects.bulk_create(
+                [Counter(name=key) for key in missing], ignore_conflicts=True)
+            for key in missing:
+                Counter.objects.filter(name=key).update(
+                    value=F('value') + deltas[key])
+
+
+def apply_task_changes(previous=(), current=()):
+    """
+    Adjusts the task counters for rows written without signals, e.g. by
+    ``bulk_create``. ``previous`` and ``current`` hold the
+    ``(project_id, status, assign_to_user_id)`` of the rows before and
+    after the write.
+    """
+    deltas = Tally()
+    for values in current:
+        deltas.update(task_counter_keys(*values))
+    for values in previous:
+        deltas.subtract(task_counter_keys(*values))
+    apply_counter_deltas(deltas)
+
+
+@contextmanager
+def batched_counters():
+    """
+    Collects the counter updates made inside the block, e.g. by the signal
+    handlers of a queryset delete, and applies them once at the end.
+    """
+    pending = Tally()
+    token = pending_deltas.set(pending)
+    try:
+        yield
+    finally:
+        pending_deltas.reset(token)
+    apply_counter_deltas(pending)
+
+
+def get_count(key):
+    return Counter.objects.filter(name=key).values_list('value', flat=True).first() or 0
+
+
+async def aget_count(key):
+    return await Counter.objects.filter(name=key).values_list('value', flat=True).afirst() or 0
+
+
+def count_subquery(key):
+    """
+    The counter's value as an expression, to read it inside another query.
+    """
+    return Subquery(Counter.objects.filter(name=key).values('value')[:1])
+
+
+def compute_counters():
+    """
+    Counts every maintained key from the source tables with a few GROUP BY
+    queries.
+    """
+    counts = Tally()
+    counts[PROJECTS_KEY] = Project.objects.count()
+
+    rows = Task.objects.values('project_id', 'status').annotate(
+        total=Count('id')).order_by()
+    for row in rows:
+        counts[TASKS_KEY] += row['total']
+        counts[task_counter_key(project_id=row['project_id'])] += row['total']
+        counts[task_counter_key(status=row['status'])] += row['total']
+        counts[task_counter_key(
+            project_id=row['project_id'], status=row['status'])] += row['total']
+
+    rows = Task.objects.values('assign_to_user_id').annotate(
+        total=Count('id')).order_by()
+    for row in rows:
+        assignee_id = row['assign_to_user_id']
+        counts[task_counter_key(assignee_id=assignee_id,
+                                unassigned=assignee_id is None)] += row['total']
+
+    return counts
+
+
+def reconcile_counters():
+    """
+    Rewrites counters that drifted from the source tables, e.g. after bulk
+    writes that bypass signals. Returns the drifted keys mapped to their
+    ``(stored, actual)`` values.
+    """
+    with transaction.atomic():
+        actual = compute_counters()
+        stored = dict(Counter.objects.select_for_update().values_list('name', 'value'))
+
+        drift = {}
+        for key in set(actual) | set(stored):
+            if actual.get(key, 0) != stored.get(key, 0):
+                drift[key] = (stored.get(key, 0), actual.get(key, 0))
+
+        stale = [key for key in stored if key not in actual]
+        Counter.objects.filter(name__in=stale).delete()
+        Counter.objects.bulk_create(
+            [Counter(name=key, value=actual[key]) for key in actual if key not in stored])
+        for key, (_, value) in drift.items():
+            if key in stored and key in actual:
+                Counter.objects.filter(name=key).update(value=value)
+
+    return drift
@@ -0,0 +1,94 @@
+from datetime import datetime, timezone
+
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import Count, Q
+
+from core import settings
+from projects.models import Project
+from tasks.models import Task
+
+
+OVERVIEW_CACHE_KEY = 'overview:dashboard'
+
+# Shared by all workers, so a write invalidates every one of them.
+cache = caches['shared']
+
+
+def build_overview():
+    now = datetime.now(timezone.utc)
+    open_tasks = ~Q(status=Task.DONE_STATUS)
+
+    by_status = dict.fromkeys(Task.get_statuses(), 0)
+    by_priority = dict.fromkeys(Task.get_priorities(), 0)
+    total = 0
+    overdue = 0
+    rows = Task.objects.values('status', 'priority').annotate(
+        total=Count('id'), overdue=Count('id', filter=Q(due_date__lt=now) & open_tasks)).order_by()
+    for row in rows:
+        by_status[row['status']] = by_status.get(row['status'], 0) + row['total']
+        by_priority[row['priority']] = by_priority.get(row['priority'], 0) + row['total']
+        total += row['total']
+        overdue += row['overdue']
+
+    projects = Project.objects.annotate(
+        total=Count('tasks'),
+        done=Count('tasks', filter=Q(tasks__status=Task.DONE_STATUS)),
+        overdue=Count('tasks', filter=Q(tasks__due_date__lt=now) & ~Q(tasks__status=Task.DONE_STATUS)),
+    ).values('id', 'name', 'due_date', 'total', 'done', 'overdue').order_by('id')
+
+    projects_data = [{
+        "id": project['id'],
+        "name": project['name'],
+        "due_date": project['due_date'],
+        "tasks": project['total'],
+        "done": project['done'],
+        "overdue": project['overdue'],
+        "progress": round(project['done'] * 100 / project['total']) if project['total'] else 0,
+    } for project in projects]
+
+    return {
+        "projects": len(projects_data),
+        "tasks": total,
+        "overdue": overdue,
+        "by_status": by_status,
+        "by_priority": by_priority,
+        "project_progress": projects_data,
+        "generated_at": now,
+    }
+
+
+def get_overview():
+    overview = cache.get(OVERVIEW_CACHE_KEY)
+    if overview is None:
+        overview = build_overview()
+        cache.set(OVERVIEW_CACHE_KEY, overview, settings.OVERVIEW_CACHE_TTL)
+    return overview
+
+
+def delete_cached_overview():
+    cache.delete(OVERVIEW_CACHE_KEY)
+
+
+def invalidate_overview():
+    connection = transaction.get_connection()
+    if not connection.in_atomic_block:
+        delete_cached_overview()
+        return
+
+    # Once per transaction, however many rows it writes, as the shared
+    # cache costs a round trip per delete. The pending callback is dropped
+    # from run_on_commit if its savepoint or transaction rolls back.
+    pending = getattr(connection, 'overview_invalidation', None)
+    if pending is not None and any(func is pending for _, func, _ in connection.run_on_commit):
+        return
+
+    def delete_on_commit():
+        connection.overview_invalidation = None
+        delete_cached_overview()
+
+    delete_cached_overview()
+    # Drop it again once the write is visible, in case another request
+    # rebuilt it from the pre-commit data in the meantime.
+    transaction.on_commit(delete_on_commit)
+    connection.overview_invalidation = delete_on_commit
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from overview.counters import reconcile_counters
+
+
+class Command(BaseCommand):
+    help = 'Recount projects and tasks and fix drifted counters'
+
+    def handle(self, *args, **options):
+
+        drift = reconcile_counters()
+
+        for key, (stored, actual) in sorted(drift.items()):
+            self.stdout.write(f'Counter "{key}" drifted: {stored} -> {actual}.')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Counters reconciled ({len(drift)} drifted).'))
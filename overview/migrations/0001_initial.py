@@ -0,0 +1,56 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:14
+
+from django.db import migrations, models
+
+
+def populate_counters(apps, schema_editor):
+    Counter = apps.get_model('overview', 'Counter')
+    Project = apps.get_model('projects', 'Project')
+    Task = apps.get_model('tasks', 'Task')
+
+    counts = {'projects': Project.objects.count(), 'tasks': 0}
+
+    def add(key, total):
+        counts[key] = counts.get(key, 0) + total
+
+    rows = Task.objects.values('project_id', 'status').annotate(
+        total=models.Count('id')).order_by()
+    for row in rows:
+        add('tasks', row['total'])
+        add(f"tasks:project:{row['project_id']}", row['total'])
+        add(f"tasks:status:{row['status']}", row['total'])
+        add(f"tasks:project:{row['project_id']}:status:{row['status']}", row['total'])
+
+    rows = Task.objects.values('assign_to_user_id').annotate(
+        total=models.Count('id')).order_by()
+    for row in rows:
+        assignee_id = row['assign_to_user_id']
+        add(f"tasks:assignee:{assignee_id if assignee_id is not None else 'none'}", row['total'])
+
+    Counter.objects.bulk_create(
+        [Counter(name=name, value=value) for name, value in counts.items()])
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('projects', '0002_project_created_at_id_index'),
+        ('tasks', '0002_task_created_at_id_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Counter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('value', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'counters',
+            },
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,12 @@
+from django.db import models
+
+
+class Counter(models.Model):
+    name = models.CharField(max_length=100, unique=True)
+    value = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return self.name
+
+    class Meta:
+        db_table = 'counters'
@@ -0,0 +1,70 @@
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from overview.counters import PROJECTS_KEY, apply_counter_deltas, task_counter_keys
+from overview.dashboard import invalidate_overview
+from projects.models import Project
+from tasks.models import Task
+
+
+TASK_COUNTER_FIELDS = ('project_id', 'status', 'assign_to_user_id')
+
+DEFERRED = object()
+
+
+def loaded_task_counter_keys(instance):
+    values = [instance.__dict__.get(field, DEFERRED) for field in TASK_COUNTER_FIELDS]
+    if DEFERRED in values:
+        # Deferred field; reconcile_counters corrects anything missed.
+        return None
+    return task_counter_keys(*values)
+
+
+@receiver(post_save, sender=Project)
+def count_created_project(sender, instance, created, **kwargs):
+    if created:
+        apply_counter_deltas({PROJECTS_KEY: 1})
+
+
+@receiver(post_delete, sender=Project)
+def count_deleted_project(sender, instance, **kwargs):
+    apply_counter_deltas({PROJECTS_KEY: -1})
+
+
+@receiver(post_init, sender=Task)
+def remember_task_counter_keys(sender, instance, **kwargs):
+    instance._counter_keys = loaded_task_counter_keys(
+        instance) if instance.pk else None
+
+
+@receiver(post_save, sender=Task)
+def count_saved_task(sender, instance, created, **kwargs):
+    previous_keys = instance._counter_keys
+    current_keys = loaded_task_counter_keys(instance)
+    instance._counter_keys = current_keys
+
+    if current_keys is None or (previous_keys is None and not created):
+        return
+
+    deltas = dict.fromkeys(current_keys, 0)
+    for key in current_keys:
+        deltas[key] += 1
+    for key in previous_keys or []:
+        deltas[key] = deltas.get(key, 0) - 1
+
+    apply_counter_deltas(deltas)
+
+
+@receiver(post_delete, sender=Task)
+def count_deleted_task(sender, instance, **kwargs):
+    keys = loaded_task_counter_keys(instance)
+    if keys is not None:
+        apply_counter_deltas({key: -1 for key in keys})
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def invalidate_overview_cache(sender, **kwargs):
+    invalidate_overview()
@@ -0,0 +1,135 @@
+from io import StringIO
+from django.test import TestCase
+from django.core.cache import caches
+from django.core.management import call_command
+from datetime import datetime, timedelta
+import jwt
+
+from core import settings
+
+from overview.counters import PROJECTS_KEY, TASKS_KEY, get_count, task_counter_key
+from overview.models import Counter
+from projects.models import Project
+from tasks.models import Task
+from users.models import Role, User
+
+
+class CounterTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command('seed', verbosity=0)
+
+    def setUp(self):
+        self.user = User.objects.first()
+        self.project = Project.objects.create(
+            name="Counted Project",
+            due_date="2025-11-20 16:53:14",
+            creator=self.user
+        )
+
+    def create_task(self, **kwargs):
+        return Task.objects.create(
+            project=self.project,
+            title="Counted Task",
+            due_date="2025-12-10 10:00:00",
+            **kwargs
+        )
+
+    def test_counters_follow_writes(self):
+        task = self.create_task(assign_to_user=self.user)
+        self.create_task(status=Task.DONE_STATUS)
+
+        self.assertEqual(get_count(PROJECTS_KEY), 1)
+        self.assertEqual(get_count(TASKS_KEY), 2)
+        self.assertEqual(get_count(task_counter_key(
+            project_id=self.project.id, status=Task.TODO_STATUS)), 1)
+        self.assertEqual(get_count(task_counter_key(
+            assignee_id=self.user.id)), 1)
+
+        task = Task.objects.get(id=task.id)
+        task.status = Task.DONE_STATUS
+        task.save()
+
+        self.assertEqual(get_count(task_counter_key(
+            status=Task.TODO_STATUS)), 0)
+        self.assertEqual(get_count(task_counter_key(
+            status=Task.DONE_STATUS)), 2)
+
+        self.project.delete()
+
+        self.assertEqual(get_count(PROJECTS_KEY), 0)
+        self.assertEqual(get_count(TASKS_KEY), 0)
+        self.assertEqual(get_count(task_counter_key(
+            assignee_id=self.user.id)), 0)
+
+    def test_reconcile_counters(self):
+        self.create_task()
+        Counter.objects.filter(name=TASKS_KEY).update(value=42)
+        Task.objects.bulk_create([Task(
+            project=self.project, title="Bulk Task", due_date="2025-12-10 10:00:00")])
+
+        call_command('reconcile_counters', stdout=StringIO())
+
+        self.assertEqual(get_count(TASKS_KEY), 2)
+        self.assertEqual(get_count(task_counter_key(
+            project_id=self.project.id)), 2)
+
+
+class OverviewTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command('seed', verbosity=0)
+
+    def setUp(self):
+        caches['shared'].clear()
+        role = Role.objects.get(name=Role.MEMBER_ROLE)
+        user = User.objects.create(
+            full_name="overview member",
+            email="overviewmember@example.com",
+            password="overviewmemberpass",
+            role=role
+        )
+        user.permissions.set(role.permissions.all())
+        access_token = jwt.encode(
+            {"user_id": user.id, "exp": datetime.now() + timedelta(minutes=15)}, settings.SECRET_KEY, algorithm="HS256"
+        )
+        self.client.defaults['HTTP_AUTHORIZATION'] = f'Bearer {access_token}'
+
+        # As if committed, so the test's own writes invalidate again.
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project = Project.objects.create(
+                name="Overview Project",
+                due_date="2025-11-20 16:53:14",
+                creator=user
+            )
+            Task.objects.create(project=self.project, title="Overdue", priority=Task.HIGH_PRIORITY,
+                                due_date=datetime.now() - timedelta(days=1))
+            Task.objects.create(project=self.project, title="Done", status=Task.DONE_STATUS,
+                                due_date=datetime.now() - timedelta(days=1))
+
+    def test_overview(self):
+        response_json = self.client.get('/api/overview/').json()
+        data = response_json['data']
+
+        self.assertEqual(data['projects'], 1)
+        self.assertEqual(data['tasks'], 2)
+        self.assertEqual(data['overdue'], 1)
+        self.assertEqual(data['by_status'][Task.DONE_STATUS], 1)
+        self.assertEqual(data['by_priority'][Task.HIGH_PRIORITY], 1)
+        self.assertEqual(data['project_progress'][0]['progress'], 50)
+
+    def test_overview_is_cached_until_a_write(self):
+        self.client.get('/api/overview/')
+
+        # Only the lookup in the shared cache table.
+        with self.assertNumQueries(1):
+            self.client.get('/api/overview/')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Task.objects.create(project=self.project, title="New",
+                                due_date=datetime.now() + timedelta(days=1))
+
+        response_json = self.client.get('/api/overview/').json()
+        self.assertEqual(response_json['data']['tasks'], 3)
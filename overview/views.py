@@ -0,0 +1,12 @@
+from core.responses import JsonResponse
+from django.views.decorators.http import require_http_methods
+
+from overview.dashboard import get_overview
+from users.decorators import require_authentication
+from users.models import Permission
+
+
+@require_authentication(Permission.VIEW_OVERVIEW)
+@require_http_methods(['GET'])
+def overview(request):
+    return JsonResponse({"code": 200, "data": get_overview(), "messages": ""}, status=200)
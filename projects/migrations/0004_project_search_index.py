@@ -0,0 +1,24 @@
+from django.db import migrations
+
+from core.search import drop_search_index_sql, search_index_sql
+
+
+def create_search_index(apps, schema_editor):
+    for statement in search_index_sql(schema_editor.connection.vendor, 'projects', ['name', 'description']):
+        schema_editor.execute(statement)
+
+
+def drop_search_index(apps, schema_editor):
+    for statement in drop_search_index_sql(schema_editor.connection.vendor, 'projects'):
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0003_project_updated_at_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
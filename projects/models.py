@@ -3,6 +3,9 @@ from users.models import User
 
 
 class Project(models.Model):
+    # Columns covered by the full-text index (see core.search).
+    SEARCH_FIELDS = ['name', 'description']
+
     creator = models.ForeignKey(
         User, on_delete=models.SET_NULL, related_name='projects', null=True, blank=True)
     name = models.CharField(max_length=255, null=False)
@@ -16,3 +19,10 @@ class Project(models.Model):
 
     class Meta:
         db_table = 'projects'
+        indexes = [
+            models.Index(fields=['created_at', 'id'],
+                         name='projects_created_at_id_idx'),
+            # Makes MAX(updated_at) for the list validators an index lookup.
+            models.Index(fields=['updated_at'],
+                         name='projects_updated_at_idx'),
+        ]
@@ -5,7 +5,9 @@ import jwt
 from datetime import datetime, timedelta
 
 from core import settings
+from overview.counters import TASKS_KEY, get_count, reconcile_counters, task_counter_key
 from projects.models import Project
+from tasks.models import Task
 from users.models import Role, User
 
 
@@ -15,6 +17,9 @@ class ProjectTests(TestCase):
     def setUpTestData(cls):
         call_command('seed', verbosity=0)
 
+    def future_date(self, days=30):
+        return (datetime.now() + timedelta(days=days)).strftime("%Y-%m-%d %H:%M:%S")
+
     def setUp(self):
         role = Role.objects.get(name=Role.MANAGER_ROLE)
         user = User.objects.create(
@@ -33,7 +38,7 @@ class ProjectTests(TestCase):
         project_name = "Project 1"
         data = {
             "name": project_name,
-            "due_date": "2025-11-20 16:53:14",
+            "due_date": self.future_date(),
             "description": "This is a sample project"
         }
         response = self.client.post(
@@ -56,7 +61,7 @@ class ProjectTests(TestCase):
         updated_name = "Updated Project Name"
         data = {
             "name": updated_name,
-            "due_date": "2026-01-31 23:59:59",
+            "due_date": self.future_date(),
             "description": "Updated description"
         }
 
@@ -82,3 +87,134 @@ class ProjectTests(TestCase):
 
         self.assertEqual(response.status_code, 200)
         self.assertFalse(Project.objects.filter(id=project.id).exists())
+
+    def test_project_cursor_pagination(self):
+        for index in range(7):
+            Project.objects.create(
+                name=f"Paged Project {index}",
+                due_date="2025-10-31 23:59:59",
+                creator=User.objects.first()
+            )
+
+        names = []
+        cursor = None
+        while True:
+            params = {"pagination": "cursor", "per_page": 3}
+            if cursor:
+                params["cursor"] = cursor
+            response_json = self.client.get('/api/project/', params).json()
+            names += [p['name'] for p in response_json['data']['data']]
+            cursor = response_json['data']['next_cursor']
+            if cursor is None:
+                break
+
+        self.assertEqual(
+            names, [f"Paged Project {index}" for index in reversed(range(7))])
+
+        response_json = self.client.get(
+            '/api/project/', {"cursor": "not-a-cursor"}).json()
+        self.assertEqual(response_json['messages'], "Invalid cursor.")
+
+    def test_project_list_query_count(self):
+        for index in range(10):
+            Project.objects.create(
+                name=f"Listed Project {index}",
+                due_date="2025-10-31 23:59:59",
+                creator=User.objects.first()
+            )
+
+        self.client.get('/api/project/')
+
+        with self.assertNumQueries(2):
+            response_json = self.client.get(
+                '/api/project/', {"per_page": 10}).json()
+
+        self.assertEqual(len(response_json['data']['data']), 10)
+        self.assertEqual(response_json['data']['total'], 10)
+
+    def test_project_deletion_with_tasks(self):
+        project = Project.objects.create(
+            name="Project with tasks", due_date="2025-10-31 23:59:59", creator=User.objects.first())
+        Task.objects.bulk_create([
+            Task(project=project, title=f"Task {index}", due_date="2025-12-10 10:00:00",
+                 status=Task.DONE_STATUS if index % 2 else Task.TODO_STATUS)
+            for index in range(50)])
+        reconcile_counters()
+        tasks = get_count(TASKS_KEY)
+
+        # The counters of the cascaded tasks are updated once per key, not
+        # once per task.
+        self.client.get('/api/project/')
+        with self.assertNumQueries(14):
+            self.client.delete(f'/api/project/{project.id}/', headers={'Prefer': 'return=minimal'})
+
+        self.assertFalse(Task.objects.filter(project_id=project.id).exists())
+        self.assertEqual(get_count(TASKS_KEY), tasks - 50)
+        self.assertEqual(get_count(task_counter_key(status=Task.DONE_STATUS)),
+                         Task.objects.filter(status=Task.DONE_STATUS).count())
+
+    def test_project_resource_response(self):
+        data = {
+            "name": "Resource Project",
+            "due_date": self.future_date(),
+        }
+
+        # Authentication is cached after the first request, so a write in
+        # resource mode costs only the insert, its counter update and the
+        # overview invalidation (plus the savepoint around them, as tests
+        # run inside a transaction).
+        self.client.get('/api/project/')
+        with self.assertNumQueries(5):
+            response = self.client.post(
+                '/api/project/', data, content_type='application/json', headers={'Prefer': 'return=representation'})
+
+        self.assertEqual(response.json()['data']['name'], "Resource Project")
+
+    def test_project_patch(self):
+        project = Project.objects.create(
+            name="Patched Project",
+            due_date="2025-12-31 23:59:59",
+            description="Kept description",
+            creator=User.objects.first()
+        )
+
+        response = self.client.patch(
+            f'/api/project/{project.id}/', {"name": "Renamed Project"}, content_type='application/json',
+            headers={'Prefer': 'return=representation'})
+
+        self.assertEqual(response.json()['data']['name'], "Renamed Project")
+        project.refresh_from_db()
+        self.assertEqual(project.description, "Kept description")
+
+    def test_project_conditional_get(self):
+        project = Project.objects.create(
+            name="Polled Project",
+            due_date="2025-12-31 23:59:59",
+            creator=User.objects.first()
+        )
+
+        etag = self.client.get('/api/project/')['ETag']
+        response = self.client.get('/api/project/', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+
+        response = self.client.get(f'/api/project/{project.id}/')
+        self.assertEqual(response.json()['data']['name'], "Polled Project")
+        detail_etag = response['ETag']
+
+        project.name = "Renamed Project"
+        project.save()
+
+        self.assertEqual(self.client.get('/api/project/', headers={'If-None-Match': etag}).status_code, 200)
+        self.assertEqual(self.client.get(f'/api/project/{project.id}/', headers={
+            'If-None-Match': detail_etag}).status_code, 200)
+
+    def test_project_search(self):
+        Project.objects.create(name="Website redesign", due_date="2025-12-31 23:59:59",
+                               description="New landing page", creator=User.objects.first())
+        Project.objects.create(name="Mobile app", due_date="2025-12-31 23:59:59",
+                               creator=User.objects.first())
+
+        response_json = self.client.get('/api/project/search/', {"q": "landing"}).json()
+
+        self.assertEqual([project['name'] for project in response_json['data']['data']], ["Website redesign"])
+        self.assertIn('score', response_json['data']['data'][0])
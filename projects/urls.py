@@ -3,5 +3,7 @@ from . import views
 
 urlpatterns = [
     path('project/', views.ProjectView.as_view()),
+    path('project/export/', views.ProjectExportView.as_view()),
+    path('project/search/', views.ProjectSearchView.as_view()),
     path('project/<int:project_id>/', views.ProjectView.as_view()),
 ]
@@ -1,10 +1,20 @@
 import json
-from django.http import JsonResponse
+from asgiref.sync import sync_to_async
+from django.db import transaction
 from django.views import View
 from rest_framework import serializers
 from projects.models import Project
 from users.decorators import class_require_authentication
 from django.core.paginator import Paginator
+from core.conditional import list_state, make_etag, not_modified, set_validators
+from core.responses import JsonResponse, MutationResponseMixin
+from core.routers import read_replica
+from core.search import search_response
+from core.serializers import CompiledSerializer
+from core.timing import timed
+from core.exports import EXPORT_FORMATS, export_response
+from core.pagination import InvalidCursor, KeysetPaginator, get_per_page, wants_cursor_pagination
+from overview.counters import PROJECTS_KEY, batched_counters, count_subquery
 from datetime import datetime, timezone
 
 from users.models import Permission
@@ -30,31 +40,30 @@ class ProjectSerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'description', 'due_date']
 
 
-class ProjectView(View):
+PROJECT_ROWS = CompiledSerializer(ProjectSerializer)
+
+
+class ProjectView(MutationResponseMixin, View):
 
     @class_require_authentication(Permission.CREATE_PROJECT)
-    def post(self, request):
+    async def post(self, request):
         data = json.loads(request.body)
         serializer = CreateProjectSerializer(data=data)
         if not serializer.is_valid():
             return JsonResponse({"code": 401, "data": [], "messages": serializer.errors}, status=200)
 
-        project = Project.objects.create(
-            name=serializer.validated_data.get('name'),
-            description=serializer.validated_data.get('description', ''),
-            due_date=serializer.validated_data.get('due_date'),
-            creator=request.user
-        )
+        project = await sync_to_async(self.create_project)(
+            serializer.validated_data, request.user)
 
         if not isinstance(project, Project):
             return JsonResponse({"code": 500, "data": [], "messages": "Project creating failure."}, status=200)
 
-        return self.get(request, "Project created successfully.")
+        return await self.mutation_response(request, "Project created successfully.", project)
 
     @class_require_authentication(Permission.UPDATE_PROJECT)
-    def put(self, request, project_id):
+    async def put(self, request, project_id):
 
-        project = Project.objects.filter(id=project_id).first()
+        project = await Project.objects.filter(id=project_id).afirst()
         if not isinstance(project, Project):
             return JsonResponse({"code": 404, "data": [], "messages": "Project not found."}, status=200)
 
@@ -66,36 +75,154 @@ class ProjectView(View):
         for attr, value in serializer.validated_data.items():
             setattr(project, attr, value)
 
-        project.save()
+        await project.asave()
+
+        return await self.mutation_response(request, "Project updated successfully.", project)
+
+    @class_require_authentication(Permission.UPDATE_PROJECT)
+    async def patch(self, request, project_id):
+
+        project = await Project.objects.filter(id=project_id).afirst()
+        if not isinstance(project, Project):
+            return JsonResponse({"code": 404, "data": [], "messages": "Project not found."}, status=200)
+
+        data = json.loads(request.body)
+        serializer = CreateProjectSerializer(data=data, partial=True)
+        if not serializer.is_valid():
+            return JsonResponse({"code": 401, "data": [], "messages": serializer.errors}, status=200)
+
+        for attr, value in serializer.validated_data.items():
+            setattr(project, attr, value)
+
+        # UPDATE only the submitted columns; auto_now needs updated_at
+        # listed explicitly.
+        await project.asave(update_fields=[*serializer.validated_data, 'updated_at'])
 
-        return self.get(request, "Project updated successfully.")
+        return await self.mutation_response(request, "Project updated successfully.", project)
 
     @class_require_authentication(Permission.DELETE_PROJECT)
-    def delete(self, request, project_id):
+    async def delete(self, request, project_id):
 
-        project = Project.objects.filter(id=project_id).first()
+        project = await Project.objects.filter(id=project_id).afirst()
         if not isinstance(project, Project):
             return JsonResponse({"code": 404, "data": [], "messages": "Project not found."}, status=200)
 
-        project.delete()
+        await sync_to_async(self.delete_project)(project)
+
+        return await self.mutation_response(request, "Project deleted successfully.")
+
+    def delete_project(self, project):
+        # The cascade fires the task delete signal per task; their counter
+        # updates are applied once, in the same transaction.
+        with transaction.atomic(), batched_counters():
+            project.delete()
 
-        return self.get(request, "Project deleted successfully.")
+    def create_project(self, validated_data, creator):
+        # Transactions aren't available in async code, so the insert and
+        # its counter update run together in a sync helper.
+        with transaction.atomic():
+            return Project.objects.create(
+                name=validated_data.get('name'),
+                description=validated_data.get('description', ''),
+                due_date=validated_data.get('due_date'),
+                creator=creator
+            )
 
+    async def serialize_resource(self, project):
+        with timed('serialize'):
+            return ProjectSerializer(project).data
+
+    @read_replica
     @class_require_authentication(Permission.VIEW_PROJECTS)
-    def get(self, request, message=""):
-        object_list = Project.objects.all()
+    async def get(self, request, project_id=None, message=""):
+        if project_id is not None:
+            return await self.get_detail(request, project_id)
+
+        # One query yields both the validators and the total; the counter
+        # already holds the total, so there is no COUNT(*).
+        state = await list_state(Project.objects.all(), count=count_subquery(PROJECTS_KEY))
+        if request.method not in ('GET', 'HEAD'):
+            return await self.get_page(request, state, message)
+
+        etag = make_etag(request, state)
+        response = not_modified(request, etag)
+        if response is None:
+            response = set_validators(await self.get_page(request, state, message), etag)
+        return response
+
+    async def get_detail(self, request, project_id):
+        row = await Project.objects.filter(id=project_id).values_list(
+            *PROJECT_ROWS.columns, 'updated_at').afirst()
+        if row is None:
+            return JsonResponse({"code": 404, "data": [], "messages": "Project not found."}, status=200)
+
+        last_modified = row[-1]
+        etag = make_etag(request, {"id": project_id, "updated_at": last_modified})
+        response = not_modified(request, etag, last_modified)
+        if response is not None:
+            return response
+
+        return set_validators(JsonResponse(
+            {"code": 200, "data": PROJECT_ROWS.serialize([row])[0], "messages": ""}, status=200), etag, last_modified)
+
+    async def get_page(self, request, state, message=""):
+        if wants_cursor_pagination(request):
+            return await self.get_cursor_page(request, message)
+        return await self.get_offset_page(request, state['count'] or 0, message)
+
+    async def get_offset_page(self, request, total, message=""):
+        object_list = Project.objects.order_by(
+            'id').values_list(*PROJECT_ROWS.columns)
         per_page = request.GET.get('per_page', 5)
         paginator = Paginator(object_list, per_page)
+        paginator.count = total
 
         page_number = request.GET.get('page', 1)
         page_obj = paginator.get_page(page_number)
 
-        projects_data = [ProjectSerializer(
-            p).data for p in page_obj.object_list]
+        projects_data = PROJECT_ROWS.serialize([row async for row in page_obj.object_list])
 
         return JsonResponse({"code": 500, "data": {
             "current_page": page_number,
             "data": projects_data,
             "per_page": per_page,
-            "total": object_list.count()
+            "total": paginator.count
+        }, "messages": message}, status=200)
+
+    async def get_cursor_page(self, request, message=""):
+        per_page = get_per_page(request)
+        columns = PROJECT_ROWS.columns + ['created_at']
+        paginator = KeysetPaginator(
+            Project.objects.values_list(*columns), '-created_at', per_page, columns)
+
+        try:
+            page, next_cursor = await paginator.aget_page(request.GET.get('cursor'))
+        except InvalidCursor:
+            return JsonResponse({"code": 401, "data": [], "messages": "Invalid cursor."}, status=200)
+
+        projects_data = PROJECT_ROWS.serialize(page)
+
+        return JsonResponse({"code": 200, "data": {
+            "data": projects_data,
+            "per_page": per_page,
+            "next_cursor": next_cursor
         }, "messages": message}, status=200)
+
+
+class ProjectSearchView(View):
+
+    @read_replica
+    @class_require_authentication(Permission.VIEW_PROJECTS)
+    async def get(self, request):
+        return await search_response(request, Project.objects.all(), Project.SEARCH_FIELDS, PROJECT_ROWS)
+
+
+class ProjectExportView(View):
+
+    @class_require_authentication(Permission.VIEW_PROJECTS)
+    def get(self, request):
+        export_format = request.GET.get('format', 'ndjson')
+        if export_format not in EXPORT_FORMATS:
+            return JsonResponse({"code": 401, "data": [], "messages": {"format": [f"Must be one of: {', '.join(EXPORT_FORMATS)}."]}}, status=200)
+
+        return export_response(request, PROJECT_ROWS, Project.objects.all(), export_format, 'projects')
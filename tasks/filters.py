@@ -0,0 +1,62 @@
+from rest_framework import serializers
+from overview.counters import task_counter_key
+from tasks.models import Task
+
+
+class TaskFilterSerializer(serializers.Serializer):
+    """
+    Validates the task list query string. Every filter combination leads
+    with a column of one of the indexes declared on ``Task``, and only
+    indexed sort keys are accepted.
+    """
+
+    SORTS = ['created_at', '-created_at',
+             'due_date', '-due_date', 'id', '-id']
+
+    project_id = serializers.IntegerField(required=False)
+    status = serializers.ChoiceField(
+        choices=Task.get_statuses(), required=False)
+    priority = serializers.ChoiceField(
+        choices=Task.get_priorities(), required=False)
+    assignee = serializers.IntegerField(required=False)
+    due_after = serializers.DateTimeField(required=False)
+    due_before = serializers.DateTimeField(required=False)
+    sort = serializers.ChoiceField(choices=SORTS, required=False)
+
+    def validate(self, attrs):
+        if 'due_after' in attrs and 'due_before' in attrs and attrs['due_after'] > attrs['due_before']:
+            raise serializers.ValidationError(
+                "due_after must not be later than due_before.")
+        return attrs
+
+    def filter(self, queryset):
+        data = self.validated_data
+        lookups = {
+            'project_id': data.get('project_id'),
+            'status': data.get('status'),
+            'priority': data.get('priority'),
+            'assign_to_user_id': data.get('assignee'),
+            'due_date__gte': data.get('due_after'),
+            'due_date__lte': data.get('due_before'),
+        }
+        return queryset.filter(**{lookup: value for lookup, value in lookups.items() if value is not None})
+
+    def get_sort(self, default):
+        return self.validated_data.get('sort', default)
+
+    def get_ordering(self, default):
+        sort = self.get_sort(default)
+        if sort.lstrip('-') == 'id':
+            return [sort]
+        return [sort, '-id' if sort.startswith('-') else 'id']
+
+    def counter_key(self):
+        """
+        Returns the maintained counter for these filters, or ``None`` when
+        the total has to be counted.
+        """
+        data = self.validated_data
+        if any(name in data for name in ('priority', 'due_after', 'due_before')):
+            return None
+        return task_counter_key(project_id=data.get('project_id'), status=data.get('status'),
+                                assignee_id=data.get('assignee'))
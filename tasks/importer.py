@@ -0,0 +1,193 @@
+import csv
+import json
+import time
+
+from django.db import transaction
+from django.utils.dateparse import parse_datetime
+from django.utils.timezone import is_naive, make_aware
+
+from overview.counters import apply_task_changes
+from overview.dashboard import invalidate_overview
+from projects.models import Project
+from tasks.models import Task
+from users.models import User
+
+
+IMPORT_FORMATS = ['csv', 'ndjson']
+
+
+class ImportRowError(Exception):
+    pass
+
+
+class TaskImporter:
+    """
+    Imports tasks from an iterable of text lines (a file, or a decoded
+    request body) without holding the input in memory. Projects and
+    assignees are resolved through lookup tables loaded once, and rows are
+    written with ``bulk_create`` in one transaction per batch.
+
+    A row names its project by ``project_id`` or ``project`` (the project
+    name) and its assignee, optionally, by ``assigned_to_user_id`` or
+    ``assignee_email``. ``title`` and ``due_date`` are required; ``status``
+    and ``priority`` fall back to the model defaults. Invalid rows are
+    skipped and reported with their line number.
+    """
+
+    MAX_REPORTED_ERRORS = 100
+
+    # NDJSON values can be of any JSON type; CSV ones are always strings.
+    TEXT_FIELDS = ('title', 'description', 'status', 'priority', 'project', 'assignee_email')
+    ID_FIELDS = ('project_id', 'assigned_to_user_id')
+
+    def __init__(self, batch_size=5000, progress=None):
+        self.batch_size = batch_size
+        self.progress = progress
+        self.imported = 0
+        self.failed = 0
+        self.errors = []
+        self.statuses = set(Task.get_statuses())
+        self.priorities = set(Task.get_priorities())
+        self.title_max_length = Task._meta.get_field('title').max_length
+
+        self.project_ids = set()
+        self.project_names = {}
+        for project_id, name in Project.objects.values_list('id', 'name').iterator():
+            self.project_ids.add(project_id)
+            self.project_names.setdefault(name, project_id)
+
+        self.user_ids = set()
+        self.user_emails = {}
+        for user_id, email in User.objects.values_list('id', 'email').iterator():
+            self.user_ids.add(user_id)
+            self.user_emails[email.lower()] = user_id
+
+    def run(self, lines, import_format):
+        started = time.monotonic()
+        batch = []
+
+        for line_number, record in self.parse(lines, import_format):
+            try:
+                batch.append(self.build_task(record))
+            except ImportRowError as error:
+                self.failed += 1
+                if len(self.errors) < self.MAX_REPORTED_ERRORS:
+                    self.errors.append({"line": line_number, "message": str(error)})
+                continue
+
+            if len(batch) >= self.batch_size:
+                self.write(batch, started)
+                batch = []
+
+        if batch:
+            self.write(batch, started)
+        if self.imported:
+            invalidate_overview()
+
+        return {"imported": self.imported, "failed": self.failed, "errors": self.errors,
+                "seconds": round(time.monotonic() - started, 3)}
+
+    def parse(self, lines, import_format):
+        if import_format == 'csv':
+            reader = csv.DictReader(lines)
+            for record in reader:
+                yield reader.line_num, record
+            return
+
+        for line_number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                record = None
+            if not isinstance(record, dict):
+                self.failed += 1
+                if len(self.errors) < self.MAX_REPORTED_ERRORS:
+                    self.errors.append({"line": line_number, "message": "Invalid JSON object."})
+                continue
+            yield line_number, record
+
+    def build_task(self, record):
+        for name in self.TEXT_FIELDS:
+            if record.get(name) is not None and not isinstance(record[name], str):
+                raise ImportRowError(f"{name} must be a string.")
+        for name in self.ID_FIELDS:
+            value = record.get(name)
+            if value is not None and (isinstance(value, bool) or not isinstance(value, (int, str))):
+                raise ImportRowError(f"{name} must be an id.")
+
+        title = (record.get('title') or '').strip()
+        if not title:
+            raise ImportRowError("title is required.")
+        # Strict SQL modes would fail the whole batch instead.
+        if len(title) > self.title_max_length:
+            raise ImportRowError(f"title must be at most {self.title_max_length} characters.")
+
+        due_date = record.get('due_date')
+        due_date = parse_datetime(due_date) if isinstance(due_date, str) else None
+        if due_date is None:
+            raise ImportRowError("due_date must be a datetime.")
+        if is_naive(due_date):
+            due_date = make_aware(due_date)
+
+        status = record.get('status') or Task.TODO_STATUS
+        if status not in self.statuses:
+            raise ImportRowError(f'Unknown status "{status}".')
+
+        priority = record.get('priority') or Task.MEDIUM_PRIORITY
+        if priority not in self.priorities:
+            raise ImportRowError(f'Unknown priority "{priority}".')
+
+        return Task(
+            title=title,
+            description=record.get('description') or '',
+            due_date=due_date,
+            status=status,
+            priority=priority,
+            project_id=self.resolve_project(record),
+            assign_to_user_id=self.resolve_assignee(record),
+        )
+
+    def resolve_project(self, record):
+        if record.get('project_id') not in (None, ''):
+            try:
+                project_id = int(record['project_id'])
+            except (TypeError, ValueError):
+                project_id = None
+            if project_id not in self.project_ids:
+                raise ImportRowError(f'Project "{record["project_id"]}" does not exist.')
+            return project_id
+
+        if record.get('project') in self.project_names:
+            return self.project_names[record['project']]
+        raise ImportRowError(f'Project "{record.get("project", "")}" does not exist.')
+
+    def resolve_assignee(self, record):
+        if record.get('assigned_to_user_id') not in (None, ''):
+            try:
+                user_id = int(record['assigned_to_user_id'])
+            except (TypeError, ValueError):
+                user_id = None
+            if user_id not in self.user_ids:
+                raise ImportRowError(f'User "{record["assigned_to_user_id"]}" does not exist.')
+            return user_id
+
+        email = (record.get('assignee_email') or '').strip().lower()
+        if not email:
+            return None
+        if email not in self.user_emails:
+            raise ImportRowError(f'User "{email}" does not exist.')
+        return self.user_emails[email]
+
+    def write(self, batch, started):
+        with transaction.atomic():
+            Task.objects.bulk_create(batch, batch_size=1000)
+            apply_task_changes(current=[
+                (task.project_id, task.status, task.assign_to_user_id) for task in batch])
+
+        self.imported += len(batch)
+        if self.progress:
+            elapsed = time.monotonic() - started
+            self.progress({"imported": self.imported, "failed": self.failed,
+                           "rows_per_second": round(self.imported / elapsed) if elapsed else None})
@@ -0,0 +1,261 @@
+import json
+import time
+from collections import namedtuple
+from io import StringIO
+from datetime import datetime, timedelta, timezone
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import setup_test_environment
+from django.urls import get_resolver, resolve
+
+from projects.models import Project
+from tasks.models import Task
+from tasks.synthetic import SYNTHETIC_PASSWORD
+from users.models import User
+from users.tokens import create_access_token, create_refresh_token
+
+
+# ``path`` and ``data`` may use {project}, {task} and {item}, the latter
+# being what ``setup`` returned for the iteration; ``setup`` runs untimed.
+# ``code`` is the expected "code" of JSON answers.
+Scenario = namedtuple('Scenario', ['name', 'method', 'path', 'data', 'content_type', 'setup', 'max_iterations', 'code'],
+                      defaults=[None, 'application/json', None, None, 200])
+
+METRICS = ['p50_ms', 'p95_ms', 'p99_ms', 'queries', 'bytes']
+
+
+class Command(BaseCommand):
+    help = 'Benchmark every API endpoint in-process against a synthetic SQLite dataset'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=50)
+        parser.add_argument('--projects', type=int, default=200)
+        parser.add_argument('--tasks', type=int, default=5000)
+        parser.add_argument('--iterations', type=int, default=30)
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument('--only', action='append', default=[], metavar='NAME',
+                            help='Run only the named scenario. Repeatable.')
+        parser.add_argument('--output', help='File to write the JSON results to.')
+        parser.add_argument('--budgets', help='JSON file of per-scenario limits on ' + ', '.join(METRICS) + '.')
+
+    def handle(self, *args, **options):
+
+        # The settings switch to in-memory SQLite for this command, like for
+        # the test runner; build the schema the same way the runner does.
+        if connection.vendor != 'sqlite':
+            raise CommandError('bench runs against the SQLite test database only.')
+        setup_test_environment(debug=False)
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+
+        started = time.perf_counter()
+        admin = self.seed(options)
+        self.stdout.write(f'Seeded in {time.perf_counter() - started:.1f}s.')
+
+        client = Client(HTTP_AUTHORIZATION=f'Bearer {create_access_token(admin)}')
+        self.context = {
+            'project': Project.objects.order_by('id').values_list('id', flat=True).first(),
+            'task': Task.objects.order_by('id').values_list('id', flat=True).first(),
+            'user': admin.id,
+        }
+
+        scenarios = [scenario for scenario in self.scenarios()
+                     if not options['only'] or scenario.name in options['only']]
+        results = {}
+        for scenario in scenarios:
+            results[scenario.name] = self.run(client, scenario, options['iterations'])
+            self.stdout.write(self.format_result(scenario.name, results[scenario.name]))
+
+        report = {
+            "dataset": {name: options[name] for name in ('users', 'projects', 'tasks', 'seed')},
+            "iterations": options['iterations'],
+            "uncovered_routes": self.uncovered_routes(scenarios) if not options['only'] else [],
+            "results": results,
+        }
+        for route in report['uncovered_routes']:
+            self.stderr.write(f'No scenario covers {route}.')
+
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(report, output, indent=2)
+        else:
+            self.stdout.write(json.dumps(report, indent=2))
+
+        if options['budgets']:
+            self.check_budgets(results, options['budgets'])
+
+    def seed(self, options):
+        call_command('seed', users=options['users'], projects=options['projects'], tasks=options['tasks'],
+                     seed=options['seed'], stdout=StringIO())
+        return User.objects.get(email='admin@example.com')
+
+    def scenarios(self):
+        future = (datetime.now(timezone.utc) + timedelta(days=30)).isoformat()
+        task = {"title": "Bench task", "description": "Created by bench", "due_date": future,
+                "status": Task.TODO_STATUS, "priority": Task.LOW_PRIORITY,
+                "project_id": '{project}', "assigned_to_user_id": '{user}'}
+        project = {"name": "Bench project", "description": "Created by bench", "due_date": future}
+
+        def new_task(context):
+            return Task.objects.create(project_id=context['project'], title='Disposable',
+                                       due_date=datetime.now(timezone.utc)).id
+
+        def new_project(context):
+            return Project.objects.create(name='Disposable', due_date=datetime.now(timezone.utc)).id
+
+        def new_tasks(context):
+            tasks = Task.objects.bulk_create([Task(project_id=context['project'], title='Disposable',
+                                                   due_date=datetime.now(timezone.utc)) for _ in range(100)])
+            return [task.id for task in tasks]
+
+        def new_refresh_token(context):
+            return create_refresh_token(context['user'])
+
+        def new_email(context):
+            return f'signup{time.perf_counter_ns()}@example.com'
+
+        def import_rows(context):
+            return ''.join(json.dumps({"title": f"Imported {index}", "due_date": future,
+                                       "project_id": context['project']}) + '\n' for index in range(100))
+
+        # Password hashing dominates the auth writes, so they run fewer times.
+        return [
+            Scenario('signup', 'post', '/api/signup/', {"full_name": "Bench", "email": '{item}', "password": "benchpassword"},
+                     setup=new_email, max_iterations=5),
+            Scenario('signin', 'post', '/api/signin/', {"email": "user0@example.com", "password": SYNTHETIC_PASSWORD},
+                     max_iterations=5),
+            Scenario('auth_data', 'get', '/api/auth_data/'),
+            Scenario('password_hashing', 'get', '/api/auth/hashing/'),
+            Scenario('token_refresh', 'post', '/api/token/refresh/', {"refresh_token": '{item}'},
+                     setup=new_refresh_token),
+            # The offset project list, which writes answer with by default,
+            # has always reported code 500.
+            Scenario('project_list', 'get', '/api/project/', {"per_page": 20}, code=500),
+            Scenario('project_list_cursor', 'get', '/api/project/', {"pagination": "cursor", "per_page": 20}),
+            Scenario('project_detail', 'get', '/api/project/{project}/'),
+            Scenario('project_create', 'post', '/api/project/', project, code=500),
+            Scenario('project_update', 'put', '/api/project/{project}/', project, code=500),
+            Scenario('project_patch', 'patch', '/api/project/{project}/', {"name": "Patched by bench"}, code=500),
+            Scenario('project_delete', 'delete', '/api/project/{item}/', setup=new_project, code=500),
+            Scenario('project_export', 'get', '/api/project/export/', {"format": "ndjson"}),
+            Scenario('project_search', 'get', '/api/project/search/', {"q": "design api"}),
+            Scenario('task_list', 'get', '/api/task/', {"per_page": 20}),
+            Scenario('task_list_filtered', 'get', '/api/task/', {"status": Task.TODO_STATUS, "priority": Task.HIGH_PRIORITY}),
+            Scenario('task_list_cursor', 'get', '/api/task/', {"pagination": "cursor", "per_page": 20}),
+            Scenario('task_detail', 'get', '/api/task/{task}/'),
+            Scenario('task_create', 'post', '/api/task/', task),
+            Scenario('task_update', 'put', '/api/task/{task}/', task),
+            Scenario('task_patch', 'patch', '/api/task/{task}/', {"title": "Patched by bench"}),
+            Scenario('task_status', 'patch', '/api/task/{task}/status/', {"status": Task.IN_PROGRESS_STATUS}),
+            Scenario('task_delete', 'delete', '/api/task/{item}/', setup=new_task),
+            Scenario('task_export', 'get', '/api/task/export/', {"format": "csv", "status": Task.DONE_STATUS}),
+            Scenario('task_search', 'get', '/api/task/search/', {"q": "login bug"}),
+            Scenario('task_import', 'post', '/api/task/import/', '{item}', 'application/x-ndjson', import_rows),
+            Scenario('task_bulk_create', 'post', '/api/task/bulk/', {"tasks": [task] * 100}),
+            Scenario('task_bulk_delete', 'delete', '/api/task/bulk/', {"ids": '{item}'}, setup=new_tasks),
+            Scenario('task_bulk_update', 'put', '/api/task/bulk/', {"tasks": '{item}'},
+                     setup=lambda context: [{**task, "id": task_id} for task_id in new_tasks(context)]),
+            Scenario('overview', 'get', '/api/overview/'),
+            Scenario('db_pools', 'get', '/api/db/pools/'),
+        ]
+
+    def run(self, client, scenario, iterations):
+        iterations = min(iterations, scenario.max_iterations or iterations)
+        queries = []
+
+        def count(execute, sql, params, many, context):
+            queries[-1] += 1
+            return execute(sql, params, many, context)
+
+        timings = []
+        sizes = []
+        # The first request warms caches and isn't recorded.
+        for iteration in range(iterations + 1):
+            context = dict(self.context)
+            if scenario.setup:
+                context['item'] = scenario.setup(context)
+            path = scenario.path.format(**context)
+            data = self.fill(scenario.data, context)
+            if scenario.method != 'get' and not isinstance(data, str):
+                data = json.dumps(data)
+
+            queries.append(0)
+            with connection.execute_wrapper(count):
+                start = time.perf_counter()
+                response = getattr(client, scenario.method)(path, data, content_type=scenario.content_type) \
+                    if scenario.method != 'get' else client.get(path, data)
+                body = b''.join(response.streaming_content) if response.streaming else response.content
+                elapsed = time.perf_counter() - start
+
+            code = response.json().get('code') if response.get('Content-Type') == 'application/json' else 200
+            if response.status_code != 200 or code != scenario.code:
+                raise CommandError(f'{scenario.name}: {scenario.method.upper()} {path} answered '
+                                   f'{response.status_code} with code {code}: {body[:200]!r}')
+            if iteration:
+                timings.append(elapsed * 1000)
+                sizes.append(len(body))
+
+        timings.sort()
+        return {
+            "method": scenario.method.upper(),
+            "path": scenario.path,
+            "iterations": iterations,
+            "p50_ms": round(self.percentile(timings, 50), 3),
+            "p95_ms": round(self.percentile(timings, 95), 3),
+            "p99_ms": round(self.percentile(timings, 99), 3),
+            "mean_ms": round(sum(timings) / len(timings), 3),
+            "queries": max(queries[1:]),
+            "bytes": max(sizes),
+        }
+
+    def fill(self, data, context):
+        # Whole-value placeholders keep the context value's type, e.g. ids.
+        if isinstance(data, dict):
+            return {key: self.fill(value, context) for key, value in data.items()}
+        if isinstance(data, list):
+            return [self.fill(value, context) for value in data]
+        if isinstance(data, str):
+            key = data[1:-1]
+            if data.startswith('{') and data.endswith('}') and key in context:
+                return self.fill(context[key], context)
+        return data
+
+    def percentile(self, values, percent):
+        # Nearest-rank percentile of sorted values.
+        index = max(0, -(-len(values) * percent // 100) - 1)
+        return values[index]
+
+    def uncovered_routes(self, scenarios):
+        covered = {resolve(scenario.path.format(project=1, task=1, item=1)).route for scenario in scenarios}
+        return sorted(set(self.routes(get_resolver().url_patterns)) - covered)
+
+    def routes(self, patterns, prefix=''):
+        for pattern in patterns:
+            if hasattr(pattern, 'url_patterns'):
+                yield from self.routes(pattern.url_patterns, prefix + str(pattern.pattern))
+            else:
+                yield prefix + str(pattern.pattern)
+
+    def check_budgets(self, results, path):
+        with open(path) as budgets_file:
+            budgets = json.load(budgets_file)
+
+        failures = []
+        for name, limits in budgets.items():
+            if name not in results:
+                continue
+            for metric, limit in limits.items():
+                if results[name][metric] > limit:
+                    failures.append(f'{name}: {metric} {results[name][metric]} exceeds {limit}')
+
+        for failure in failures:
+            self.stderr.write(self.style.ERROR(failure))
+        if failures:
+            raise CommandError(f'{len(failures)} budget(s) exceeded.')
+        self.stdout.write(self.style.SUCCESS('All budgets met.'))
+
+    def format_result(self, name, result):
+        return (f'{name}: p50 {result["p50_ms"]:.2f} ms, p95 {result["p95_ms"]:.2f} ms, '
+                f'p99 {result["p99_ms"]:.2f} ms, {result["queries"]} queries, {result["bytes"]} bytes')
@@ -0,0 +1,67 @@
+import time
+from datetime import datetime, timedelta, timezone
+from django.core.management.base import BaseCommand
+from projects.models import Project
+from projects.views import PROJECT_ROWS, ProjectSerializer
+from tasks.models import Task
+from tasks.views import TASK_ROWS, TaskSerializer
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = 'Compare list serialization through DRF with the compiled row serializers'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100)
+        parser.add_argument('--repeat', type=int, default=200)
+
+    def handle(self, *args, **options):
+
+        rows = options['rows']
+        repeat = options['repeat']
+        now = datetime.now(timezone.utc)
+
+        # Unsaved instances and their values_list() equivalents, so the
+        # comparison measures serialization only, without the database.
+        user = User(id=1, full_name='Bench User', email='bench@example.com')
+        projects = [Project(id=i, name=f'Project {i}', description='Description',
+                            due_date=now + timedelta(days=i)) for i in range(1, rows + 1)]
+        tasks = [Task(id=i, project=projects[i - 1], assign_to_user=user if i % 3 else None,
+                      title=f'Task {i}', description='Description', status=Task.TODO_STATUS,
+                      priority=Task.MEDIUM_PRIORITY, due_date=now + timedelta(hours=i))
+                 for i in range(1, rows + 1)]
+
+        for name, serializer_class, compiled, instances in [
+            ('projects', ProjectSerializer, PROJECT_ROWS, projects),
+            ('tasks', TaskSerializer, TASK_ROWS, tasks),
+        ]:
+            values = [tuple(self.resolve(instance, column) for column in compiled.columns)
+                      for instance in instances]
+
+            expected = [dict(serializer_class(instance).data) for instance in instances]
+            if compiled.serialize(values) != expected:
+                self.stderr.write(self.style.ERROR(
+                    f'{name}: compiled output differs from {serializer_class.__name__}.'))
+                continue
+
+            drf = self.measure(
+                lambda: [serializer_class(instance).data for instance in instances], repeat)
+            fast = self.measure(lambda: compiled.serialize(values), repeat)
+
+            self.stdout.write(
+                f'{name}: {serializer_class.__name__} {drf * 1000:.3f} ms/page, '
+                f'compiled {fast * 1000:.3f} ms/page ({drf / fast:.1f}x) for {rows} rows.')
+
+    def measure(self, serialize, repeat):
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            serialize()
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    def resolve(self, instance, column):
+        value = instance
+        for attribute in column.split('__'):
+            value = getattr(value, attribute) if value is not None else None
+        return value
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand, CommandError
+from core.exports import EXPORT_FORMATS, export_lines
+from projects.models import Project
+from projects.views import PROJECT_ROWS
+from tasks.filters import TaskFilterSerializer
+from tasks.models import Task
+from tasks.views import TASK_ROWS
+
+
+class Command(BaseCommand):
+    help = 'Stream projects or tasks as NDJSON or CSV'
+
+    def add_arguments(self, parser):
+        parser.add_argument('model', choices=['projects', 'tasks'])
+        parser.add_argument('--format', choices=list(EXPORT_FORMATS), default='ndjson')
+        parser.add_argument('--output', help='File to write to; defaults to stdout.')
+        parser.add_argument('--filter', action='append', default=[], metavar='NAME=VALUE',
+                            help='Task list filter, e.g. --filter status=done. Repeatable.')
+        parser.add_argument('--chunk-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+
+        if options['model'] == 'projects':
+            if options['filter']:
+                raise CommandError('Projects cannot be filtered.')
+            compiled, queryset = PROJECT_ROWS, Project.objects.all()
+        else:
+            params = dict(item.partition('=')[::2] for item in options['filter'])
+            filters = TaskFilterSerializer(data=params)
+            if not filters.is_valid():
+                raise CommandError(filters.errors)
+            compiled, queryset = TASK_ROWS, filters.filter(Task.objects.all())
+
+        lines = export_lines(compiled, queryset, options['format'], options['chunk_size'])
+        if not options['output']:
+            for line in lines:
+                self.stdout.write(line, ending='')
+            return
+
+        with open(options['output'], 'w', newline='') as output:
+            output.writelines(lines)
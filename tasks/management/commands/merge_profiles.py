@@ -0,0 +1,41 @@
+import pstats
+from io import StringIO
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from core import settings
+from core.profiling import spooled_profiles
+
+
+SORT_KEYS = ('cumulative', 'tottime', 'calls')
+
+
+class Command(BaseCommand):
+    help = 'Merge the spooled request profiles and print the top frames per endpoint'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dir', default=settings.PROFILING_SPOOL_DIR, help='Spool directory to read.')
+        parser.add_argument('--endpoint', action='append',
+                            help='Only this endpoint, e.g. ProjectView.get or signin; repeatable.')
+        parser.add_argument('--sort', choices=SORT_KEYS, default='cumulative')
+        parser.add_argument('--limit', type=int, default=20, help='Frames printed per endpoint.')
+        parser.add_argument('--output', help='Also write each endpoint\'s merged stats to <output>/<endpoint>.prof.')
+
+    def handle(self, *args, **options):
+        profiles = spooled_profiles(options['dir'])
+        if options['endpoint']:
+            profiles = {endpoint: paths for endpoint, paths in profiles.items()
+                        if endpoint in options['endpoint']}
+        if not profiles:
+            raise CommandError(f'No profiles in {options["dir"]}.')
+
+        for endpoint, paths in profiles.items():
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f'{endpoint} ({len(paths)} request{"s" if len(paths) != 1 else ""})'))
+            report = StringIO()
+            stats = pstats.Stats(*map(str, paths), stream=report)
+            if options['output']:
+                Path(options['output']).mkdir(parents=True, exist_ok=True)
+                stats.dump_stats(Path(options['output']) / f'{endpoint}.prof')
+            stats.strip_dirs().sort_stats(options['sort']).print_stats(options['limit'])
+            self.stdout.write(report.getvalue())
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+from core import settings
+from core.profiling import PROFILE_HEADER, make_profile_token
+
+
+class Command(BaseCommand):
+    help = 'Print a signed header that makes the server profile the requests carrying it'
+
+    def handle(self, *args, **options):
+        self.stdout.write(f'{PROFILE_HEADER}: {make_profile_token()}')
+        self.stderr.write(f'Valid for {settings.PROFILING_TOKEN_MAX_AGE} seconds.')
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from core.search import search_index_sql
+from projects.models import Project
+from tasks.models import Task
+
+
+class Command(BaseCommand):
+    help = 'Recreate the SQLite full-text tables and triggers for tasks and projects'
+
+    def handle(self, *args, **options):
+
+        # MySQL maintains its FULLTEXT indexes itself; SQLite drops the
+        # triggers whenever a migration rebuilds the table.
+        if connection.vendor != 'sqlite':
+            self.stdout.write(f'Nothing to rebuild on {connection.vendor}.')
+            return
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            for model in (Task, Project):
+                for statement in search_index_sql(connection.vendor, model._meta.db_table, model.SEARCH_FIELDS):
+                    cursor.execute(statement)
+                self.stdout.write(self.style.SUCCESS(
+                    f'Rebuilt the search index of {model._meta.db_table}.'))
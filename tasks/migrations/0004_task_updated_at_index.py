@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0003_project_updated_at_index'),
+        ('tasks', '0003_task_filter_indexes'),
+        ('users', '0003_user_permission_bits'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['updated_at'], name='tasks_updated_at_idx'),
+        ),
+    ]
@@ -19,6 +19,9 @@ class Task(models.Model):
         (DONE_STATUS, 'Done'),
     ]
 
+    # Columns covered by the full-text index (see core.search).
+    SEARCH_FIELDS = ['title', 'description']
+
     PRIORITY_CHOICES = [
         (LOW_PRIORITY, 'Low'),
         (MEDIUM_PRIORITY, 'Medium'),
@@ -52,3 +55,20 @@ class Task(models.Model):
 
     class Meta:
         db_table = 'tasks'
+        indexes = [
+            models.Index(fields=['created_at', 'id'],
+                         name='tasks_created_at_id_idx'),
+            models.Index(fields=['project', 'status', 'due_date'],
+                         name='tasks_project_status_due_idx'),
+            models.Index(fields=['assign_to_user', 'status', 'due_date'],
+                         name='tasks_assignee_status_due_idx'),
+            models.Index(fields=['status', 'due_date'],
+                         name='tasks_status_due_idx'),
+            models.Index(fields=['priority', 'due_date'],
+                         name='tasks_priority_due_idx'),
+            models.Index(fields=['due_date', 'id'],
+                         name='tasks_due_date_id_idx'),
+            # Makes MAX(updated_at) for the list validators an index lookup.
+            models.Index(fields=['updated_at'],
+                         name='tasks_updated_at_idx'),
+        ]
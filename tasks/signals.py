@@ -0,0 +1,13 @@
+from django.db.models.signals import pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from tasks.models import Task
+from users.models import User
+
+
+@receiver(pre_delete, sender=User)
+def touch_assigned_tasks(sender, instance, **kwargs):
+    # The assignee is cleared by a queryset UPDATE that leaves updated_at,
+    # and with it the task validators, as they were.
+    Task.objects.filter(assign_to_user_id=instance.pk).update(updated_at=timezone.now())
@@ -0,0 +1,187 @@
+import random
+from bisect import bisect
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+from itertools import accumulate
+
+import django
+from django.contrib.auth.hashers import make_password
+from django.db import connections, transaction
+from core.pool import close_pools, pools
+from projects.models import Project
+from tasks.models import Task
+from users.models import Permission, Role, User, UserPermission
+
+
+SYNTHETIC_PASSWORD = 'password'
+
+STATUS_WEIGHTS = {Task.TODO_STATUS: 35, Task.IN_PROGRESS_STATUS: 20, Task.DONE_STATUS: 45}
+PRIORITY_WEIGHTS = {Task.LOW_PRIORITY: 30, Task.MEDIUM_PRIORITY: 50, Task.HIGH_PRIORITY: 20}
+
+MANAGER_SHARE = 0.05
+UNASSIGNED_SHARE = 0.1
+# Zipf exponent of the assignee distribution: the n-th user gets 1 / n**s
+# of the assigned tasks, relatively.
+ASSIGNEE_SKEW = 1.1
+
+WORDS = ['alpha', 'login', 'design', 'api', 'report', 'deploy', 'review', 'sprint', 'mobile', 'billing',
+         'search', 'cache', 'export', 'import', 'docs', 'bug', 'onboarding', 'invoice', 'dashboard',
+         'migration', 'payment', 'release', 'audit', 'latency', 'schema', 'queue', 'email', 'sync']
+
+# The context of the chunks a worker process inserts, set by init_worker.
+worker_context = None
+
+
+def chunk_random(seed, kind, index):
+    """
+    The RNG of one chunk, so the data depends on the seed and the batch
+    size but not on how chunks are spread over workers.
+    """
+    return random.Random(f'{seed}:{kind}:{index}')
+
+
+def words(rng, count):
+    return ' '.join(rng.choice(WORDS) for _ in range(count))
+
+
+def build_users(rng, start, size, context):
+    users = []
+    for index in range(start, start + size):
+        role = Role.MANAGER_ROLE if rng.random() < MANAGER_SHARE else Role.MEMBER_ROLE
+        users.append(User(full_name=f'{words(rng, 1).title()} User {index}', email=f'user{index}@example.com',
+                          password=context['password'], role_id=context['roles'][role][0],
+                          permission_bits=context['roles'][role][2]))
+    return users
+
+
+def build_projects(rng, start, size, context):
+    now, creators = context['now'], context['creators']
+    return [Project(name=f'{words(rng, 2).title()} {index}', description=words(rng, 12),
+                    due_date=now + timedelta(days=rng.uniform(-60, 365)),
+                    creator_id=rng.choice(creators) if creators else None)
+            for index in range(start, start + size)]
+
+
+def build_tasks(rng, start, size, context):
+    now = context['now']
+    projects, project_weights = context['projects'], context['project_weights']
+    assignees, assignee_weights = context['assignees'], context['assignee_weights']
+    statuses = rng.choices(list(STATUS_WEIGHTS), weights=list(STATUS_WEIGHTS.values()), k=size)
+    priorities = rng.choices(list(PRIORITY_WEIGHTS), weights=list(PRIORITY_WEIGHTS.values()), k=size)
+
+    tasks = []
+    for offset, index in enumerate(range(start, start + size)):
+        status = statuses[offset]
+        # Done tasks were mostly due in the last few weeks, open ones
+        # cluster around the next two.
+        if status == Task.DONE_STATUS:
+            due_date = now - timedelta(days=rng.expovariate(1 / 20))
+        else:
+            due_date = now + timedelta(days=rng.gauss(10, 25))
+
+        assignee = None
+        if assignees and rng.random() >= UNASSIGNED_SHARE:
+            assignee = assignees[bisect(assignee_weights, rng.random() * assignee_weights[-1])]
+
+        tasks.append(Task(
+            project_id=projects[bisect(project_weights, rng.random() * project_weights[-1])],
+            assign_to_user_id=assignee, title=f'{words(rng, 3).capitalize()} {index}',
+            description=words(rng, 20), status=status, priority=priorities[offset], due_date=due_date))
+    return tasks
+
+
+BUILDERS = {'users': build_users, 'projects': build_projects, 'tasks': build_tasks}
+
+
+def insert_chunk(chunk, context=None):
+    kind, seed, index, start, size = chunk
+    context = context or worker_context
+    objects = BUILDERS[kind](chunk_random(seed, kind, index), start, size, context)
+    with transaction.atomic():
+        type(objects[0]).objects.bulk_create(objects, batch_size=size)
+        if kind == 'users':
+            # Primary keys aren't returned on MySQL, so look them up.
+            created = User.objects.filter(email__in=[user.email for user in objects]).values_list('id', 'role_id')
+            permissions = {role_id: permission_ids for role_id, permission_ids, _ in context['roles'].values()}
+            UserPermission.objects.bulk_create([
+                UserPermission(user_id=user_id, permission_id=permission_id)
+                for user_id, role_id in created for permission_id in permissions[role_id]], batch_size=size)
+    return size
+
+
+def init_worker(context):
+    global worker_context
+    # Already done in forked workers; needed in spawned ones.
+    django.setup()
+    # The parent emptied its pools before forking; start from a clean
+    # registry rather than rely on it.
+    pools.clear()
+    worker_context = context
+
+
+class SyntheticData:
+    """
+    Inserts synthetic users, projects and tasks with skewed, realistic
+    distributions, in ``batch_size`` chunks of ``bulk_create`` each
+    generated from its own RNG seeded by ``seed``, optionally spread over
+    ``workers`` processes. ``now`` anchors the dates, so two runs with the
+    same arguments and ``now`` produce the same rows.
+    """
+
+    def __init__(self, now, seed=0, batch_size=5000, workers=1, progress=None):
+        self.now = now
+        self.seed = seed
+        self.batch_size = batch_size
+        self.workers = workers
+        self.progress = progress
+
+    def users(self, count):
+        roles = {}
+        for name in (Role.MANAGER_ROLE, Role.MEMBER_ROLE):
+            role = Role.objects.get(name=name)
+            permissions = dict(role.permissions.values_list('id', 'name'))
+            roles[name] = (role.id, list(permissions), Permission.to_mask(permissions.values()))
+
+        self.insert('users', count, {"roles": roles, "password": make_password(SYNTHETIC_PASSWORD)})
+
+    def projects(self, count):
+        creators = list(User.objects.filter(role__name__in=[Role.ADMIN_ROLE, Role.MANAGER_ROLE])
+                        .order_by('id').values_list('id', flat=True))
+        self.insert('projects', count, {"now": self.now, "creators": creators})
+
+    def tasks(self, count):
+        rng = chunk_random(self.seed, 'weights', 0)
+        projects = list(Project.objects.order_by('id').values_list('id', flat=True))
+        # Project sizes are log-normal: most are small, a few are huge.
+        project_weights = list(accumulate(rng.lognormvariate(0, 1) for _ in projects))
+        assignees = list(User.objects.filter(role__name__in=[Role.MANAGER_ROLE, Role.MEMBER_ROLE])
+                         .order_by('id').values_list('id', flat=True))
+        rng.shuffle(assignees)
+        assignee_weights = list(accumulate(1 / rank ** ASSIGNEE_SKEW for rank in range(1, len(assignees) + 1)))
+        self.insert('tasks', count, {"now": self.now, "projects": projects, "project_weights": project_weights,
+                                     "assignees": assignees, "assignee_weights": assignee_weights})
+
+    def insert(self, kind, count, context):
+        chunks = [(kind, self.seed, index, start, min(self.batch_size, count - start))
+                  for index, start in enumerate(range(0, count, self.batch_size))]
+        inserted = 0
+
+        if self.workers <= 1 or len(chunks) <= 1:
+            for chunk in chunks:
+                inserted += insert_chunk(chunk, context)
+                self.report(kind, inserted, count)
+            return
+
+        # Workers open their own connections; forked ones must not share
+        # the parent's, which close_all() would only hand back to the
+        # pool, so the pools are closed too.
+        connections.close_all()
+        close_pools()
+        with ProcessPoolExecutor(self.workers, initializer=init_worker, initargs=(context,)) as executor:
+            for size in executor.map(insert_chunk, chunks):
+                inserted += size
+                self.report(kind, inserted, count)
+
+    def report(self, kind, inserted, count):
+        if self.progress:
+            self.progress(kind, inserted, count)
@@ -1,10 +1,20 @@
+from django.db import connection
+import csv
+import json
+import os
+import tempfile
+from io import StringIO
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from datetime import datetime, timedelta
+from unittest import mock
 
 import jwt
 from core import settings
 from projects.models import Project
 from tasks.models import Task
+from tasks.views import TASK_ROWS, TaskSerializer
+from overview.counters import TASKS_KEY, aget_count, get_count, task_counter_key
 from users.models import Role, User
 from django.core.management import call_command
 
@@ -15,6 +25,9 @@ class TaskTests(TestCase):
     def setUpTestData(cls):
         call_command('seed', verbosity=0)
 
+    def future_date(self, days=30):
+        return (datetime.now() + timedelta(days=days)).strftime("%Y-%m-%d %H:%M:%S")
+
     project = None
 
     def setUp(self):
@@ -48,7 +61,7 @@ class TaskTests(TestCase):
             "description": "This is a sample task",
             "status": Task.IN_PROGRESS_STATUS,
             "priority": Task.HIGH_PRIORITY,
-            "due_date": "2025-12-15 12:00:00",
+            "due_date": self.future_date(),
             "project_id": self.project.id,
             "assigned_to_user_id": User.objects.first().id
         }
@@ -75,7 +88,7 @@ class TaskTests(TestCase):
             "description": "Updated Description",
             "status": Task.DONE_STATUS,
             "priority": Task.LOW_PRIORITY,
-            "due_date": "2025-12-20 15:00:00",
+            "due_date": self.future_date(),
             "project_id": self.project.id,
             "assigned_to_user_id": User.objects.first().id
         }
@@ -100,3 +113,620 @@ class TaskTests(TestCase):
 
         self.assertEqual(response.status_code, 200)
         self.assertFalse(Task.objects.filter(id=task.id).exists())
+
+    def test_task_cursor_pagination(self):
+        for index in range(4):
+            Task.objects.create(
+                project=self.project,
+                title=f"Paged Task {index}",
+                due_date="2025-12-10 10:00:00"
+            )
+
+        response_json = self.client.get(
+            '/api/task/', {"pagination": "cursor", "per_page": 3}).json()
+
+        self.assertEqual([t['title'] for t in response_json['data']['data']],
+                         ["Paged Task 3", "Paged Task 2", "Paged Task 1"])
+
+        response_json = self.client.get(
+            '/api/task/', {"cursor": response_json['data']['next_cursor'], "per_page": 3}).json()
+
+        self.assertEqual([t['title'] for t in response_json['data']['data']],
+                         ["Paged Task 0"])
+        self.assertIsNone(response_json['data']['next_cursor'])
+
+    def test_task_list_query_count(self):
+        assignee = User.objects.first()
+        for index in range(10):
+            Task.objects.create(
+                project=self.project,
+                assign_to_user=assignee,
+                title=f"Listed Task {index}",
+                due_date="2025-12-10 10:00:00"
+            )
+
+        self.client.get('/api/task/')
+
+        # One query for the page and one for the validators and total,
+        # however many rows the page holds; authentication is served from
+        # cache.
+        with self.assertNumQueries(2):
+            response_json = self.client.get(
+                '/api/task/', {"per_page": 10}).json()
+
+        self.assertEqual(len(response_json['data']['data']), 10)
+        self.assertEqual(response_json['data']['total'], 10)
+        self.assertEqual(response_json['data']['data'][0]['assigned_to_user']['id'], assignee.id)
+        self.assertEqual(response_json['data']['data'][0]['project']['name'], self.project.name)
+
+        with self.assertNumQueries(2):
+            self.client.get('/api/task/', {"pagination": "cursor", "per_page": 10})
+
+    def test_update_task_assignee(self):
+        task = Task.objects.create(
+            project=self.project,
+            title="Unassigned Task",
+            due_date="2025-12-10 10:00:00"
+        )
+        assignee = User.objects.first()
+
+        data = {
+            "title": task.title,
+            "status": Task.TODO_STATUS,
+            "priority": Task.MEDIUM_PRIORITY,
+            "due_date": self.future_date(),
+            "project_id": self.project.id,
+            "assigned_to_user_id": assignee.id
+        }
+        self.client.put(f'/api/task/{task.id}/', data,
+                        content_type='application/json')
+
+        task.refresh_from_db()
+        self.assertEqual(task.assign_to_user_id, assignee.id)
+
+    def test_compiled_serializer_matches_drf(self):
+        Task.objects.create(
+            project=self.project,
+            assign_to_user=User.objects.first(),
+            title="Assigned Task",
+            due_date="2025-12-10 10:00:00"
+        )
+        Task.objects.create(
+            project=self.project,
+            title="Unassigned Task",
+            description=None,
+            due_date="2025-12-10 10:00:00"
+        )
+
+        tasks = Task.objects.order_by('id')
+        expected = [dict(TaskSerializer(task).data) for task in tasks]
+
+        self.assertEqual(TASK_ROWS.serialize(
+            tasks.values_list(*TASK_ROWS.columns)), expected)
+
+    def test_task_list_filters(self):
+        assignee = User.objects.first()
+        other_project = Project.objects.create(
+            name="Other Project",
+            due_date="2025-11-20 16:53:14",
+            creator=assignee
+        )
+        Task.objects.create(project=self.project, title="Todo Early", status=Task.TODO_STATUS,
+                            assign_to_user=assignee, due_date="2025-12-01 10:00:00")
+        Task.objects.create(project=self.project, title="Todo Late", status=Task.TODO_STATUS,
+                            due_date="2025-12-20 10:00:00")
+        Task.objects.create(project=self.project, title="Done", status=Task.DONE_STATUS,
+                            priority=Task.HIGH_PRIORITY, due_date="2025-12-05 10:00:00")
+        Task.objects.create(project=other_project, title="Other", status=Task.TODO_STATUS,
+                            due_date="2025-12-02 10:00:00")
+
+        def titles(params):
+            return [t['title'] for t in self.client.get('/api/task/', params).json()['data']['data']]
+
+        self.assertEqual(titles({"project_id": self.project.id, "status": Task.TODO_STATUS, "sort": "-due_date"}),
+                         ["Todo Late", "Todo Early"])
+        self.assertEqual(titles({"assignee": assignee.id}), ["Todo Early"])
+        self.assertEqual(titles({"priority": Task.HIGH_PRIORITY}), ["Done"])
+        self.assertEqual(titles({"due_after": "2025-12-02 00:00:00", "due_before": "2025-12-10 00:00:00",
+                                 "sort": "due_date", "pagination": "cursor"}), ["Other", "Done"])
+
+        response_json = self.client.get(
+            '/api/task/', {"project_id": self.project.id, "status": Task.TODO_STATUS}).json()
+        self.assertEqual(response_json['data']['total'], 2)
+
+        response_json = self.client.get('/api/task/', {"sort": "title"}).json()
+        self.assertIn('sort', response_json['messages'])
+
+    def test_bulk_tasks(self):
+        assignee = User.objects.first()
+        items = [{
+            "title": f"Bulk Task {index}",
+            "status": Task.TODO_STATUS,
+            "priority": Task.LOW_PRIORITY,
+            "due_date": self.future_date(),
+            "project_id": self.project.id,
+            "assigned_to_user_id": assignee.id
+        } for index in range(20)]
+
+        response_json = self.client.post(
+            '/api/task/bulk/', {"tasks": items[:1]}, content_type='application/json').json()
+        self.assertEqual(response_json['data']['created'], 1)
+
+        # One IN query each for users and projects, one insert and the
+        # counter updates, however many items are sent.
+        with CaptureQueriesContext(connection) as queries:
+            response_json = self.client.post(
+                '/api/task/bulk/', {"tasks": items[1:]}, content_type='application/json').json()
+
+        self.assertLess(len(queries), 15)
+        self.assertEqual(response_json['data']['created'], 19)
+        self.assertEqual(get_count(TASKS_KEY), 20)
+
+        tasks = list(Task.objects.order_by('id'))
+        updates = [dict(item, id=task.id, status=Task.DONE_STATUS)
+                   for item, task in zip(items[:5], tasks)]
+        response_json = self.client.put(
+            '/api/task/bulk/', {"tasks": updates}, content_type='application/json').json()
+
+        self.assertEqual(response_json['data']['updated'], 5)
+        self.assertEqual(Task.objects.filter(status=Task.DONE_STATUS).count(), 5)
+        self.assertEqual(get_count(task_counter_key(status=Task.DONE_STATUS)), 5)
+
+        response_json = self.client.delete(
+            '/api/task/bulk/', {"ids": [task.id for task in tasks[:10]]}, content_type='application/json').json()
+
+        self.assertEqual(response_json['data']['deleted'], 10)
+        self.assertEqual(get_count(TASKS_KEY), 10)
+
+    def test_bulk_tasks_report_item_errors(self):
+        items = [{
+            "title": "Valid Task",
+            "status": Task.TODO_STATUS,
+            "priority": Task.LOW_PRIORITY,
+            "due_date": self.future_date(),
+            "project_id": self.project.id,
+            "assigned_to_user_id": User.objects.first().id
+        }, {
+            "title": "Invalid Task",
+            "status": Task.TODO_STATUS,
+            "priority": Task.LOW_PRIORITY,
+            "due_date": self.future_date(),
+            "project_id": 0,
+            "assigned_to_user_id": 0
+        }, {
+            # Accepted as on the single-create path.
+            "title": "String Ids Task",
+            "status": Task.TODO_STATUS,
+            "priority": Task.LOW_PRIORITY,
+            "due_date": self.future_date(),
+            "project_id": str(self.project.id),
+            "assigned_to_user_id": str(User.objects.first().id)
+        }, {
+            "title": "Boolean Ids Task",
+            "status": Task.TODO_STATUS,
+            "priority": Task.LOW_PRIORITY,
+            "due_date": self.future_date(),
+            "project_id": True,
+            "assigned_to_user_id": True
+        }]
+
+        response_json = self.client.post(
+            '/api/task/bulk/', {"tasks": items}, content_type='application/json').json()
+
+        self.assertEqual(set(response_json['messages']), {"1", "3"})
+        self.assertIn('project_id', response_json['messages']['1'])
+        self.assertIn('assigned_to_user_id', response_json['messages']['1'])
+        self.assertIn('project_id', response_json['messages']['3'])
+        self.assertFalse(Task.objects.exists())
+
+        # Booleans aren't task ids either, even though true == 1.
+        task = Task.objects.create(project=self.project, title="Kept Task", due_date="2025-12-10 10:00:00")
+        response_json = self.client.put(
+            '/api/task/bulk/', {"tasks": [dict(items[0], id=True)]}, content_type='application/json').json()
+        self.assertIn('id', response_json['messages']['0'])
+        response_json = self.client.delete(
+            '/api/task/bulk/', {"ids": [True]}, content_type='application/json').json()
+        self.assertEqual(response_json['messages'], {"ids": ["Invalid item."]})
+        self.assertTrue(Task.objects.filter(id=task.id).exists())
+
+    def test_task_mutation_response_modes(self):
+        data = {
+            "title": "Resource Task",
+            "status": Task.TODO_STATUS,
+            "priority": Task.LOW_PRIORITY,
+            "due_date": self.future_date(),
+            "project_id": self.project.id,
+            "assigned_to_user_id": User.objects.first().id
+        }
+
+        response = self.client.post(
+            '/api/task/', data, content_type='application/json', headers={'Prefer': 'return=representation'})
+
+        self.assertEqual(response['Preference-Applied'], 'return=representation')
+        self.assertEqual(response.json()['data']['title'], "Resource Task")
+        self.assertEqual(response.json()['data']['project']['id'], self.project.id)
+
+        task_id = response.json()['data']['id']
+        with mock.patch.object(settings, 'MUTATION_RESPONSE_MODE', 'minimal'):
+            response = self.client.put(
+                f'/api/task/{task_id}/', dict(data, title="Renamed"), content_type='application/json')
+
+        self.assertEqual(response.json()['data'], {"id": task_id})
+
+        response = self.client.delete(
+            f'/api/task/{task_id}/', headers={'Prefer': 'return=minimal'})
+
+        self.assertEqual(response.json()['data'], [])
+        self.assertFalse(Task.objects.filter(id=task_id).exists())
+
+    def test_patch_task(self):
+        task = Task.objects.create(
+            project=self.project,
+            title="Patched Task",
+            description="Kept description",
+            due_date="2025-12-10 10:00:00"
+        )
+
+        self.client.get('/api/task/')
+
+        # The row lookup and a single UPDATE of the submitted columns.
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(
+                f'/api/task/{task.id}/', {"title": "Renamed Task"}, content_type='application/json',
+                headers={'Prefer': 'return=minimal'})
+
+        updates = [q['sql'] for q in queries if q['sql'].startswith('UPDATE')]
+        self.assertEqual(len(updates), 1)
+        self.assertNotIn('"description"', updates[0])
+        self.assertEqual(response.json()['data'], {"id": task.id})
+
+        task.refresh_from_db()
+        self.assertEqual(task.title, "Renamed Task")
+        self.assertEqual(task.description, "Kept description")
+
+        response_json = self.client.patch(
+            f'/api/task/{task.id}/', {"status": "archived"}, content_type='application/json').json()
+        self.assertIn('status', response_json['messages'])
+
+    def test_task_status_transition(self):
+        task = Task.objects.create(
+            project=self.project,
+            title="Kanban Task",
+            due_date="2025-12-10 10:00:00"
+        )
+
+        role = Role.objects.get(name=Role.MEMBER_ROLE)
+        member = User.objects.create(
+            full_name="task member",
+            email="taskmember@example.com",
+            password="taskmemberpass",
+            role=role
+        )
+        member.permissions.set(role.permissions.all())
+        access_token = jwt.encode(
+            {"user_id": member.id, "exp": datetime.now() + timedelta(minutes=15)}, settings.SECRET_KEY, algorithm="HS256"
+        )
+        headers = {'Authorization': f'Bearer {access_token}'}
+
+        response_json = self.client.patch(
+            f'/api/task/{task.id}/', {"status": Task.DONE_STATUS}, content_type='application/json', headers=headers).json()
+        self.assertEqual(response_json['messages'],
+                         "You do not have permission to perform this action.")
+
+        # Answered with the id whatever MUTATION_RESPONSE_MODE is.
+        with mock.patch.object(settings, 'MUTATION_RESPONSE_MODE', 'list'):
+            response_json = self.client.patch(
+                f'/api/task/{task.id}/status/', {"status": Task.IN_PROGRESS_STATUS}, content_type='application/json',
+                headers=headers).json()
+        self.assertEqual(response_json['data'], {"id": task.id})
+
+        response_json = self.client.patch(
+            f'/api/task/{task.id}/status/', {"status": Task.DONE_STATUS}, content_type='application/json',
+            headers=dict(headers, Prefer='return=representation')).json()
+
+        self.assertEqual(response_json['data']['status'], Task.DONE_STATUS)
+        self.assertEqual(get_count(task_counter_key(
+            project_id=self.project.id, status=Task.DONE_STATUS)), 1)
+        self.assertEqual(get_count(task_counter_key(
+            project_id=self.project.id, status=Task.TODO_STATUS)), 0)
+
+    def test_task_export(self):
+        for index in range(5):
+            Task.objects.create(
+                project=self.project,
+                title=f"Exported Task {index}",
+                status=Task.DONE_STATUS if index % 2 else Task.TODO_STATUS,
+                due_date="2025-12-10 10:00:00"
+            )
+
+        with mock.patch('core.exports.EXPORT_CHUNK_SIZE', 2):
+            response = self.client.get(
+                '/api/task/export/', {"status": Task.TODO_STATUS})
+            lines = b''.join(response.streaming_content).decode().splitlines()
+
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        self.assertEqual([json.loads(line)['title'] for line in lines],
+                         ["Exported Task 0", "Exported Task 2", "Exported Task 4"])
+
+        response = self.client.get('/api/task/export/', {"format": "csv"})
+        rows = list(csv.reader(b''.join(response.streaming_content).decode().splitlines()))
+
+        self.assertEqual(rows[0], TASK_ROWS.headers)
+        self.assertEqual(len(rows), 6)
+
+        output = StringIO()
+        call_command('export', 'tasks', '--filter', f'status={Task.DONE_STATUS}', '--chunk-size', '1', stdout=output)
+        self.assertEqual(len(output.getvalue().splitlines()), 2)
+
+    def test_task_import(self):
+        user = User.objects.get(email="projectmanager@example.com")
+        rows = [
+            {"title": "Imported 1", "due_date": "2025-12-10T10:00:00Z", "project_id": self.project.id},
+            {"title": "Imported 2", "due_date": "2025-12-10T10:00:00Z", "project": self.project.name,
+             "status": Task.DONE_STATUS, "assignee_email": user.email},
+            {"title": "Broken", "due_date": "2025-12-10T10:00:00Z", "project_id": 0},
+        ]
+        body = ''.join(json.dumps(row) + '\n' for row in rows) + 'not json\n'
+
+        response = self.client.post('/api/task/import/', body, content_type='application/x-ndjson')
+        summary = response.json()['data']
+
+        self.assertEqual(summary['imported'], 2)
+        self.assertEqual(summary['failed'], 2)
+        self.assertEqual([error['line'] for error in summary['errors']], [3, 4])
+        self.assertEqual(Task.objects.get(title="Imported 2").assign_to_user_id, user.id)
+        self.assertEqual(get_count(TASKS_KEY), 2)
+        self.assertEqual(get_count(task_counter_key(
+            project_id=self.project.id, status=Task.DONE_STATUS)), 1)
+
+        body = "title,due_date,project_id,priority\n" + ''.join(
+            f"CSV {index},2025-12-10 10:00:00,{self.project.id},{Task.HIGH_PRIORITY}\n" for index in range(5))
+        response = self.client.post('/api/task/import/?format=csv', body, content_type='text/csv')
+
+        self.assertEqual(response.json()['data']['imported'], 5)
+        self.assertEqual(Task.objects.filter(priority=Task.HIGH_PRIORITY).count(), 5)
+        self.assertEqual(get_count(TASKS_KEY), 7)
+
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as upload:
+            upload.write(body)
+        output = StringIO()
+        call_command('import_tasks', upload.name, '--batch-size', '2', stdout=output)
+        os.remove(upload.name)
+
+        self.assertIn('Imported 5 tasks', output.getvalue())
+        self.assertEqual(get_count(TASKS_KEY), 12)
+
+    def test_task_import_skips_mistyped_rows(self):
+        valid = {"title": "Typed", "due_date": "2025-12-10T10:00:00Z", "project_id": self.project.id}
+        rows = [
+            {**valid, "title": 5},
+            {**valid, "assignee_email": 5},
+            {**valid, "status": [Task.DONE_STATUS]},
+            {"title": "Typed", "due_date": "2025-12-10T10:00:00Z", "project": [self.project.name]},
+            {**valid, "project_id": True},
+            {**valid, "title": "x" * 256},
+            valid,
+        ]
+        body = ''.join(json.dumps(row) + '\n' for row in rows)
+
+        response = self.client.post('/api/task/import/', body, content_type='application/x-ndjson')
+        summary = response.json()['data']
+
+        self.assertEqual(summary['imported'], 1)
+        self.assertEqual([error['line'] for error in summary['errors']], [1, 2, 3, 4, 5, 6])
+        self.assertEqual(summary['errors'][5]['message'], "title must be at most 255 characters.")
+
+    async def test_task_export_streams_asynchronously_under_asgi(self):
+        for index in range(5):
+            await Task.objects.acreate(
+                project=self.project, title=f"Exported Task {index}", due_date="2025-12-10 10:00:00")
+
+        with mock.patch('core.exports.EXPORT_CHUNK_SIZE', 2):
+            response = await self.async_client.get(
+                '/api/task/export/', headers={"Authorization": self.client.defaults['HTTP_AUTHORIZATION']})
+            self.assertTrue(response.is_async)
+            chunks = [chunk async for chunk in response.streaming_content]
+
+        self.assertEqual(len(chunks), 3)
+        self.assertEqual(len(b''.join(chunks).decode().splitlines()), 5)
+
+    async def test_task_view_runs_on_the_event_loop(self):
+        headers = {"Authorization": self.client.defaults['HTTP_AUTHORIZATION']}
+        user = await User.objects.afirst()
+        data = {
+            "title": "Async Task",
+            "status": Task.TODO_STATUS,
+            "priority": Task.LOW_PRIORITY,
+            "due_date": self.future_date(),
+            "project_id": self.project.id,
+            "assigned_to_user_id": user.id
+        }
+
+        response = await self.async_client.post(
+            '/api/task/', data, content_type='application/json', headers=headers)
+        self.assertEqual(response.json()['data']['data'][0]['title'], "Async Task")
+
+        data["assigned_to_user_id"] = 0
+        response = await self.async_client.post(
+            '/api/task/', data, content_type='application/json', headers=headers)
+        self.assertEqual(response.json()['messages'],
+                         {"assigned_to_user_id": ["Assigned user does not exist."]})
+
+        response = await self.async_client.get(
+            '/api/task/', {"pagination": "cursor"}, headers=headers)
+        self.assertEqual(len(response.json()['data']['data']), 1)
+        self.assertEqual(await aget_count(TASKS_KEY), 1)
+
+    def test_task_conditional_get(self):
+        task = Task.objects.create(
+            project=self.project,
+            title="Polled Task",
+            due_date="2025-12-10 10:00:00"
+        )
+
+        response = self.client.get('/api/task/')
+        etag = response['ETag']
+
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/task/', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+        self.assertNotEqual(self.client.get('/api/task/', {"page": 2})['ETag'], etag)
+
+        self.project.name = "Renamed Project"
+        self.project.save()
+        response = self.client.get('/api/task/', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['data']['data'][0]['project']['name'], "Renamed Project")
+
+        etag = response['ETag']
+        task.delete()
+        self.assertEqual(self.client.get('/api/task/', headers={'If-None-Match': etag}).status_code, 200)
+
+    def test_task_list_etag_follows_every_project(self):
+        other_project = Project.objects.create(
+            name="Other Project", due_date="2025-11-20 16:53:14", creator=User.objects.first())
+        for project in (self.project, other_project):
+            Task.objects.create(project=project, title="Listed Task", due_date="2025-12-10 10:00:00")
+
+        etag = self.client.get('/api/task/')['ETag']
+        other_project.name = "Renamed Other Project"
+        other_project.save()
+
+        response = self.client.get('/api/task/', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+
+        # Filtered by a column without a counter, so the rows are counted.
+        query = {"due_before": "2030-01-01 00:00:00"}
+        etag = self.client.get('/api/task/', query)['ETag']
+        Task.objects.filter(project=self.project).delete()
+        response = self.client.get('/api/task/', query, headers={'If-None-Match': etag})
+        self.assertEqual(response.json()['data']['total'], 1)
+
+    def test_task_etags_follow_the_assignee(self):
+        assignee = User.objects.create(full_name="Assignee", email="assignee@example.com", password="unused")
+        task = Task.objects.create(project=self.project, assign_to_user=assignee, title="Assigned Task",
+                                   due_date="2025-12-10 10:00:00")
+        list_etag = self.client.get('/api/task/')['ETag']
+        detail_etag = self.client.get(f'/api/task/{task.id}/')['ETag']
+
+        assignee.full_name = "Renamed Assignee"
+        assignee.save()
+
+        response = self.client.get('/api/task/', headers={'If-None-Match': list_etag})
+        self.assertEqual(response.json()['data']['data'][0]['assigned_to_user']['full_name'], "Renamed Assignee")
+        response = self.client.get(f'/api/task/{task.id}/', headers={'If-None-Match': detail_etag})
+        self.assertEqual(response.json()['data']['assigned_to_user']['full_name'], "Renamed Assignee")
+
+        # Another user stays the latest change to users.
+        User.objects.create(full_name="Newer User", email="neweruser@example.com", password="unused")
+        list_etag = self.client.get('/api/task/')['ETag']
+        detail_etag = response['ETag']
+        assignee.delete()
+
+        response = self.client.get('/api/task/', headers={'If-None-Match': list_etag})
+        self.assertIsNone(response.json()['data']['data'][0]['assigned_to_user'])
+        response = self.client.get(f'/api/task/{task.id}/', headers={'If-None-Match': detail_etag})
+        self.assertIsNone(response.json()['data']['assigned_to_user'])
+
+    def test_task_detail_conditional_get(self):
+        task = Task.objects.create(
+            project=self.project,
+            title="Detail Task",
+            due_date="2025-12-10 10:00:00"
+        )
+
+        response = self.client.get(f'/api/task/{task.id}/')
+        self.assertEqual(response.json()['data']['title'], "Detail Task")
+
+        response = self.client.get(f'/api/task/{task.id}/', headers={
+            'If-Modified-Since': response['Last-Modified']})
+        self.assertEqual(response.status_code, 304)
+
+        etag = self.client.get(f'/api/task/{task.id}/')['ETag']
+        self.client.patch(f'/api/task/{task.id}/', {"title": "Edited"}, content_type='application/json')
+        response = self.client.get(f'/api/task/{task.id}/', headers={'If-None-Match': etag})
+        self.assertEqual(response.json()['data']['title'], "Edited")
+
+        self.assertEqual(self.client.get('/api/task/0/').json()['code'], 404)
+
+    def test_task_search(self):
+        for title, description in [("Fix login bug", "Users cannot sign in"),
+                                   ("Write docs", "Explain the login flow and the login page"),
+                                   ("Plan sprint", None)]:
+            Task.objects.create(project=self.project, title=title,
+                                description=description, due_date="2025-12-10 10:00:00")
+
+        response_json = self.client.get('/api/task/search/', {"q": "login"}).json()
+        titles = [task['title'] for task in response_json['data']['data']]
+        self.assertEqual(titles, ["Write docs", "Fix login bug"])
+        self.assertEqual(response_json['data']['data'][0]['project']['name'], self.project.name)
+
+        task = Task.objects.get(title="Plan sprint")
+        task.description = "Review login metrics"
+        task.save()
+        Task.objects.filter(title="Fix login bug").delete()
+        Task.objects.bulk_create([Task(project=self.project, title="Login audit", due_date="2025-12-10 10:00:00")])
+
+        response_json = self.client.get('/api/task/search/', {"q": "login", "per_page": 2}).json()
+        self.assertEqual(len(response_json['data']['data']), 2)
+        self.assertTrue(response_json['data']['has_next'])
+        response_json = self.client.get('/api/task/search/', {"q": "login", "per_page": 2, "page": 2}).json()
+        self.assertEqual(len(response_json['data']['data']), 1)
+        self.assertFalse(response_json['data']['has_next'])
+
+        self.assertEqual(self.client.get('/api/task/search/', {"q": "\"*"}).json()['code'], 401)
+
+        call_command('rebuild_search_index', stdout=StringIO())
+        Task.objects.create(project=self.project, title="Login retry", due_date="2025-12-10 10:00:00")
+        response_json = self.client.get('/api/task/search/', {"q": "retry"}).json()
+        self.assertEqual([task['title'] for task in response_json['data']['data']], ["Login retry"])
+
+    def test_server_timing(self):
+        self.client.get('/api/task/')
+        self.assertNotIn('Server-Timing', self.client.get('/api/task/'))
+
+        with mock.patch.object(settings, 'SERVER_TIMING_SAMPLE_RATE', 1.0), \
+                self.assertLogs('core.timing') as logs, CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/task/')
+
+        metrics = [entry.split(';')[0] for entry in response['Server-Timing'].split(', ')]
+        self.assertEqual(metrics, ['auth', 'db', 'serialize', 'render', 'total'])
+        self.assertIn(f'desc="{len(queries)} queries"', response['Server-Timing'])
+
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record['path'], '/api/task/')
+        self.assertEqual(record['queries'], len(queries))
+
+    def test_request_profiling(self):
+        with tempfile.TemporaryDirectory() as spool, mock.patch.object(settings, 'PROFILING_SPOOL_DIR', spool):
+            self.assertNotIn('X-Profile-Id', self.client.get('/api/task/', headers={'X-Profile-Token': 'forged'}))
+
+            token = StringIO()
+            call_command('profile_token', stdout=token, stderr=StringIO())
+            header, value = token.getvalue().strip().split(': ')
+            response = self.client.get('/api/task/', headers={header: value})
+            self.assertTrue(response['X-Profile-Id'].startswith('TaskView.get.'))
+            self.assertEqual(os.listdir(spool), [response['X-Profile-Id']])
+
+            out = StringIO()
+            call_command('merge_profiles', stdout=out)
+            self.assertIn('TaskView.get (1 request)', out.getvalue())
+            self.assertIn('function calls', out.getvalue())
+
+    def test_profile_spool_is_bounded_and_optional(self):
+        with tempfile.TemporaryDirectory() as spool, mock.patch.object(settings, 'PROFILING_SAMPLE_RATE', 1.0):
+            with mock.patch.object(settings, 'PROFILING_SPOOL_DIR', spool), \
+                    mock.patch.object(settings, 'PROFILING_SPOOL_MAX_FILES', 2):
+                for _ in range(3):
+                    self.client.get('/api/task/')
+            self.assertEqual(len(os.listdir(spool)), 2)
+
+            # The spool directory can't be created under a file.
+            blocker = os.path.join(spool, 'blocker')
+            open(blocker, 'w').close()
+            with mock.patch.object(settings, 'PROFILING_SPOOL_DIR', os.path.join(blocker, 'profiles')), \
+                    self.assertLogs('core.profiling', 'ERROR'):
+                response = self.client.get('/api/task/')
+            self.assertEqual(response.json()['code'], 200)
@@ -3,5 +3,10 @@ from . import views
 
 urlpatterns = [
     path('task/', views.TaskView.as_view()),
+    path('task/export/', views.TaskExportView.as_view()),
+    path('task/search/', views.TaskSearchView.as_view()),
+    path('task/import/', views.TaskImportView.as_view()),
+    path('task/bulk/', views.TaskBulkView.as_view()),
     path('task/<int:task_id>/', views.TaskView.as_view()),
+    path('task/<int:task_id>/status/', views.TaskStatusView.as_view()),
 ]
@@ -1,9 +1,23 @@
+import codecs
 import json
-from django.http import JsonResponse
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from django.db.models import Count, Window
 from django.shortcuts import render
 from django.views import View
 from django.core.paginator import Paginator
+from core.conditional import latest_update, list_state, make_etag, not_modified, set_validators
+from core.responses import MINIMAL_RESPONSE, JsonResponse, MutationResponseMixin
+from core.routers import read_replica
+from core.search import search_response
+from core.serializers import CompiledSerializer
+from core.exports import EXPORT_FORMATS, export_response
+from core.pagination import InvalidCursor, KeysetPaginator, get_per_page, wants_cursor_pagination
+from overview.counters import apply_task_changes, batched_counters, count_subquery
+from overview.dashboard import invalidate_overview
 from projects.models import Project
+from tasks.filters import TaskFilterSerializer
+from tasks.importer import IMPORT_FORMATS, TaskImporter
 from tasks.models import Task
 from users.decorators import class_require_authentication
 from rest_framework import serializers
@@ -30,14 +44,22 @@ class CreateTaskSerializer(serializers.Serializer):
                 "Due date must be in the future.")
         return value
 
+    # Bulk requests pass the ids they already looked up in one query as
+    # "user_ids" and "project_ids" in the context.
+
     def validate_assigned_to_user_id(self, value):
-        if not User.objects.filter(id=value).exists():
+        user_ids = self.context.get('user_ids')
+        exists = value in user_ids if user_ids is not None else User.objects.filter(
+            id=value).exists()
+        if not exists:
             raise serializers.ValidationError("Assigned user does not exist.")
         return value
 
     def validate_project_id(self, value):
-        from projects.models import Project
-        if not Project.objects.filter(id=value).exists():
+        project_ids = self.context.get('project_ids')
+        exists = value in project_ids if project_ids is not None else Project.objects.filter(
+            id=value).exists()
+        if not exists:
             raise serializers.ValidationError("Project does not exist.")
         return value
 
@@ -55,7 +77,7 @@ class ProjectSerializer(serializers.ModelSerializer):
 
 
 class TaskSerializer(serializers.ModelSerializer):
-    assigned_to_user = UserSerializer(read_only=True)
+    assigned_to_user = UserSerializer(source='assign_to_user', read_only=True)
     project = ProjectSerializer(read_only=True)
 
     class Meta:
@@ -64,76 +86,422 @@ class TaskSerializer(serializers.ModelSerializer):
                   'description', 'status', 'priority', 'due_date']
 
 
-class TaskView(View):
+TASK_ROWS = CompiledSerializer(TaskSerializer)
+
+
+class TaskView(MutationResponseMixin, View):
+
+    # CreateTaskSerializer fields whose model attribute is named differently.
+    field_names = {'assigned_to_user_id': 'assign_to_user_id'}
 
     @class_require_authentication(Permission.CREATE_TASK)
-    def post(self, request):
+    async def post(self, request):
         data = json.loads(request.body)
-        serializer = CreateTaskSerializer(data=data)
+        serializer = CreateTaskSerializer(data=data, context=await self.reference_ids(data))
         if not serializer.is_valid():
             return JsonResponse({"code": 401, "data": [], "messages": serializer.errors}, status=200)
 
-        task = Task.objects.create(
-            title=serializer.validated_data.get('title'),
-            description=serializer.validated_data.get('description', ''),
-            due_date=serializer.validated_data.get('due_date'),
-            assign_to_user_id=serializer.validated_data.get(
-                'assigned_to_user_id'),
-            project_id=serializer.validated_data.get('project_id'),
-            status=serializer.validated_data.get('status'),
-            priority=serializer.validated_data.get('priority')
-        )
+        task = await sync_to_async(self.create_task)(serializer.validated_data)
 
         if not isinstance(task, Task):
             return JsonResponse({"code": 500, "data": [], "messages": "Task creating failure."}, status=200)
 
-        return self.get(request, "Task created successfully.")
+        return await self.mutation_response(request, "Task created successfully.", task)
 
     @class_require_authentication(Permission.UPDATE_TASK)
-    def put(self, request, task_id):
+    async def put(self, request, task_id):
 
-        task = Task.objects.filter(id=task_id).first()
+        task = await Task.objects.filter(id=task_id).afirst()
         if not isinstance(task, Task):
             return JsonResponse({"code": 404, "data": [], "messages": "Task not found."}, status=200)
 
         data = json.loads(request.body)
-        serializer = CreateTaskSerializer(data=data)
+        serializer = CreateTaskSerializer(data=data, context=await self.reference_ids(data))
         if not serializer.is_valid():
             return JsonResponse({"code": 401, "data": [], "messages": serializer.errors}, status=200)
 
         for attr, value in serializer.validated_data.items():
-            setattr(task, attr, value)
+            setattr(task, self.field_names.get(attr, attr), value)
 
-        task.save()
+        await sync_to_async(self.save_task)(task)
 
-        return self.get(request, "Task updated successfully.")
+        return await self.mutation_response(request, "Task updated successfully.", task)
+
+    @class_require_authentication(Permission.UPDATE_TASK)
+    async def patch(self, request, task_id):
+        data = json.loads(request.body)
+        serializer = CreateTaskSerializer(data=data, partial=True, context=await self.reference_ids(data))
+        if not serializer.is_valid():
+            return JsonResponse({"code": 401, "data": [], "messages": serializer.errors}, status=200)
+
+        return await self.update_columns(request, task_id, serializer.validated_data)
 
     @class_require_authentication(Permission.DELETE_TASK)
-    def delete(self, request, task_id):
+    async def delete(self, request, task_id):
 
-        task = Task.objects.filter(id=task_id).first()
+        task = await Task.objects.filter(id=task_id).afirst()
         if not isinstance(task, Task):
             return JsonResponse({"code": 404, "data": [], "messages": "Task not found."}, status=200)
 
-        task.delete()
+        await task.adelete()
+
+        return await self.mutation_response(request, "Task deleted successfully.")
 
-        return self.get(request, "Task deleted successfully.")
+    async def update_columns(self, request, task_id, validated_data):
+        # Only the columns the counters track are loaded, and the UPDATE
+        # sets only the submitted ones (auto_now needs updated_at listed).
+        task = await Task.objects.only(
+            'id', 'project_id', 'status', 'assign_to_user_id').filter(id=task_id).afirst()
+        if not isinstance(task, Task):
+            return JsonResponse({"code": 404, "data": [], "messages": "Task not found."}, status=200)
 
+        update_fields = ['updated_at']
+        for attr, value in validated_data.items():
+            attr = self.field_names.get(attr, attr)
+            setattr(task, attr, value)
+            update_fields.append(attr)
+
+        await sync_to_async(self.save_task)(task, update_fields)
+
+        return await self.mutation_response(request, "Task updated successfully.", task)
+
+    async def reference_ids(self, data):
+        """
+        Looks up the user and project ``data`` references, so validation
+        doesn't query from the event loop. Returns the serializer context.
+        """
+        context = {}
+        for name, model, key in (('assigned_to_user_id', User, 'user_ids'), ('project_id', Project, 'project_ids')):
+            try:
+                value = int(data.get(name))
+            except (TypeError, ValueError):
+                context[key] = set()
+                continue
+            context[key] = {pk async for pk in model.objects.filter(id=value).values_list('id', flat=True)}
+        return context
+
+    # Transactions aren't available in async code, so writes whose counter
+    # updates must commit with them run in these sync helpers.
+
+    def create_task(self, validated_data):
+        with transaction.atomic():
+            return Task.objects.create(
+                title=validated_data.get('title'),
+                description=validated_data.get('description', ''),
+                due_date=validated_data.get('due_date'),
+                assign_to_user_id=validated_data.get('assigned_to_user_id'),
+                project_id=validated_data.get('project_id'),
+                status=validated_data.get('status'),
+                priority=validated_data.get('priority')
+            )
+
+    def save_task(self, task, update_fields=None):
+        with transaction.atomic():
+            task.save(update_fields=update_fields)
+
+    async def serialize_resource(self, task):
+        # One row read instead of lazy loads for the nested project and
+        # assignee.
+        rows = Task.objects.filter(id=task.id).values_list(*TASK_ROWS.columns)
+        return TASK_ROWS.serialize([row async for row in rows])[0]
+
+    @read_replica
     @class_require_authentication(Permission.VIEW_TASKS)
-    def get(self, request, message=""):
-        object_list = Task.objects.all()
+    async def get(self, request, task_id=None, message=""):
+        if task_id is not None:
+            return await self.get_detail(request, task_id)
+
+        filters = TaskFilterSerializer(data=request.GET.dict())
+        if not filters.is_valid():
+            return JsonResponse({"code": 401, "data": [], "messages": filters.errors}, status=200)
+
+        # One query yields both the validators and the total. Project and
+        # user updates count too, as tasks embed the project name and the
+        # assignee; the counter, when there is one, saves counting the rows.
+        counter_key = filters.counter_key()
+        state = await list_state(
+            filters.filter(Task.objects.all()),
+            count=Window(Count('id')) if counter_key is None else count_subquery(counter_key),
+            projects_updated_at=latest_update(Project.objects.all()),
+            users_updated_at=latest_update(User.objects.all()))
+        if request.method not in ('GET', 'HEAD'):
+            return await self.get_page(request, filters, state, message)
+
+        etag = make_etag(request, state)
+        response = not_modified(request, etag)
+        if response is None:
+            response = set_validators(await self.get_page(request, filters, state, message), etag)
+        return response
+
+    async def get_detail(self, request, task_id):
+        row = await Task.objects.filter(id=task_id).values_list(
+            *TASK_ROWS.columns, 'updated_at', 'project__updated_at', 'assign_to_user__updated_at').afirst()
+        if row is None:
+            return JsonResponse({"code": 404, "data": [], "messages": "Task not found."}, status=200)
+
+        last_modified = max(value for value in row[-3:] if value is not None)
+        etag = make_etag(request, {"id": task_id, "updated_at": row[-3], "project_updated_at": row[-2],
+                                   "assignee_updated_at": row[-1]})
+        response = not_modified(request, etag, last_modified)
+        if response is not None:
+            return response
+
+        return set_validators(JsonResponse(
+            {"code": 200, "data": TASK_ROWS.serialize([row])[0], "messages": ""}, status=200), etag, last_modified)
+
+    async def get_page(self, request, filters, state, message=""):
+        if wants_cursor_pagination(request):
+            return await self.get_cursor_page(request, filters, message)
+
+        object_list = filters.filter(Task.objects.all()).order_by(
+            *filters.get_ordering('id')).values_list(*TASK_ROWS.columns)
         per_page = request.GET.get('per_page', 5)
         paginator = Paginator(object_list, per_page)
+        paginator.count = state['count'] or 0
 
         page_number = request.GET.get('page', 1)
         page_obj = paginator.get_page(page_number)
 
-        projects_data = [TaskSerializer(
-            p).data for p in page_obj.object_list]
+        projects_data = TASK_ROWS.serialize([row async for row in page_obj.object_list])
 
         return JsonResponse({"code": 200, "data": {
             "current_page": page_number,
             "data": projects_data,
             "per_page": per_page,
-            "total": object_list.count()
+            "total": paginator.count
         }, "messages": message}, status=200)
+
+    async def get_cursor_page(self, request, filters, message=""):
+        per_page = get_per_page(request)
+        sort = filters.get_sort('-created_at')
+        # id and due_date are already serialized; created_at is only needed
+        # for the cursor.
+        columns = TASK_ROWS.columns + ['created_at']
+        paginator = KeysetPaginator(
+            filters.filter(Task.objects.all()).values_list(*columns), sort, per_page, columns)
+
+        try:
+            page, next_cursor = await paginator.aget_page(request.GET.get('cursor'))
+        except InvalidCursor:
+            return JsonResponse({"code": 401, "data": [], "messages": "Invalid cursor."}, status=200)
+
+        tasks_data = TASK_ROWS.serialize(page)
+
+        return JsonResponse({"code": 200, "data": {
+            "data": tasks_data,
+            "per_page": per_page,
+            "next_cursor": next_cursor
+        }, "messages": message}, status=200)
+
+
+class TaskExportView(View):
+
+    @class_require_authentication(Permission.VIEW_TASKS)
+    def get(self, request):
+        params = request.GET.dict()
+        export_format = params.pop('format', 'ndjson')
+        if export_format not in EXPORT_FORMATS:
+            return JsonResponse({"code": 401, "data": [], "messages": {"format": [f"Must be one of: {', '.join(EXPORT_FORMATS)}."]}}, status=200)
+
+        filters = TaskFilterSerializer(data=params)
+        if not filters.is_valid():
+            return JsonResponse({"code": 401, "data": [], "messages": filters.errors}, status=200)
+
+        return export_response(request, TASK_ROWS, filters.filter(Task.objects.all()), export_format, 'tasks')
+
+
+class TaskSearchView(View):
+
+    @read_replica
+    @class_require_authentication(Permission.VIEW_TASKS)
+    async def get(self, request):
+        return await search_response(request, Task.objects.all(), Task.SEARCH_FIELDS, TASK_ROWS)
+
+
+class TaskImportView(View):
+
+    @class_require_authentication(Permission.CREATE_TASK)
+    def post(self, request):
+        import_format = request.GET.get('format', 'ndjson')
+        if import_format not in IMPORT_FORMATS:
+            return JsonResponse({"code": 401, "data": [], "messages": {"format": [f"Must be one of: {', '.join(IMPORT_FORMATS)}."]}}, status=200)
+
+        # Either a multipart "file" or the raw body, read line by line.
+        upload = request.FILES.get('file') if request.content_type == 'multipart/form-data' else request
+        if upload is None:
+            return JsonResponse({"code": 401, "data": [], "messages": {"file": ["This field is required."]}}, status=200)
+
+        summary = TaskImporter().run(codecs.iterdecode(upload, 'utf-8'), import_format)
+
+        return JsonResponse({"code": 200, "data": summary, "messages": "Tasks imported successfully."}, status=200)
+
+
+class TaskStatusSerializer(serializers.Serializer):
+    status = serializers.ChoiceField(
+        choices=Task.get_statuses(), required=True)
+
+
+class TaskStatusView(TaskView):
+
+    http_method_names = ['patch']
+    # Boards move many cards; the list would be re-read for each of them.
+    mutation_response_mode = MINIMAL_RESPONSE
+
+    @class_require_authentication(Permission.UPDATE_TASK_STATUS)
+    async def patch(self, request, task_id):
+        data = json.loads(request.body)
+        serializer = TaskStatusSerializer(data=data)
+        if not serializer.is_valid():
+            return JsonResponse({"code": 401, "data": [], "messages": serializer.errors}, status=200)
+
+        return await self.update_columns(request, task_id, serializer.validated_data)
+
+
+class TaskBulkView(View):
+
+    MAX_ITEMS = 1000
+
+    @class_require_authentication(Permission.CREATE_TASK)
+    def post(self, request):
+        items, error_response = self.parse_items(request, 'tasks')
+        if error_response:
+            return error_response
+
+        validated, errors = self.validate_items(items)
+        if errors:
+            return JsonResponse({"code": 401, "data": [], "messages": errors}, status=200)
+
+        tasks = [Task(
+            title=data.get('title'),
+            description=data.get('description', ''),
+            due_date=data.get('due_date'),
+            assign_to_user_id=data.get('assigned_to_user_id'),
+            project_id=data.get('project_id'),
+            status=data.get('status'),
+            priority=data.get('priority')
+        ) for data in validated]
+
+        with transaction.atomic():
+            Task.objects.bulk_create(tasks, batch_size=500)
+            apply_task_changes(current=[
+                (task.project_id, task.status, task.assign_to_user_id) for task in tasks])
+        invalidate_overview()
+
+        return JsonResponse({"code": 200, "data": {"created": len(tasks)}, "messages": "Tasks created successfully."}, status=200)
+
+    @class_require_authentication(Permission.UPDATE_TASK)
+    def put(self, request):
+        items, error_response = self.parse_items(request, 'tasks')
+        if error_response:
+            return error_response
+
+        validated, errors = self.validate_items(items)
+        for index, item in enumerate(items):
+            if not self.is_id(item.get('id')):
+                errors.setdefault(index, {})['id'] = ["A valid task id is required."]
+        if errors:
+            return JsonResponse({"code": 401, "data": [], "messages": errors}, status=200)
+
+        with transaction.atomic():
+            tasks = Task.objects.select_for_update().in_bulk(
+                [item['id'] for item in items])
+            missing = {index: {"id": ["Task not found."]}
+                       for index, item in enumerate(items) if item['id'] not in tasks}
+            if missing:
+                return JsonResponse({"code": 404, "data": [], "messages": missing}, status=200)
+
+            previous = [(task.project_id, task.status, task.assign_to_user_id)
+                        for task in tasks.values()]
+            now = datetime.now(timezone.utc)
+            for item, data in zip(items, validated):
+                task = tasks[item['id']]
+                for attr, value in data.items():
+                    setattr(task, TaskView.field_names.get(attr, attr), value)
+                task.updated_at = now
+
+            Task.objects.bulk_update(tasks.values(), [
+                'title', 'description', 'due_date', 'status', 'priority',
+                'assign_to_user_id', 'project_id', 'updated_at'], batch_size=500)
+            apply_task_changes(previous=previous, current=[
+                (task.project_id, task.status, task.assign_to_user_id) for task in tasks.values()])
+        invalidate_overview()
+
+        return JsonResponse({"code": 200, "data": {"updated": len(tasks)}, "messages": "Tasks updated successfully."}, status=200)
+
+    @class_require_authentication(Permission.DELETE_TASK)
+    def delete(self, request):
+        ids, error_response = self.parse_items(request, 'ids')
+        if error_response:
+            return error_response
+
+        with transaction.atomic():
+            existing = set(Task.objects.select_for_update().filter(
+                id__in=ids).values_list('id', flat=True))
+            missing = {index: ["Task not found."]
+                       for index, task_id in enumerate(ids) if task_id not in existing}
+            if missing:
+                return JsonResponse({"code": 404, "data": [], "messages": missing}, status=200)
+
+            with batched_counters():
+                Task.objects.filter(id__in=existing).delete()
+
+        return JsonResponse({"code": 200, "data": {"deleted": len(existing)}, "messages": "Tasks deleted successfully."}, status=200)
+
+    def parse_items(self, request, key):
+        try:
+            items = json.loads(request.body).get(key)
+        except (json.JSONDecodeError, AttributeError):
+            items = None
+
+        if not isinstance(items, list) or not items:
+            return None, JsonResponse({"code": 401, "data": [], "messages": {key: ["A non-empty list is required."]}}, status=200)
+        if len(items) > self.MAX_ITEMS:
+            return None, JsonResponse({"code": 401, "data": [], "messages": {key: [f"At most {self.MAX_ITEMS} items are allowed."]}}, status=200)
+        if not all(isinstance(item, dict) if key == 'tasks' else self.is_id(item) for item in items):
+            return None, JsonResponse({"code": 401, "data": [], "messages": {key: ["Invalid item."]}}, status=200)
+
+        return items, None
+
+    @staticmethod
+    def is_id(value):
+        # bool is an int subclass, so true would address task 1.
+        return isinstance(value, int) and not isinstance(value, bool)
+
+    @staticmethod
+    def coerce_ids(values):
+        """
+        The ids among ``values`` as CreateTaskSerializer will read them, so
+        "5" is looked up as 5 and booleans or junk are left to fail there.
+        """
+        field = serializers.IntegerField()
+        ids = set()
+        for value in values:
+            try:
+                ids.add(field.to_internal_value(value))
+            except serializers.ValidationError:
+                pass
+        return ids
+
+    def validate_items(self, items):
+        """
+        Validates every item against the users and projects they reference,
+        fetched with one IN query each. Returns the validated data and the
+        errors keyed by item index.
+        """
+        user_ids = self.coerce_ids(item.get('assigned_to_user_id') for item in items)
+        project_ids = self.coerce_ids(item.get('project_id') for item in items)
+        context = {
+            'user_ids': set(User.objects.filter(id__in=user_ids).values_list('id', flat=True)),
+            'project_ids': set(Project.objects.filter(id__in=project_ids).values_list('id', flat=True)),
+        }
+
+        validated = []
+        errors = {}
+        for index, item in enumerate(items):
+            serializer = CreateTaskSerializer(data=item, context=context)
+            if serializer.is_valid():
+                validated.append(serializer.validated_data)
+            else:
+                errors[index] = serializer.errors
+
+        return validated, errors
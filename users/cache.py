@@ -0,0 +1,122 @@
+import copy
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from django.db import DEFAULT_DB_ALIAS
+
+from core import settings
+from users.models import Permission, User
+
+
+Principal = namedtuple('Principal', ['user', 'permissions'])
+
+
+class PrincipalCache:
+    """
+    In-process LRU cache of authenticated principals (the user row and the
+    names of its permissions), so repeat callers authenticate without
+    touching the database. Entries expire after ``ttl`` seconds and are
+    invalidated by the signal handlers in ``users.signals``.
+    """
+
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(self, user_id, min_epoch=None):
+        """
+        The principal of ``user_id``, reloaded when the cached one is older
+        than ``min_epoch``, e.g. the epoch of a token minted after another
+        process changed the user's permissions.
+        """
+        principal, generation, expires = self._lookup(user_id, min_epoch)
+        if principal is None:
+            principal = self.load(user_id)
+            self._store(user_id, principal, generation, expires)
+        return self._copy(principal)
+
+    async def aget(self, user_id, min_epoch=None):
+        principal, generation, expires = self._lookup(user_id, min_epoch)
+        if principal is None:
+            principal = await self.aload(user_id)
+            self._store(user_id, principal, generation, expires)
+        return self._copy(principal)
+
+    # Principals come from the primary even inside replica_reads(): a
+    # lagging replica would resurrect revoked permissions and epochs, and
+    # the cached copy would keep them for the whole ttl.
+
+    def load(self, user_id):
+        user = User.objects.using(DEFAULT_DB_ALIAS).select_related('role').get(id=user_id)
+        return Principal(user, Permission.from_mask(user.permission_bits))
+
+    async def aload(self, user_id):
+        user = await User.objects.using(DEFAULT_DB_ALIAS).select_related('role').aget(id=user_id)
+        return Principal(user, Permission.from_mask(user.permission_bits))
+
+    def invalidate(self, *user_ids):
+        with self._lock:
+            self._generation += 1
+            for user_id in user_ids:
+                self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def _lookup(self, user_id, min_epoch=None):
+        """
+        Returns ``(principal, generation, expires)``; ``principal`` is
+        ``None`` on a miss and the rest is what ``_store`` needs.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[1] > now and (
+                    min_epoch is None or entry[0].user.permission_epoch >= min_epoch):
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return entry[0], None, None
+            self.misses += 1
+            return None, self._generation, now + self.ttl
+
+    def _store(self, user_id, principal, generation, expires):
+        with self._lock:
+            # Skip the store if an invalidation ran while we were loading,
+            # otherwise a stale principal could outlive the change.
+            if generation == self._generation and self.max_size > 0:
+                self._entries[user_id] = (principal, expires)
+                self._entries.move_to_end(user_id)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+
+    def _copy(self, principal):
+        # Each request gets its own user instance so views can't leak
+        # attribute changes into the shared cache entry.
+        return Principal(copy.copy(principal.user), principal.permissions)
+
+
+principal_cache = PrincipalCache(
+    max_size=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL,
+)
@@ -1,32 +1,96 @@
 from functools import wraps
-from django.http import JsonResponse
+from asgiref.sync import iscoroutinefunction
+from core.responses import JsonResponse
 import jwt
 from core import settings
+from core.timing import timed
+from users.cache import principal_cache
 from users.models import User
+from users.tokens import REFRESH_TOKEN_TYPE, token_permissions
 
 
+class AuthenticationFailed(Exception):
+    pass
+
+
+def decode_request_token(request):
+    auth_header = request.headers.get('Authorization')
+    if not auth_header or not auth_header.startswith('Bearer '):
+        raise AuthenticationFailed("Authentication credentials were not provided.")
+
+    token = auth_header.split(' ')[1]
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
+    except jwt.ExpiredSignatureError:
+        raise AuthenticationFailed("Token has expired.")
+    except jwt.InvalidTokenError:
+        raise AuthenticationFailed("Invalid token.")
+
+    # Refresh tokens are signed with the same key but only buy new tokens.
+    if payload.get("type") == REFRESH_TOKEN_TYPE:
+        raise AuthenticationFailed("Invalid token.")
+    return payload
+
+
+def authorize_request(request, payload, principal, permission_required=None):
+    permissions = token_permissions(payload, principal)
+    if permissions is None:
+        raise AuthenticationFailed("Token has been revoked.")
+
+    if permission_required and permission_required not in permissions:
+        raise AuthenticationFailed("You do not have permission to perform this action.")
+
+    request.user = principal.user
+
+
+def authenticate_request(request, permission_required=None):
+    with timed('auth'):
+        try:
+            payload = decode_request_token(request)
+            principal = principal_cache.get(payload['user_id'], payload.get('epoch'))
+            authorize_request(request, payload, principal, permission_required)
+        except (KeyError, User.DoesNotExist):
+            return JsonResponse({"code": 500, "data": [], "messages": "Invalid token."}, status=200)
+        except AuthenticationFailed as error:
+            return JsonResponse({"code": 500, "data": [], "messages": str(error)}, status=200)
+
+    return None
+
+
+async def aauthenticate_request(request, permission_required=None):
+    with timed('auth'):
+        try:
+            payload = decode_request_token(request)
+            principal = await principal_cache.aget(payload['user_id'], payload.get('epoch'))
+            authorize_request(request, payload, principal, permission_required)
+        except (KeyError, User.DoesNotExist):
+            return JsonResponse({"code": 500, "data": [], "messages": "Invalid token."}, status=200)
+        except AuthenticationFailed as error:
+            return JsonResponse({"code": 500, "data": [], "messages": str(error)}, status=200)
+
+    return None
+
+
+# Both decorators keep coroutine views async, so under ASGI they run on the
+# event loop instead of behind a sync adapter.
+
 def require_authentication(permission_required=None):
     def decorator(view_func):
-        @wraps(view_func)
-        def wrapper(request, *args, **kwargs):
-            auth_header = request.headers.get('Authorization')
-            if not auth_header or not auth_header.startswith('Bearer '):
-                return JsonResponse({"code": 500, "data": [], "messages": "Authentication credentials were not provided."}, status=200)
-
-            token = auth_header.split(' ')[1]
-            try:
-                payload = jwt.decode(
-                    token, settings.SECRET_KEY, algorithms=["HS256"])
-                user = User.objects.get(id=payload['user_id'])
+        if iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def async_wrapper(request, *args, **kwargs):
+                error_response = await aauthenticate_request(request, permission_required)
+                if error_response is not None:
+                    return error_response
 
-                if permission_required and not user.has_permission(permission_required):
-                    return JsonResponse({"code": 500, "data": [], "messages": "You do not have permission to perform this action."}, status=200)
+                return await view_func(request, *args, **kwargs)
+            return async_wrapper
 
-                request.user = user
-            except jwt.ExpiredSignatureError:
-                return JsonResponse({"code": 500, "data": [], "messages": "Token has expired."}, status=200)
-            except jwt.InvalidTokenError:
-                return JsonResponse({"code": 500, "data": [], "messages": "Invalid token."}, status=200)
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            error_response = authenticate_request(request, permission_required)
+            if error_response is not None:
+                return error_response
 
             return view_func(request, *args, **kwargs)
         return wrapper
@@ -35,26 +99,21 @@ def require_authentication(permission_required=None):
 
 def class_require_authentication(permission_required=None):
     def decorator(view_func):
+        if iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def async_wrapper(self, request, *args, **kwargs):
+                error_response = await aauthenticate_request(request, permission_required)
+                if error_response is not None:
+                    return error_response
+
+                return await view_func(self, request, *args, **kwargs)
+            return async_wrapper
+
         @wraps(view_func)
         def wrapper(self, request, *args, **kwargs):
-            auth_header = request.headers.get('Authorization')
-            if not auth_header or not auth_header.startswith('Bearer '):
-                return JsonResponse({"code": 500, "data": [], "messages": "Authentication credentials were not provided."}, status=200)
-
-            token = auth_header.split(' ')[1]
-            try:
-                payload = jwt.decode(
-                    token, settings.SECRET_KEY, algorithms=["HS256"])
-                user = User.objects.get(id=payload['user_id'])
-
-                if permission_required and not user.has_permission(permission_required):
-                    return JsonResponse({"code": 500, "data": [], "messages": "You do not have permission to perform this action."}, status=200)
-
-                request.user = user
-            except jwt.ExpiredSignatureError:
-                return JsonResponse({"code": 500, "data": [], "messages": "Token has expired."}, status=200)
-            except jwt.InvalidTokenError:
-                return JsonResponse({"code": 500, "data": [], "messages": "Invalid token."}, status=200)
+            error_response = authenticate_request(request, permission_required)
+            if error_response is not None:
+                return error_response
 
             return view_func(self, request, *args, **kwargs)
         return wrapper
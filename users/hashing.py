@@ -0,0 +1,122 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import django
+from django.contrib.auth import hashers
+from django.contrib.auth.hashers import check_password, get_hasher, identify_hasher, make_password
+
+from core import settings
+
+
+class HashingBusy(Exception):
+    pass
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    """
+    Django's PBKDF2 hasher with ``PASSWORD_PBKDF2_ITERATIONS`` iterations;
+    hashes made with another count are upgraded on the next sign-in.
+    """
+    iterations = settings.PASSWORD_PBKDF2_ITERATIONS or hashers.PBKDF2PasswordHasher.iterations
+
+
+def needs_rehash(encoded):
+    """
+    Whether a valid ``encoded`` hash should be replaced by one made with
+    the preferred hasher and its current cost settings.
+    """
+    try:
+        hasher = identify_hasher(encoded)
+    except ValueError:
+        return False
+    preferred = get_hasher('default')
+    return hasher.algorithm != preferred.algorithm or preferred.must_update(encoded)
+
+
+class HashingPool:
+    """
+    Runs password hashing off the event loop on at most ``workers``
+    threads or processes, so sign-in bursts can take no more than that many
+    cores from the rest of the API. Up to ``max_queue`` more calls wait
+    for a worker; further ones raise ``HashingBusy`` at once.
+    """
+
+    def __init__(self, workers, max_queue, executor='thread'):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.executor_type = executor
+        self.submitted = 0
+        self.completed = 0
+        self.rejected = 0
+        self.max_pending = 0
+        self.seconds = 0.0
+        self._pending = 0
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def get_executor(self):
+        if self._executor is None:
+            if self.executor_type == 'process':
+                # Spawned workers have to load the settings and hashers.
+                self._executor = ProcessPoolExecutor(self.workers, initializer=django.setup)
+            else:
+                self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix='password-hashing')
+        return self._executor
+
+    async def run(self, func, *args):
+        with self._lock:
+            if self._pending >= self.workers + self.max_queue:
+                self.rejected += 1
+                raise HashingBusy("Too many authentication requests, try again shortly.")
+            self._pending += 1
+            self.submitted += 1
+            self.max_pending = max(self.max_pending, self._pending)
+            executor = self.get_executor()
+
+        started = time.perf_counter()
+        try:
+            return await asyncio.wrap_future(executor.submit(func, *args))
+        finally:
+            with self._lock:
+                self._pending -= 1
+                self.completed += 1
+                self.seconds += time.perf_counter() - started
+
+    def stats(self):
+        with self._lock:
+            running = min(self._pending, self.workers)
+            return {
+                "executor": self.executor_type,
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "running": running,
+                "queued": self._pending - running,
+                "max_pending": self.max_pending,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                # Queueing included.
+                "avg_ms": round(self.seconds / self.completed * 1000, 3) if self.completed else 0.0,
+            }
+
+
+hashing_pool = HashingPool(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_QUEUE,
+                           settings.PASSWORD_HASH_EXECUTOR)
+
+
+async def ahash_password(password):
+    return await hashing_pool.run(make_password, password)
+
+
+async def averify_password(password, encoded):
+    """
+    Returns whether ``password`` matches ``encoded`` and, if it does and
+    the hash is outdated, a new hash to store in its place (else ``None``).
+    """
+    if not await hashing_pool.run(check_password, password, encoded):
+        return False, None
+    if needs_rehash(encoded):
+        return True, await hashing_pool.run(make_password, password)
+    return True, None
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+from tasks.importer import IMPORT_FORMATS, TaskImporter
+
+
+class Command(BaseCommand):
+    help = 'Import tasks from a CSV or NDJSON file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--format', choices=IMPORT_FORMATS,
+                            help='Defaults to the file extension.')
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        import_format = options['format'] or (
+            'csv' if options['path'].endswith('.csv') else 'ndjson')
+
+        def progress(state):
+            self.stdout.write(
+                f'{state["imported"]} imported, {state["failed"]} failed, '
+                f'{state["rows_per_second"]} rows/s')
+
+        importer = TaskImporter(options['batch_size'], progress)
+        with open(options['path'], newline='', encoding='utf-8') as lines:
+            summary = importer.run(lines, import_format)
+
+        for error in summary['errors']:
+            self.stderr.write(f'Line {error["line"]}: {error["message"]}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {summary["imported"]} tasks ({summary["failed"]} failed) '
+            f'in {summary["seconds"]}s.'))
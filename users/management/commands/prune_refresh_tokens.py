@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from users.models import RefreshToken
+
+
+class Command(BaseCommand):
+    help = 'Delete expired refresh tokens'
+
+    def handle(self, *args, **options):
+
+        # Used tokens are kept until they expire, for reuse detection.
+        deleted, _ = RefreshToken.objects.filter(expires_at__lte=timezone.now()).delete()
+        self.stdout.write(self.style.SUCCESS(f'{deleted} expired refresh tokens deleted.'))
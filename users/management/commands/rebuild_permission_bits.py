@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+from django.db.models import F
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the denormalized permission bitset of every user'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+
+        batch_size = options['batch_size']
+        last_id = 0
+        rebuilt = 0
+        changed = 0
+
+        while True:
+            users = list(User.objects.filter(id__gt=last_id).order_by(
+                'id').values_list('id', 'permission_bits')[:batch_size])
+            if not users:
+                break
+
+            bits = User.compute_permission_bits([user_id for user_id, _ in users])
+            stale_by_bits = {}
+            for user_id, current in users:
+                if bits[user_id] != current:
+                    stale_by_bits.setdefault(bits[user_id], []).append(user_id)
+
+            # The epoch is bumped too, so tokens embedding the old mask are
+            # revoked. Servers' principal caches pick the change up when
+            # their entries expire or a newer token arrives.
+            for value, ids in stale_by_bits.items():
+                User.objects.filter(id__in=ids).update(
+                    permission_bits=value, permission_epoch=F('permission_epoch') + 1)
+
+            rebuilt += len(users)
+            changed += sum(map(len, stale_by_bits.values()))
+            last_id = users[-1][0]
+            self.stdout.write(f'{rebuilt} users processed.')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Permission bits rebuilt for {rebuilt} users ({changed} changed).'))
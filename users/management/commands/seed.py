@@ -1,12 +1,27 @@
-from django.core.management.base import BaseCommand
+from datetime import datetime, timezone
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
 from users.models import Permission, Role, User
 from django.contrib.auth.hashers import make_password
+from overview.counters import reconcile_counters
+from overview.dashboard import invalidate_overview
+from projects.models import Project
+from tasks.synthetic import SYNTHETIC_PASSWORD, SyntheticData
 
 
 class Command(BaseCommand):
-    help = 'Seed initial data for users app'
+    help = 'Seed initial data for users app, plus optional synthetic users, projects and tasks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=0, help='Synthetic users to add.')
+        parser.add_argument('--projects', type=int, default=0, help='Synthetic projects to add.')
+        parser.add_argument('--tasks', type=int, default=0, help='Synthetic tasks to add, spread over all projects.')
+        parser.add_argument('--seed', type=int, default=0, help='Seed of the random generator.')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per bulk insert.')
+        parser.add_argument('--workers', type=int, default=1, help='Processes inserting in parallel.')
 
     def handle(self, *args, **options):
+        self.verbosity = options['verbosity']
 
         for permission in Permission.ALL_PERMISSIONS:
             _, created = Permission.objects.get_or_create(name=permission)
@@ -46,3 +61,33 @@ class Command(BaseCommand):
         )
 
         user.permissions.set(admin_role.permissions.all())
+
+        if options['users'] or options['projects'] or options['tasks']:
+            self.seed_synthetic(options)
+
+    def seed_synthetic(self, options):
+        if options['workers'] > 1 and connection.vendor == 'sqlite':
+            raise CommandError('SQLite takes one writer at a time; use --workers 1.')
+        if options['users'] and User.objects.filter(email='user0@example.com').exists():
+            raise CommandError('Synthetic users already exist; seed more projects and tasks only.')
+        if options['tasks'] and not options['projects'] and not Project.objects.exists():
+            raise CommandError('Tasks need projects; pass --projects.')
+
+        # Dates are relative to today, so runs on the same day match.
+        today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+        generator = SyntheticData(today, seed=options['seed'], batch_size=options['batch_size'],
+                                  workers=options['workers'], progress=self.progress)
+
+        for kind in ('users', 'projects', 'tasks'):
+            if options[kind]:
+                getattr(generator, kind)(options[kind])
+                self.stdout.write(self.style.SUCCESS(f'{options[kind]} synthetic {kind} created.'))
+
+        reconcile_counters()
+        invalidate_overview()
+        if options['users']:
+            self.stdout.write(f'Synthetic users sign in as user<N>@example.com with "{SYNTHETIC_PASSWORD}".')
+
+    def progress(self, kind, inserted, count):
+        if self.verbosity > 1 or inserted == count:
+            self.stdout.write(f'{inserted}/{count} {kind} inserted.')
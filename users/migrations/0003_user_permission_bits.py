@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:20
+
+from django.db import migrations, models
+
+
+BATCH_SIZE = 1000
+
+
+def populate_permission_bits(apps, schema_editor):
+    from users.models import Permission as PermissionModel
+
+    User = apps.get_model('users', 'User')
+    UserPermission = apps.get_model('users', 'UserPermission')
+
+    last_id = 0
+    while True:
+        user_ids = list(User.objects.filter(id__gt=last_id).order_by(
+            'id').values_list('id', flat=True)[:BATCH_SIZE])
+        if not user_ids:
+            break
+
+        bits = dict.fromkeys(user_ids, 0)
+        rows = UserPermission.objects.filter(
+            user_id__in=user_ids).values_list('user_id', 'permission__name')
+        for user_id, permission_name in rows:
+            bits[user_id] |= PermissionModel.PERMISSION_BITS.get(
+                permission_name, 0)
+
+        User.objects.bulk_update(
+            [User(id=user_id, permission_bits=value) for user_id, value in bits.items()], ['permission_bits'])
+        last_id = user_ids[-1]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_user_permission_epoch'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='permission_bits',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.RunPython(populate_permission_bits,
+                             migrations.RunPython.noop),
+    ]
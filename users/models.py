@@ -60,6 +60,11 @@ class Permission(models.Model):
         UPDATE_SETTINGS,
     ]
 
+    # Bit positions follow ALL_PERMISSIONS, so new permissions must only
+    # ever be appended to it.
+    PERMISSION_BITS = {name: 1 << index for index,
+                       name in enumerate(ALL_PERMISSIONS)}
+
     ROLE_DEFAULT_PERMISSIONS = {
         Role.ADMIN_ROLE: [
             VIEW_OVERVIEW,
@@ -110,6 +115,17 @@ class Permission(models.Model):
     def __str__(self):
         return self.name
 
+    @staticmethod
+    def to_mask(permission_names):
+        mask = 0
+        for permission_name in permission_names:
+            mask |= Permission.PERMISSION_BITS.get(permission_name, 0)
+        return mask
+
+    @staticmethod
+    def from_mask(mask):
+        return frozenset(name for name, bit in Permission.PERMISSION_BITS.items() if mask & bit)
+
     class Meta:
         db_table = 'permissions'
 
@@ -130,18 +146,36 @@ class User(models.Model):
         Role, on_delete=models.SET_NULL, related_name='users', null=True, blank=True)
     permissions = models.ManyToManyField(
         Permission, through='UserPermission', related_name='user_permissions', blank=True)
+    permission_epoch = models.PositiveIntegerField(default=0)
+    permission_bits = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.full_name
 
     def has_permission(self, permission_name):
-        return self.permissions.filter(name=permission_name).exists()
+        return bool(self.permission_bits & Permission.PERMISSION_BITS.get(permission_name, 0))
+
+    @staticmethod
+    def compute_permission_bits(user_ids):
+        bits = dict.fromkeys(user_ids, 0)
+        rows = UserPermission.objects.filter(
+            user_id__in=user_ids).values_list('user_id', 'permission__name')
+        for user_id, permission_name in rows:
+            bits[user_id] |= Permission.PERMISSION_BITS.get(permission_name, 0)
+        return bits
 
     def get_password(self):
         return self.password
 
     class Meta:
         db_table = 'users'
+        indexes = [
+            # Tasks embed their assignee; makes the latest user change for
+            # the task list validators an index lookup.
+            models.Index(fields=['updated_at'],
+                         name='users_updated_at_idx'),
+        ]
 
 
 class UserPermission(models.Model):
@@ -150,3 +184,21 @@ class UserPermission(models.Model):
 
     class Meta:
         db_table = 'user_permissions'
+
+
+class RefreshToken(models.Model):
+    """
+    One issued refresh token. Each refresh marks it used and issues the
+    next token of its ``family``; presenting a used token again means it
+    leaked, so the whole family is revoked.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='refresh_tokens')
+    jti = models.CharField(max_length=32, unique=True)
+    family = models.CharField(max_length=32, db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField()
+    used_at = models.DateTimeField(null=True, blank=True)
+    revoked_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'refresh_tokens'
@@ -0,0 +1,88 @@
+from django.db.models import F
+from django.db.models.signals import m2m_changed, post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from users.cache import principal_cache
+from users.models import Role, RolePermission, User, UserPermission
+
+
+def refresh_user_permissions(*user_ids):
+    """
+    Recomputes the permission bitset of ``user_ids``, rejects access tokens
+    carrying their previous permission set and drops their cached
+    principals. Returns the new bitsets keyed by user id.
+    """
+    if not user_ids:
+        return {}
+
+    bits = User.compute_permission_bits(user_ids)
+    # One UPDATE per distinct bitset rather than per user, so changing a
+    # permission shared by many users stays a handful of queries.
+    users_by_bits = {}
+    for user_id, value in bits.items():
+        users_by_bits.setdefault(value, []).append(user_id)
+    for value, ids in users_by_bits.items():
+        User.objects.filter(id__in=ids).update(
+            permission_bits=value, permission_epoch=F('permission_epoch') + 1)
+    principal_cache.invalidate(*user_ids)
+    return bits
+
+
+@receiver(post_init, sender=User)
+def remember_user_role(sender, instance, **kwargs):
+    instance._loaded_role_id = instance.__dict__.get('role_id')
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_principal(sender, instance, created, **kwargs):
+    if not created and instance.role_id != instance._loaded_role_id:
+        refresh_user_permissions(instance.pk)
+        instance.permission_epoch += 1
+    instance._loaded_role_id = instance.role_id
+    principal_cache.invalidate(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def invalidate_deleted_user_principal(sender, instance, **kwargs):
+    principal_cache.invalidate(instance.pk)
+
+
+@receiver(post_save, sender=UserPermission)
+@receiver(post_delete, sender=UserPermission)
+def invalidate_user_permission_principal(sender, instance, **kwargs):
+    refresh_user_permissions(instance.user_id)
+
+
+@receiver(m2m_changed, sender=User.permissions.through)
+def invalidate_user_permissions_principal(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse and action == 'pre_clear':
+        instance._cleared_user_ids = list(
+            instance.user_permissions.values_list('id', flat=True))
+        return
+
+    if not action.startswith('post_'):
+        return
+
+    if not reverse:
+        # Keep the caller's instance in step so a later save() doesn't
+        # write the old bitset back.
+        bits = refresh_user_permissions(instance.pk)
+        instance.permission_bits = bits[instance.pk]
+        instance.permission_epoch += 1
+    elif action == 'post_clear':
+        refresh_user_permissions(*instance.__dict__.pop('_cleared_user_ids', []))
+    else:
+        refresh_user_permissions(*(pk_set or []))
+
+
+@receiver(post_save, sender=RolePermission)
+@receiver(post_delete, sender=RolePermission)
+@receiver(post_delete, sender=Role)
+def invalidate_role_principals(sender, **kwargs):
+    principal_cache.clear()
+
+
+@receiver(m2m_changed, sender=Role.permissions.through)
+def invalidate_role_permissions_principals(sender, action, **kwargs):
+    if action.startswith('post_'):
+        principal_cache.clear()
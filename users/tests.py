@@ -1,10 +1,21 @@
+from django.db import connection
+from django.db.models import F
 from django.test import TestCase
-from django.core.management import call_command
+from django.test.utils import CaptureQueriesContext
+from django.core.management import CommandError, call_command
 import jwt
 from core import settings
-from users.models import User
+from core.routers import replica_reads
+from overview.counters import TASKS_KEY, get_count
+from tasks.models import Task
+from users.cache import principal_cache
+from users.hashing import HashingPool
+from users.models import Permission, RefreshToken, Role, User
+from users.tokens import create_access_token
 from django.contrib.auth.hashers import make_password
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from io import StringIO
+from unittest import mock
 
 
 class UserTests(TestCase):
@@ -85,3 +96,225 @@ class UserTests(TestCase):
 
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response_json['data']['email'], email)
+
+    def test_authentication_is_cached(self):
+
+        role = Role.objects.get(name=Role.MEMBER_ROLE)
+        user = User.objects.create(
+            full_name="member 4",
+            email="member4@example.com",
+            password=make_password("member4pass"),
+            role=role
+        )
+        user.permissions.set(role.permissions.all())
+
+        access_token = jwt.encode(
+            {"user_id": user.id, "exp": datetime.now() + timedelta(minutes=15)}, settings.SECRET_KEY, algorithm="HS256"
+        )
+        headers = {'Authorization': f'Bearer {access_token}'}
+
+        principal_cache.clear()
+        self.client.get('/api/auth_data/', headers=headers)
+        hits = principal_cache.hits
+
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/auth_data/', headers=headers)
+
+        self.assertEqual(response.json()['data']['email'], user.email)
+        self.assertEqual(principal_cache.hits, hits + 1)
+
+        user.permissions.remove(
+            Permission.objects.get(name=Permission.VIEW_TASKS))
+
+        response = self.client.get('/api/task/', headers=headers)
+
+        self.assertEqual(response.json()['messages'],
+                         "You do not have permission to perform this action.")
+
+    def test_principals_are_loaded_from_the_primary(self):
+        user = User.objects.first()
+        principal_cache.clear()
+
+        # replica_1 isn't configured, so reading from it would fail.
+        with mock.patch.object(settings, 'DATABASE_REPLICAS', {'replica_1': 1}), replica_reads():
+            self.assertEqual(principal_cache.get(user.id).user.email, user.email)
+
+    def test_permission_token_is_revoked_on_permission_change(self):
+
+        email = "member5@example.com"
+        password = "member5pass"
+        role = Role.objects.get(name=Role.MEMBER_ROLE)
+        user = User.objects.create(
+            full_name="member 5",
+            email=email,
+            password=make_password(password),
+            role=role
+        )
+        user.permissions.set(role.permissions.all())
+
+        with mock.patch.object(settings, 'ACCESS_TOKEN_EMBED_PERMISSIONS', True):
+            response = self.client.post(
+                '/api/signin/', {"email": email, "password": password}, content_type='application/json')
+
+        access_token = response.json()['data']['token']
+        payload = jwt.decode(
+            access_token, settings.SECRET_KEY, algorithms=["HS256"])
+
+        self.assertEqual(payload['role'], Role.MEMBER_ROLE)
+        self.assertEqual(Permission.from_mask(payload['perms']),
+                         set(Permission.ROLE_DEFAULT_PERMISSIONS[Role.MEMBER_ROLE]))
+
+        headers = {'Authorization': f'Bearer {access_token}'}
+        response = self.client.get('/api/auth_data/', headers=headers)
+        self.assertEqual(response.json()['data']['email'], email)
+
+        user.permissions.remove(
+            Permission.objects.get(name=Permission.VIEW_CHAT))
+
+        response = self.client.get('/api/auth_data/', headers=headers)
+        self.assertEqual(response.json()['messages'],
+                         "Token has been revoked.")
+
+    def test_epoch_changed_by_another_process(self):
+        role = Role.objects.get(name=Role.MEMBER_ROLE)
+        user = User.objects.create(full_name="member 9", email="member9@example.com",
+                                   password=make_password("member9pass"), role=role)
+        user.permissions.set(role.permissions.all())
+
+        with mock.patch.object(settings, 'ACCESS_TOKEN_EMBED_PERMISSIONS', True):
+            old_headers = {'Authorization': f'Bearer {create_access_token(user)}'}
+            self.client.get('/api/auth_data/', headers=old_headers)
+
+            # As another worker would: this process's cache isn't told.
+            User.objects.filter(id=user.id).update(permission_epoch=F('permission_epoch') + 1)
+            new_headers = {'Authorization': f'Bearer {create_access_token(user)}'}
+
+            response = self.client.get('/api/auth_data/', headers=new_headers)
+            self.assertEqual(response.json()['data']['email'], user.email)
+
+            response = self.client.get('/api/auth_data/', headers=old_headers)
+            self.assertEqual(response.json()['messages'], "Token has been revoked.")
+
+    def test_permission_bits(self):
+
+        role = Role.objects.get(name=Role.MEMBER_ROLE)
+        user = User.objects.create(
+            full_name="member 6",
+            email="member6@example.com",
+            password=make_password("member6pass"),
+            role=role
+        )
+        user.permissions.set(role.permissions.all())
+
+        with self.assertNumQueries(0):
+            self.assertTrue(user.has_permission(Permission.VIEW_TASKS))
+            self.assertFalse(user.has_permission(Permission.CREATE_TASK))
+
+        User.objects.filter(id=user.id).update(permission_bits=0)
+        epoch = User.objects.get(id=user.id).permission_epoch
+        call_command('rebuild_permission_bits', batch_size=1, verbosity=0, stdout=StringIO())
+
+        user.refresh_from_db()
+        self.assertEqual(Permission.from_mask(user.permission_bits),
+                         set(Permission.ROLE_DEFAULT_PERMISSIONS[Role.MEMBER_ROLE]))
+        self.assertEqual(user.permission_epoch, epoch + 1)
+
+    def test_permission_change_for_many_users(self):
+        role = Role.objects.get(name=Role.MEMBER_ROLE)
+        users = User.objects.bulk_create([
+            User(full_name=f"bulk member {index}", email=f"bulkmember{index}@example.com",
+                 password="unused", role=role) for index in range(10)])
+        permission = Permission.objects.get(name=Permission.CREATE_TASK)
+
+        # Users sharing a bitset are updated together.
+        with CaptureQueriesContext(connection) as queries:
+            permission.user_permissions.add(*users)
+        self.assertEqual(len([query for query in queries if query['sql'].startswith('UPDATE')]), 1)
+
+        self.assertTrue(all(user.has_permission(Permission.CREATE_TASK)
+                            for user in User.objects.filter(email__startswith="bulkmember")))
+
+    def test_signin_rehashes_outdated_passwords(self):
+        user = User.objects.create(full_name="member 7", email="member7@example.com",
+                                   password=make_password("member7pass", hasher='pbkdf2_sha1'))
+        data = {"email": user.email, "password": "member7pass"}
+
+        response_json = self.client.post('/api/signin/', data, content_type='application/json').json()
+        self.assertEqual(response_json['code'], 200)
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith('pbkdf2_sha256$'))
+
+        rehashed = user.password
+        self.client.post('/api/signin/', data, content_type='application/json')
+        user.refresh_from_db()
+        self.assertEqual(user.password, rehashed)
+
+    def test_password_hashing_is_bounded(self):
+        data = {"email": "admin@example.com", "password": "adminpassword"}
+
+        with mock.patch('users.hashing.hashing_pool', HashingPool(workers=0, max_queue=0)) as pool:
+            response_json = self.client.post('/api/signin/', data, content_type='application/json').json()
+        self.assertEqual(response_json['code'], 503)
+        self.assertEqual(pool.stats()['rejected'], 1)
+
+        response_json = self.client.post('/api/signin/', data, content_type='application/json').json()
+        self.assertEqual(response_json['code'], 200)
+
+    def test_refresh_token_rotation(self):
+        signin = {"email": "admin@example.com", "password": "adminpassword"}
+        first = self.client.post('/api/signin/', signin, content_type='application/json').json()['data']['refresh_token']
+
+        # A refresh token doesn't authenticate requests.
+        response_json = self.client.get('/api/auth_data/', HTTP_AUTHORIZATION=f'Bearer {first}').json()
+        self.assertEqual(response_json['messages'], "Invalid token.")
+
+        # The conditional update of the token and the insert of its
+        # successor, in a savepoint as tests run inside a transaction.
+        with self.assertNumQueries(4):
+            response_json = self.client.post('/api/token/refresh/', {"refresh_token": first},
+                                             content_type='application/json').json()
+        self.assertEqual(response_json['code'], 200)
+        second = response_json['data']['refresh_token']
+        response_json = self.client.get('/api/auth_data/', HTTP_AUTHORIZATION=f'Bearer {response_json["data"]["token"]}').json()
+        self.assertEqual(response_json['data']['email'], "admin@example.com")
+
+        # Replaying the first token revokes its successor too.
+        response_json = self.client.post('/api/token/refresh/', {"refresh_token": first},
+                                         content_type='application/json').json()
+        self.assertEqual(response_json['code'], 401)
+        response_json = self.client.post('/api/token/refresh/', {"refresh_token": second},
+                                         content_type='application/json').json()
+        self.assertEqual(response_json['messages'], "Invalid refresh token.")
+
+        # Other sign-ins are separate families.
+        other = self.client.post('/api/signin/', signin, content_type='application/json').json()['data']['refresh_token']
+        response_json = self.client.post('/api/token/refresh/', {"refresh_token": other},
+                                         content_type='application/json').json()
+        self.assertEqual(response_json['code'], 200)
+
+        RefreshToken.objects.update(expires_at=datetime.now(timezone.utc))
+        call_command('prune_refresh_tokens', stdout=StringIO())
+        self.assertFalse(RefreshToken.objects.exists())
+
+    def test_synthetic_seed(self):
+        call_command('seed', users=20, projects=5, tasks=300, seed=7, batch_size=40, stdout=StringIO())
+
+        self.assertEqual(User.objects.filter(email__startswith='user').count(), 20)
+        self.assertEqual(get_count(TASKS_KEY), 300)
+        self.assertEqual(set(Task.objects.values_list('status', flat=True)), set(Task.get_statuses()))
+
+        user = User.objects.get(email='user0@example.com')
+        self.assertEqual(user.permission_bits, User.compute_permission_bits([user.id])[user.id])
+        response_json = self.client.post('/api/signin/', {"email": user.email, "password": "password"},
+                                         content_type='application/json').json()
+        self.assertEqual(response_json['code'], 200)
+
+        # The same seed and batch size give the same rows.
+        first = list(Task.objects.order_by('id').values_list('title', 'status', 'priority', 'due_date'))
+        Task.objects.all().delete()
+        call_command('seed', tasks=300, seed=7, batch_size=40, stdout=StringIO())
+        self.assertEqual(list(Task.objects.order_by('id').values_list('title', 'status', 'priority', 'due_date')),
+                         first)
+
+        with self.assertRaises(CommandError):
+            call_command('seed', users=1, stdout=StringIO())
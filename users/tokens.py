@@ -0,0 +1,123 @@
+from datetime import datetime, timedelta
+import uuid
+import jwt
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from django.utils import timezone
+
+from core import settings
+from users.cache import principal_cache
+from users.models import Permission, RefreshToken
+
+
+REFRESH_TOKEN_TYPE = 'refresh'
+
+
+class RefreshFailed(Exception):
+    pass
+
+
+def create_access_token(user):
+    # Loaded from the primary, not the principal cache: another worker may
+    # have changed the permissions, and only its own copy was invalidated.
+    principal = principal_cache.load(user.id) if settings.ACCESS_TOKEN_EMBED_PERMISSIONS else None
+    return encode_access_token(user.id, principal)
+
+
+async def acreate_access_token(user):
+    return await acreate_user_access_token(user.id)
+
+
+async def acreate_user_access_token(user_id):
+    principal = await principal_cache.aload(user_id) if settings.ACCESS_TOKEN_EMBED_PERMISSIONS else None
+    return encode_access_token(user_id, principal)
+
+
+def encode_access_token(user_id, principal=None):
+    payload = {"user_id": user_id, "exp": datetime.now() + timedelta(minutes=settings.ACCESS_TOKEN_LIFETIME)}
+
+    if principal is not None:
+        payload.update({
+            "role": principal.user.role.name if principal.user.role else None,
+            "perms": Permission.to_mask(principal.permissions),
+            "epoch": principal.user.permission_epoch,
+        })
+
+    return jwt.encode(payload, settings.SECRET_KEY, algorithm="HS256")
+
+
+def token_permissions(payload, principal):
+    """
+    Returns the permission names granted by ``payload``, or ``None`` when
+    the token was issued before the user's latest permission change.
+    Tokens without embedded permissions fall back to the principal's.
+    ``principal`` must be at least as recent as the token (see
+    ``PrincipalCache.get``'s ``min_epoch``).
+    """
+    if "perms" not in payload:
+        return principal.permissions
+
+    epoch = payload.get("epoch")
+    if epoch is None or epoch < principal.user.permission_epoch:
+        return None
+
+    return Permission.from_mask(payload["perms"])
+
+
+def create_refresh_token(user_id, family=None):
+    """
+    Stores and returns a new refresh token for ``user_id``, continuing
+    ``family`` or starting one.
+    """
+    token = RefreshToken.objects.create(
+        user_id=user_id, jti=uuid.uuid4().hex, family=family or uuid.uuid4().hex,
+        expires_at=timezone.now() + timedelta(days=settings.REFRESH_TOKEN_LIFETIME))
+    return jwt.encode({"type": REFRESH_TOKEN_TYPE, "user_id": user_id, "jti": token.jti, "fam": token.family,
+                       "exp": token.expires_at}, settings.SECRET_KEY, algorithm="HS256")
+
+
+def decode_refresh_token(refresh_token):
+    try:
+        payload = jwt.decode(refresh_token, settings.SECRET_KEY, algorithms=["HS256"])
+    except jwt.ExpiredSignatureError:
+        raise RefreshFailed("Refresh token has expired.")
+    except jwt.InvalidTokenError:
+        raise RefreshFailed("Invalid refresh token.")
+
+    if payload.get("type") != REFRESH_TOKEN_TYPE or not {"user_id", "jti", "fam"} <= payload.keys():
+        raise RefreshFailed("Invalid refresh token.")
+    return payload
+
+
+def rotate_refresh_token(payload):
+    """
+    Marks the refresh token of ``payload`` used and returns its successor.
+    A token used before revokes its whole family: either it or its
+    successor is in the wrong hands.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        rotated = RefreshToken.objects.filter(
+            jti=payload["jti"], user_id=payload["user_id"], used_at=None, revoked_at=None,
+            expires_at__gt=now).update(used_at=now)
+        if rotated:
+            return create_refresh_token(payload["user_id"], payload["fam"])
+
+    if RefreshToken.objects.filter(jti=payload["jti"], used_at__isnull=False).exists():
+        RefreshToken.objects.filter(family=payload["fam"], revoked_at=None).update(revoked_at=now)
+        raise RefreshFailed("Refresh token was already used; sign in again.")
+    raise RefreshFailed("Invalid refresh token.")
+
+
+async def acreate_refresh_token(user_id, family=None):
+    return await sync_to_async(create_refresh_token)(user_id, family)
+
+
+async def arefresh_tokens(refresh_token):
+    """
+    Exchanges ``refresh_token`` for a new access token and the next refresh
+    token, or raises ``RefreshFailed``.
+    """
+    payload = decode_refresh_token(refresh_token)
+    next_refresh_token = await sync_to_async(rotate_refresh_token)(payload)
+    return await acreate_user_access_token(payload["user_id"]), next_refresh_token
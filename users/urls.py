@@ -5,4 +5,6 @@ urlpatterns = [
     path('signup/', views.signup),
     path('signin/', views.signin),
     path('auth_data/', views.authenticate),
+    path('auth/hashing/', views.password_hashing),
+    path('token/refresh/', views.token_refresh),
 ]
@@ -1,14 +1,15 @@
-from datetime import datetime, timedelta
-from django.http import JsonResponse
+from core.responses import JsonResponse
 from django.views.decorators.http import require_http_methods
-import jwt
 from rest_framework import serializers
 import json
-from django.contrib.auth.hashers import make_password, check_password
+from asgiref.sync import sync_to_async
 
-from core import settings
+from core.routers import read_replica
+from core.timing import timed
 from users.decorators import require_authentication
-from users.models import Role, User
+from users.hashing import HashingBusy, ahash_password, averify_password, hashing_pool
+from users.models import Permission, Role, User
+from users.tokens import RefreshFailed, acreate_access_token, acreate_refresh_token, arefresh_tokens
 
 
 class RoleSerializer(serializers.ModelSerializer):
@@ -43,8 +44,12 @@ class SignInSerializer(serializers.Serializer):
         required=True, write_only=True, min_length=8)
 
 
+class RefreshSerializer(serializers.Serializer):
+    refresh_token = serializers.CharField(required=True)
+
+
 @require_http_methods(['POST'])
-def signup(request):
+async def signup(request):
 
     try:
         data = json.loads(request.body)
@@ -52,36 +57,43 @@ def signup(request):
         data = request.POST.dict()
 
     serializer = SignUpSerializer(data=data)
-    if not serializer.is_valid():
+    # validate_email queries the database.
+    if not await sync_to_async(serializer.is_valid)():
         return JsonResponse({"code": 401, "data": [], "messages": serializer.errors}, status=200)
 
-    memberRole = Role.objects.get(name=Role.MEMBER_ROLE)
+    memberRole = await Role.objects.aget(name=Role.MEMBER_ROLE)
 
     if not isinstance(memberRole, Role):
         return JsonResponse({"code": 500, "data": [], "messages": "Sign up failure."}, status=200)
 
-    user = User.objects.create(
+    # Hashing is CPU-bound, so it runs off the event loop.
+    try:
+        password = await ahash_password(serializer.validated_data['password'])
+    except HashingBusy as error:
+        return JsonResponse({"code": 503, "data": [], "messages": str(error)}, status=200)
+
+    user = await User.objects.acreate(
         full_name=serializer.validated_data['full_name'],
         email=serializer.validated_data['email'],
-        password=make_password(serializer.validated_data['password']),
+        password=password,
         role=memberRole
     )
 
     if not isinstance(user, User):
         return JsonResponse({"code": 500, "data": [], "messages": "Sign up failure."}, status=200)
 
-    user.permissions.set(memberRole.permissions.all())
+    await user.permissions.aset([permission async for permission in memberRole.permissions.all()])
 
-    access_token = jwt.encode(
-        {"user_id": user.id, "exp": datetime.now() + timedelta(minutes=15)}, settings.SECRET_KEY, algorithm="HS256"
-    )
+    access_token = await acreate_access_token(user)
+    refresh_token = await acreate_refresh_token(user.id)
 
-    user_data = UserSerializer(user).data
-    return JsonResponse({"code": 200, "data": {"token": access_token, "user": user_data}, "messages": "Sign up successful."}, status=200)
+    with timed('serialize'):
+        user_data = UserSerializer(user).data
+    return JsonResponse({"code": 200, "data": {"token": access_token, "refresh_token": refresh_token, "user": user_data}, "messages": "Sign up successful."}, status=200)
 
 
 @require_http_methods(['POST'])
-def signin(request):
+async def signin(request):
 
     try:
         data = json.loads(request.body)
@@ -92,21 +104,62 @@ def signin(request):
     if not serializer.is_valid():
         return JsonResponse({"code": 401, "data": [], "messages": serializer.errors}, status=200)
 
-    user = User.objects.filter(
-        email=serializer.validated_data['email']).first()
-    if not isinstance(user, User) or not check_password(serializer.validated_data['password'], user.get_password()):
+    user = await User.objects.select_related('role').filter(
+        email=serializer.validated_data['email']).afirst()
+    if not isinstance(user, User):
+        return JsonResponse({"code": 500, "data": [], "messages": "Invalid creadentials."}, status=200)
+
+    try:
+        valid, rehashed = await averify_password(serializer.validated_data['password'], user.get_password())
+    except HashingBusy as error:
+        return JsonResponse({"code": 503, "data": [], "messages": str(error)}, status=200)
+    if not valid:
         return JsonResponse({"code": 500, "data": [], "messages": "Invalid creadentials."}, status=200)
+    if rehashed:
+        # The hasher or its cost changed since the password was set.
+        await User.objects.filter(id=user.id).aupdate(password=rehashed)
 
-    access_token = jwt.encode(
-        {"user_id": user.id, "exp": datetime.now() + timedelta(minutes=15)}, settings.SECRET_KEY, algorithm="HS256"
-    )
+    access_token = await acreate_access_token(user)
+    refresh_token = await acreate_refresh_token(user.id)
 
-    user_data = UserSerializer(user).data
-    return JsonResponse({"code": 200, "data": {"token": access_token, "user": user_data}, "messages": "Sign in successful."}, status=200)
+    with timed('serialize'):
+        user_data = UserSerializer(user).data
+    return JsonResponse({"code": 200, "data": {"token": access_token, "refresh_token": refresh_token, "user": user_data}, "messages": "Sign in successful."}, status=200)
 
 
+@read_replica
 @require_authentication()
 @require_http_methods(['GET'])
-def authenticate(request):
-    user_data = UserSerializer(request.user).data
+async def authenticate(request):
+    with timed('serialize'):
+        user_data = UserSerializer(request.user).data
     return JsonResponse({"code": 200, "data": user_data, "messages": "Authenticated successfully."}, status=200)
+
+
+@require_http_methods(['POST'])
+async def token_refresh(request):
+
+    try:
+        data = json.loads(request.body)
+    except json.JSONDecodeError:
+        data = request.POST.dict()
+
+    serializer = RefreshSerializer(data=data)
+    if not serializer.is_valid():
+        return JsonResponse({"code": 401, "data": [], "messages": serializer.errors}, status=200)
+
+    # No password check: the token's signature and one indexed update.
+    try:
+        access_token, refresh_token = await arefresh_tokens(serializer.validated_data['refresh_token'])
+    except RefreshFailed as error:
+        return JsonResponse({"code": 401, "data": [], "messages": str(error)}, status=200)
+
+    return JsonResponse({"code": 200, "data": {"token": access_token, "refresh_token": refresh_token},
+                         "messages": "Token refreshed."}, status=200)
+
+
+@require_authentication(Permission.VIEW_SETTINGS)
+@require_http_methods(['GET'])
+def password_hashing(request):
+    # Statistics of the worker process that served this request.
+    return JsonResponse({"code": 200, "data": hashing_pool.stats(), "messages": ""}, status=200)